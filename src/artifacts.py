@@ -0,0 +1,53 @@
+"""Saved analysis results, so figures can be redrawn without re-simulating
+
+An artifact is a compressed .npz: the results dict as JSON with every
+NumPy array (the heatmap sample_states) replaced by a reference to an
+array stored alongside it.
+"""
+import json
+import os
+
+import numpy as np
+
+
+def _split_arrays(value, arrays):
+    if isinstance(value, np.ndarray):
+        key = f"array_{len(arrays)}"
+        arrays[key] = value
+        return {'__array__': key}
+    if isinstance(value, dict):
+        return {k: _split_arrays(v, arrays) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_split_arrays(v, arrays) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _join_arrays(value, arrays):
+    if isinstance(value, dict):
+        if set(value) == {'__array__'}:
+            return arrays[value['__array__']]
+        return {k: _join_arrays(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_join_arrays(v, arrays) for v in value]
+    return value
+
+
+def save_results(results, path):
+    """Write the results of run_uncertainty_analysis (or run_adaptive_analysis)"""
+    arrays = {}
+    document = _split_arrays(results, arrays)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp.npz"
+    np.savez_compressed(temporary, results=np.array(json.dumps(document)), **arrays)
+    os.replace(temporary, path)
+
+
+def load_results(path):
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files if key != 'results'}
+        document = json.loads(str(data['results']))
+    return _join_arrays(document, arrays)
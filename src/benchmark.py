@@ -0,0 +1,237 @@
+"""Benchmarks of the simulation and reporting hot paths
+
+Times each stage (best of several repeats), measures its peak Python heap
+with tracemalloc in one extra run, and reports careers/sec or calls/sec.
+Results are saved as JSON; with a baseline file, any stage slower than the
+baseline by more than the tolerance fails the run. Timings only compare on
+the same machine, so no baseline ships with the repo: without one the
+regression check is skipped (and says so) until --save-baseline records it.
+
+    python src/benchmark.py                       # run and save benchmarks/latest.json
+    python src/benchmark.py --save-baseline       # also store it as the baseline
+    python src/benchmark.py --tolerance 0.3       # fail if a stage is >30% slower
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import reporting
+from simulator import (
+    STATES, TRANSITIONS, INTERVENTIONS, CareerProfile, apply_decision_modifiers,
+    get_retirement_probability, simulate_career, run_single_iteration,
+    run_uncertainty_analysis, aggregate_iterations
+)
+
+BENCHMARK_DIR = "benchmarks"
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+LATEST_PATH = os.path.join(BENCHMARK_DIR, "latest.json")
+
+
+def quietly(function, *args, **kwargs):
+    """Call function with its progress printing suppressed"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        return function(*args, **kwargs)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def measure(function, repeats=5):
+    """Best wall time over repeats, then peak traced memory of one more call"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': best, 'peak_memory_mb': peak / 1024 ** 2}
+
+
+def bench_simulate_career(num_careers=2000):
+    profiles = [(spec, risk) for _, spec, risk in INTERVENTIONS]
+
+    def run():
+        for i in range(num_careers):
+            spec, risk = profiles[i % len(profiles)]
+            simulate_career(profile=CareerProfile(early_specialization=spec, risk_tolerance=risk))
+
+    stage = measure(run)
+    stage['careers_per_sec'] = num_careers / stage['seconds']
+    return stage
+
+
+def bench_apply_decision_modifiers(rounds=2000):
+    profiles = [CareerProfile(early_specialization=spec, risk_tolerance=risk)
+                for spec in (False, True) for risk in ("low", "medium", "high")]
+    cases = [(profile, state) for profile in profiles for state in TRANSITIONS]
+
+    def run():
+        for _ in range(rounds):
+            for profile, state in cases:
+                apply_decision_modifiers(profile, TRANSITIONS[state], state, 0)
+
+    stage = measure(run)
+    stage['calls_per_sec'] = rounds * len(cases) / stage['seconds']
+    return stage
+
+
+def bench_get_retirement_probability(rounds=1000):
+    profile = CareerProfile()
+    profile.burnout_score, profile.momentum_score = 12.5, 3.0
+    cases = [(state, age) for state in STATES for age in range(22, 68)]
+
+    def run():
+        for _ in range(rounds):
+            for state, age in cases:
+                get_retirement_probability(profile, state, age - 22, age)
+
+    stage = measure(run)
+    stage['calls_per_sec'] = rounds * len(cases) / stage['seconds']
+    return stage
+
+
+def bench_single_iteration(engine, num_simulations):
+    stage = measure(lambda: quietly(run_single_iteration, num_simulations, engine=engine, seed=1))
+    stage['careers_per_sec'] = num_simulations * len(INTERVENTIONS) / stage['seconds']
+    return stage
+
+
+def bench_aggregation(iterations):
+    return measure(lambda: aggregate_iterations(iterations))
+
+
+def bench_plot(function, results):
+    """Render into a scratch directory so figures/ is left untouched"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        os.makedirs("figures")
+        try:
+            return measure(lambda: quietly(function, results), repeats=1)
+        finally:
+            reporting.plt.close('all')
+            os.chdir(previous)
+
+
+def run_benchmarks(quick=False):
+    """Time every stage; quick=True shrinks the workloads for a smoke run"""
+    scale = 0.2 if quick else 1.0
+    stages = {}
+
+    print("⏱️  simulate_career")
+    stages['simulate_career'] = bench_simulate_career(int(2000 * scale))
+    print("⏱️  apply_decision_modifiers")
+    stages['apply_decision_modifiers'] = bench_apply_decision_modifiers(int(2000 * scale))
+    print("⏱️  get_retirement_probability")
+    stages['get_retirement_probability'] = bench_get_retirement_probability(int(1000 * scale))
+    print("⏱️  run_single_iteration (python)")
+    stages['run_single_iteration_python'] = bench_single_iteration("python", int(2500 * scale))
+    print("⏱️  run_single_iteration (cohort)")
+    stages['run_single_iteration_cohort'] = bench_single_iteration("cohort", int(25_000 * scale))
+
+    results = quietly(run_uncertainty_analysis, num_iterations=30, num_simulations=int(2500 * scale), seed=1)
+    iterations = [results['last_iteration']] * 30
+    print("⏱️  aggregation")
+    stages['aggregation'] = bench_aggregation(iterations)
+    print("⏱️  plot_uncertainty_results")
+    stages['plot_uncertainty_results'] = bench_plot(reporting.plot_uncertainty_results, results)
+    print("⏱️  create_killer_figure")
+    stages['create_killer_figure'] = bench_plot(reporting.create_killer_figure, results)
+
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'quick': quick,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'stages': stages
+    }
+
+
+def print_benchmarks(report, baseline=None):
+    print(f"\n{'Stage':<32} {'Time (s)':>10} {'Rate':>16} {'Peak MB':>9} {'vs base':>9}")
+    print("-" * 80)
+    for name, stage in report['stages'].items():
+        rate = stage.get('careers_per_sec') or stage.get('calls_per_sec')
+        unit = "careers/s" if 'careers_per_sec' in stage else "calls/s"
+        rate_text = f"{rate:,.0f} {unit}" if rate else ""
+        change = ""
+        if baseline and name in baseline['stages']:
+            change = f"{stage['seconds'] / baseline['stages'][name]['seconds'] - 1:+.0%}"
+        print(f"{name:<32} {stage['seconds']:>10.4f} {rate_text:>16} {stage['peak_memory_mb']:>9.1f} {change:>9}")
+
+
+def regressions(report, baseline, tolerance=0.25):
+    """Stages more than tolerance slower than the baseline"""
+    slower = []
+    for name, stage in report['stages'].items():
+        reference = baseline['stages'].get(name)
+        if reference and stage['seconds'] > reference['seconds'] * (1 + tolerance):
+            slower.append((name, stage['seconds'] / reference['seconds']))
+    return slower
+
+
+def save_report(report, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as output:
+        json.dump(report, output, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulator hot paths")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--output", default=LATEST_PATH, help="where to save this run's JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads for a fast smoke run")
+    args = parser.parse_args()
+
+    report = run_benchmarks(quick=args.quick)
+    save_report(report, args.output)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as source:
+            baseline = json.load(source)
+        if baseline.get('quick') != report['quick']:
+            print(f"\n⚠️  Baseline {args.baseline} used a different workload size; not comparing")
+            baseline = None
+
+    print_benchmarks(report, baseline)
+    print(f"\n💾 Saved to {args.output}")
+
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        print(f"📌 Stored as baseline {args.baseline}")
+        return 0
+
+    if baseline:
+        slower = regressions(report, baseline, args.tolerance)
+        if slower:
+            print(f"\n❌ REGRESSION: {len(slower)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+            for name, ratio in slower:
+                print(f"  • {name}: {ratio:.2f}x baseline time")
+            return 1
+        print(f"\n✅ No stage slower than baseline by more than {args.tolerance:.0%}")
+    elif not os.path.exists(args.baseline):
+        print(f"\n⏭️  No baseline at {args.baseline}: regression check skipped "
+              f"(record one on this machine with --save-baseline)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+"""Bootstrap confidence intervals from one large run per arm
+
+run_uncertainty_analysis takes its intervals from the spread of 30 full
+re-runs. run_bootstrap_analysis simulates every arm once and resamples its
+careers instead. Every study metric is a function of per-career outcome
+totals, so a bootstrap replicate is just a weight vector over careers times
+the per-career outcome matrix:
+
+    director_plus_rate   [reached Director+]
+    avg_retire_age       [retired, retirement age]
+    median_unemp         [unemployed in year 1, ..., year 45]
+
+One set of career-index resamples serves every metric of an arm (and every
+arm when they are paired), so the cost is a bincount and a matrix product
+per chunk of replicates. BCa intervals take their bias correction from the
+replicates and their acceleration from an exact leave-one-out jackknife,
+computed once per distinct outcome pattern rather than once per career.
+"""
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+from simulator import (INTERVENTIONS, STREAM_BLOCK_SIZE, CareerProfile, simulate_career, arm_seed, child_seed,
+                       make_rng)
+from metrics import ArmAccumulator
+from trajectories import UNEMPLOYED, record_careers
+
+# Spawn key of the resampling streams; simulation streams are keyed by
+# iteration index and never get this far
+RESAMPLING_KEY = 2 ** 31 - 1
+
+# Working memory for one chunk of resampling weights
+CHUNK_BYTES = 64 * 1024 ** 2
+
+NORMAL = NormalDist()
+
+
+def director_features(trajectories):
+    return trajectories.director_plus()[:, None].astype(np.uint8)
+
+
+def retirement_features(trajectories):
+    retired = trajectories.retire_year >= 0
+    ages = np.where(retired, trajectories.starting_age + trajectories.retire_year.astype(np.int32), 0)
+    return np.column_stack([retired, ages]).astype(np.int32)
+
+
+def unemployment_features(trajectories):
+    return (trajectories.states[:, 1:] == UNEMPLOYED).astype(np.uint8)
+
+
+def director_rate(totals, careers):
+    return 100 * totals[..., 0] / careers
+
+
+def mean_retire_age(totals, careers):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals[..., 0] > 0, totals[..., 1] / totals[..., 0], np.nan)
+
+
+def median_unemployment_year(totals, careers):
+    """median_from_counts for every row of per-year unemployment totals"""
+    cumulative = np.cumsum(totals, axis=-1)
+    total = cumulative[..., -1:]
+    lower = np.count_nonzero(cumulative <= (total - 1) // 2, axis=-1)
+    upper = np.count_nonzero(cumulative <= total // 2, axis=-1)
+    return np.where(total[..., 0] > 0, (lower + upper) / 2, np.nan)
+
+
+# Metric name -> (per-career features, statistic of the feature totals)
+METRICS = {
+    'director_plus_rate': (director_features, director_rate),
+    'avg_retire_age': (retirement_features, mean_retire_age),
+    'median_unemp': (unemployment_features, median_unemployment_year)
+}
+
+
+def paired_difference(statistic, width):
+    """Statistic of arm totals minus that of control totals laid side by side"""
+    def difference(totals, careers):
+        return statistic(totals[..., width:], careers) - statistic(totals[..., :width], careers)
+    return difference
+
+
+def outcome_patterns(features):
+    """Distinct per-career feature rows and how many careers share each
+
+    Rows are encoded as one integer (mixed radix over the column ranges)
+    so grouping is a 1-d sort; rows too wide for a 64-bit code are left
+    ungrouped.
+    """
+    low = features.min(axis=0).astype(np.int64)
+    span = features.max(axis=0).astype(np.int64) - low + 1
+    if np.log2(span).sum() >= 63:
+        return features.astype(np.float64), np.ones(len(features), dtype=np.int64)
+
+    strides = np.cumprod(np.concatenate([[1], span[:0:-1]]))[::-1]
+    codes = (features - low) @ strides
+    _, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    return features[first].astype(np.float64), counts
+
+
+def resampling_weights(careers, replicates, rng, chunk_bytes=CHUNK_BYTES):
+    """Bootstrap resamples as per-career counts, a (chunk x careers) block at a time
+
+    Each resample draws `careers` career indices with replacement.
+    """
+    chunk = max(1, chunk_bytes // (24 * careers))
+    for start in range(0, replicates, chunk):
+        size = min(chunk, replicates - start)
+        draws = rng.integers(0, careers, (size, careers))
+        draws += np.arange(size)[:, None] * careers
+        yield np.bincount(draws.ravel(), minlength=size * careers).reshape(size, careers)
+
+
+def resample_totals(matrices, replicates, rng):
+    """Feature totals of every (careers x features) matrix under the same resamples
+
+    Sharing the resampling weights keeps the careers of paired arms together.
+    """
+    totals = [np.empty((replicates, matrix.shape[1])) for matrix in matrices]
+    row = 0
+    for weights in resampling_weights(len(matrices[0]), replicates, rng):
+        weights = weights.astype(np.float64)
+        for total, matrix in zip(totals, matrices):
+            total[row:row + len(weights)] = weights @ matrix
+        row += len(weights)
+    return totals
+
+
+def jackknife(patterns, counts, statistic):
+    """Leave-one-out values of a statistic, one per outcome pattern
+
+    Every career of a pattern gives the same value, so (values, counts)
+    stands for the full career-by-career jackknife.
+    """
+    careers = int(counts.sum())
+    return statistic(counts @ patterns - patterns, careers - 1), counts
+
+
+def acceleration(samples):
+    """BCa acceleration from (jackknife values, counts) of one or more samples
+
+    For a difference between independent samples pass the values of the
+    subtracted sample negated.
+    """
+    skew = spread = 0.0
+    for values, counts in samples:
+        valid = np.isfinite(values)
+        values, counts = values[valid], counts[valid]
+        if not counts.sum():
+            return np.nan
+        influence = np.average(values, weights=counts) - values
+        skew += (counts * influence ** 3).sum()
+        spread += (counts * influence ** 2).sum()
+    return skew / (6 * spread ** 1.5) if spread > 0 else 0.0
+
+
+def bootstrap_interval(estimate, replicates, samples=None, level=0.95, method="bca"):
+    """Percentile or BCa interval of an estimate from its bootstrap replicates
+
+    BCa needs the jackknife samples for the acceleration; when the bias
+    correction is undefined (every replicate on one side of the estimate)
+    it falls back to the percentile interval.
+    """
+    replicates = replicates[np.isfinite(replicates)]
+    if estimate is None or np.isnan(estimate) or not replicates.size:
+        return {'estimate': None, 'std_err': None, 'ci_lower': None, 'ci_upper': None}
+
+    alphas = [(1 - level) / 2, (1 + level) / 2]
+    if method == "bca":
+        below = np.count_nonzero(replicates < estimate) + 0.5 * np.count_nonzero(replicates == estimate)
+        accel = acceleration(samples)
+        if 0 < below < replicates.size and np.isfinite(accel):
+            bias = NORMAL.inv_cdf(below / replicates.size)
+            adjusted = []
+            for alpha in alphas:
+                z = bias + NORMAL.inv_cdf(alpha)
+                adjusted.append(NORMAL.cdf(bias + z / (1 - accel * z)))
+            alphas = adjusted
+
+    lower, upper = np.quantile(replicates, alphas)
+    return {
+        'estimate': float(estimate),
+        'std_err': float(replicates.std(ddof=1)) if replicates.size > 1 else 0.0,
+        'ci_lower': float(lower),
+        'ci_upper': float(upper)
+    }
+
+
+def simulate_arms(num_simulations, engine, seed, paired):
+    """Per-career features and streaming summaries of one large run per arm
+
+    Unpaired arms reproduce iteration 0 of run_uncertainty_analysis(seed=seed)
+    with num_simulations careers; paired arms that of its paired=True run.
+    """
+    features = {name: {metric: [] for metric in METRICS} for name, _, _ in INTERVENTIONS}
+
+    def record(name, trajectories, accumulator):
+        accumulator.add_trajectories(trajectories)
+        for metric, (extract, _) in METRICS.items():
+            features[name][metric].append(extract(trajectories))
+
+    if paired:
+        from paired import RESERVOIR_KEY, simulate_paired_block
+        iteration_seed = np.random.SeedSequence(seed, spawn_key=(0,))
+        accumulators = {
+            name: ArmAccumulator(rng=child_seed(iteration_seed, RESERVOIR_KEY, arm_index))
+            for arm_index, (name, _, _) in enumerate(INTERVENTIONS)
+        }
+        for block_index, start in enumerate(range(0, num_simulations, STREAM_BLOCK_SIZE)):
+            block_size = min(STREAM_BLOCK_SIZE, num_simulations - start)
+            block_seed = child_seed(iteration_seed, block_index)
+            for name, trajectories in simulate_paired_block(block_size, engine, block_seed).items():
+                record(name, trajectories, accumulators[name])
+    else:
+        accumulators = {}
+        for arm_index, (name, spec_value, risk_value) in enumerate(INTERVENTIONS):
+            arm = arm_seed(seed, 0, arm_index)
+            rng = make_rng(arm, engine)
+            accumulators[name] = ArmAccumulator(rng=child_seed(arm, 0))
+            for start in range(0, num_simulations, STREAM_BLOCK_SIZE):
+                block = min(STREAM_BLOCK_SIZE, num_simulations - start)
+                if engine == "cohort":
+                    from cohort import simulate_cohort
+                    trajectories = simulate_cohort(block, (spec_value, risk_value), rng=rng)
+                else:
+                    trajectories = record_careers(
+                        (simulate_career(profile=CareerProfile(early_specialization=spec_value,
+                                                               risk_tolerance=risk_value), rng=rng)
+                         for _ in range(block)),
+                        block
+                    )
+                record(name, trajectories, accumulators[name])
+
+    features = {
+        name: {metric: np.concatenate(blocks) for metric, blocks in arm.items()}
+        for name, arm in features.items()
+    }
+    return features, {name: accumulator.summary() for name, accumulator in accumulators.items()}
+
+
+def run_bootstrap_analysis(num_simulations=75_000, replicates=1000, method="bca", level=0.95,
+                           engine="cohort", seed=None, paired=False):
+    """Bootstrap intervals for every arm metric and every delta vs control
+
+    One run of num_simulations careers per arm (75,000 matches the careers
+    of the default 30 x 2,500 study). method is "bca" or "percentile".
+    With paired=True the arms share their random numbers career by career
+    and deltas are bootstrapped by resampling careers jointly across arms;
+    otherwise the arms are resampled independently.
+
+    Returns per-arm entries with the keys of run_uncertainty_analysis (the
+    bootstrap replicates stand in for the per-iteration rates) plus a
+    'bootstrap' dict of intervals, and 'deltas' with the interval of every
+    metric's difference vs control.
+    """
+    if method not in ("bca", "percentile"):
+        raise ValueError(f"Unknown bootstrap method: {method}")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    print("=" * 70)
+    print("BOOTSTRAP ANALYSIS: One Large Run per Arm")
+    print("=" * 70)
+    print(f"\n{num_simulations:,} careers per arm, {replicates:,} {method.upper()} replicates")
+    print(f"Seed: {seed}" + ("  Paired (common random numbers)" if paired else "") + "\n")
+
+    start = time.perf_counter()
+    features, summaries = simulate_arms(num_simulations, engine, seed, paired)
+    simulate_seconds = time.perf_counter() - start
+
+    arms = [name for name, _, _ in INTERVENTIONS]
+    columns, offset = {}, 0
+    for metric in METRICS:
+        width = features['control'][metric].shape[1]
+        columns[metric] = slice(offset, offset + width)
+        offset += width
+
+    def feature_matrix(name):
+        return np.column_stack([features[name][metric] for metric in METRICS]).astype(np.float64)
+
+    # One set of resamples per arm, or one shared by all arms when paired
+    groups = [arms] if paired else [[name] for name in arms]
+    streams = np.random.SeedSequence(seed, spawn_key=(RESAMPLING_KEY,)).spawn(len(groups))
+    totals = {}
+    for group, stream in zip(groups, streams):
+        matrices = [feature_matrix(name) for name in group]
+        totals.update(zip(group, resample_totals(matrices, replicates, np.random.default_rng(stream))))
+
+    estimates, draws, jackknives = {}, {}, {}
+    for name in arms:
+        for metric, (_, statistic) in METRICS.items():
+            patterns, counts = outcome_patterns(features[name][metric])
+            estimates[name, metric] = statistic(counts @ patterns, num_simulations)
+            draws[name, metric] = statistic(totals[name][:, columns[metric]], num_simulations)
+            jackknives[name, metric] = jackknife(patterns, counts, statistic)
+
+    results = {}
+    for name, _, _ in INTERVENTIONS:
+        intervals = {
+            metric: bootstrap_interval(estimates[name, metric], draws[name, metric],
+                                       [jackknives[name, metric]], level, method)
+            for metric in METRICS
+        }
+        director, retirement = intervals['director_plus_rate'], intervals['avg_retire_age']
+        results[name] = {
+            'director_mean': director['estimate'],
+            'director_std': director['std_err'],
+            'director_ci_lower': director['ci_lower'],
+            'director_ci_upper': director['ci_upper'],
+            'retire_mean': retirement['estimate'],
+            'retire_std': retirement['std_err'],
+            'all_director_rates': draws[name, 'director_plus_rate'],
+            'all_retire_ages': draws[name, 'avg_retire_age'],
+            'bootstrap': intervals
+        }
+
+    results['deltas'] = {}
+    for name, _, _ in INTERVENTIONS[1:]:
+        results['deltas'][name] = {}
+        for metric, (_, statistic) in METRICS.items():
+            estimate = estimates[name, metric] - estimates['control', metric]
+            delta_draws = draws[name, metric] - draws['control', metric]
+            if paired:
+                difference = paired_difference(statistic, features['control'][metric].shape[1])
+                patterns, counts = outcome_patterns(
+                    np.concatenate([features['control'][metric], features[name][metric]], axis=1)
+                )
+                samples = [jackknife(patterns, counts, difference)]
+            else:
+                control_values, control_counts = jackknives['control', metric]
+                samples = [jackknives[name, metric], (-control_values, control_counts)]
+            results['deltas'][name][metric] = bootstrap_interval(estimate, delta_draws, samples, level, method)
+
+    if paired:
+        results['paired_deltas'] = {}
+        for name, _, _ in INTERVENTIONS[1:]:
+            delta = results['deltas'][name]['director_plus_rate']
+            results['paired_deltas'][name] = {
+                'delta': delta['estimate'],
+                'std_err': delta['std_err'],
+                'independent_std_err': float(np.hypot(results[name]['director_std'],
+                                                      results['control']['director_std']))
+            }
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Simulated in {simulate_seconds:.1f}s, resampled in {elapsed - simulate_seconds:.1f}s")
+
+    results['last_iteration'] = summaries
+    results.update({'seed': seed, 'method': method, 'level': level, 'replicates': replicates,
+                    'careers_per_arm': num_simulations, 'paired': paired, 'elapsed_seconds': elapsed})
+    return results
+
+
+def print_bootstrap_results(results):
+    """Intervals of every arm metric and of the deltas vs control"""
+    level = f"{results['level']:.0%}"
+    labels = {'director_plus_rate': "Director+ rate (%)", 'avg_retire_age': "Retirement age",
+              'median_unemp': "Median unemp. year"}
+    arms = [("control", "Control"), ("specialist", "Specialist"), ("risktaker", "Risk-Taker")]
+
+    print("\n" + "=" * 70)
+    print(f"BOOTSTRAP RESULTS ({results['method'].upper()}, {level} CI, "
+          f"{results['careers_per_arm']:,} careers per arm)")
+    print("=" * 70)
+
+    def row(label, interval, signed=False):
+        if interval['estimate'] is None:
+            print(f"  {label:<15} n/a")
+            return
+        sign = "+" if signed else ""
+        print(f"  {label:<15} {interval['estimate']:{sign}8.2f}   "
+              f"[{interval['ci_lower']:{sign}7.2f}, {interval['ci_upper']:{sign}7.2f}]   "
+              f"SE {interval['std_err']:.3f}")
+
+    for metric, title in labels.items():
+        print(f"\n📊 {title}:")
+        for name, label in arms:
+            row(label, results[name]['bootstrap'][metric])
+
+    print(f"\n📈 Impact vs Control" + (" (paired)" if results['paired'] else "") + ":")
+    for metric, title in labels.items():
+        print(f"  {title}")
+        for name, label in arms[1:]:
+            row(label, results['deltas'][name][metric], signed=True)
+
+    print("\n" + "=" * 70)
@@ -0,0 +1,149 @@
+"""Content-addressed on-disk cache of study results
+
+Entries are keyed by a SHA-256 of the model fingerprint (transition,
+stress and rank tables, the compiled per-arm transition tables and the
+source of every module on the simulation path), the interventions, the
+function being run and its arguments. Editing any model table or rule
+changes the fingerprint, so stale results are never returned. Runs without
+a seed are not reproducible and bypass the cache.
+
+Entries are pickles; reading one refreshes its modification time, and the
+least recently used entries are evicted once the cache exceeds max_bytes.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import simulator
+
+CACHE_DIR = ".cache/results"
+CACHE_MAX_BYTES = 512 * 1024 ** 2
+
+# Modules whose code determines simulated results. simulator is hashed
+# whole: besides the model it holds the seeding, task and aggregation code
+# of the cached entry points
+ENGINE_MODULES = ("simulator", "cohort", "trajectories", "metrics", "paired")
+
+# Arguments that change how a result is computed but not the result itself
+NON_RESULT_ARGUMENTS = {"workers", "checkpoint", "checkpoint_every", "instrumentation"}
+
+# Entry points whose result does depend on some of those: the adaptive run
+# adds one batch per worker each round, so workers moves its stopping point
+RESULT_ARGUMENTS = {"run_adaptive_analysis": {"workers"}}
+
+
+def model_fingerprint():
+    """Hash of everything that determines simulated results"""
+    digest = hashlib.sha256()
+    tables = {
+        'transitions': simulator.TRANSITIONS,
+        'stress_levels': simulator.STRESS_LEVELS,
+        'state_ranks': simulator.STATE_RANKS,
+        'modifier_params': simulator.MODIFIER_PARAMS,
+        'retirement_params': simulator.RETIREMENT_PARAMS,
+        'interventions': simulator.INTERVENTIONS,
+        'compiled': {
+            name: simulator.compile_transition_table(spec_value, risk_value)
+            for name, spec_value, risk_value in simulator.INTERVENTIONS
+        }
+    }
+    digest.update(json.dumps(tables, sort_keys=True).encode())
+
+    for module in ENGINE_MODULES:
+        path = os.path.join(os.path.dirname(simulator.__file__), f"{module}.py")
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+
+    return digest.hexdigest()
+
+
+def cache_key(function, arguments):
+    """Cache key of function(**arguments) under the current model"""
+    ignored = NON_RESULT_ARGUMENTS - RESULT_ARGUMENTS.get(function.__name__, set())
+    relevant = {k: v for k, v in arguments.items() if k not in ignored}
+    payload = json.dumps({
+        'model': model_fingerprint(),
+        'function': f"{function.__module__}.{function.__qualname__}",
+        'arguments': relevant
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Pickled results in a directory, evicted least-recently-used by total size"""
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """Stored result for key, or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as entry:
+                result = pickle.load(entry)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)
+        return result
+
+    def put(self, key, result):
+        path = self.path(key)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as entry:
+            pickle.dump(result, entry, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every entry, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(self.directory, name)))
+        return sorted(entries)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+def cached_call(function, cache=None, **arguments):
+    """function(**arguments), served from the cache when the same model,
+    arguments and seed were run before
+
+    Works for any seeded study entry point, e.g. run_uncertainty_analysis or
+    run_arm (whose result carries the encoded trajectories). Unseeded and
+    wall-clock-limited runs are not reproducible and always recompute.
+    Returns (result, hit).
+    """
+    if arguments.get('seed') is None or arguments.get('max_seconds') is not None:
+        return function(**arguments), False
+
+    cache = cache or ResultCache()
+    key = cache_key(function, arguments)
+    start = time.perf_counter()
+    result = cache.get(key)
+    if result is not None:
+        print(f"⚡ Loaded cached result {key[:12]} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return result, True
+
+    result = function(**arguments)
+    cache.put(key, result)
+    return result, False
@@ -0,0 +1,95 @@
+"""On-disk checkpoints of uncertainty-analysis progress
+
+A checkpoint is a compressed .npz file holding the run configuration, the
+master seed and one row per completed iteration (Director+ rate, retirement
+age and median unemployment year of every arm, plus paired deltas when
+present), along with the reservoir sample of trajectories of every
+iteration, so a run cut back to fewer iterations still has the heatmap
+sample of its last one. Each (iteration, arm) stream is derived from the master seed and
+the iteration index alone, so the seed and the iteration count are the whole
+RNG state: a run resumed or extended from a checkpoint produces exactly the
+iterations an uninterrupted run would have.
+"""
+import json
+import os
+
+import numpy as np
+
+from simulator import INTERVENTIONS
+
+ARM_FIELDS = ('director_plus_rate', 'avg_retire_age', 'median_unemp')
+DELTA_FIELDS = ('delta', 'std_err', 'independent_std_err')
+
+
+def save_checkpoint(path, config, seed, all_iterations):
+    """Atomically write the completed iterations of a run"""
+    arms = [name for name, _, _ in INTERVENTIONS]
+    arrays = {
+        'config': np.array(json.dumps(config, sort_keys=True)),
+        'seed': np.array(str(seed)),
+        'arm_metrics': np.array([
+            [[np.nan if it[arm][field] is None else it[arm][field] for field in ARM_FIELDS] for arm in arms]
+            for it in all_iterations
+        ], dtype=np.float64).reshape(len(all_iterations), len(arms), len(ARM_FIELDS))
+    }
+
+    sampled = [i for i, it in enumerate(all_iterations) if 'sample_states' in it[arms[0]]]
+    if sampled:
+        arrays['sample_iterations'] = np.array(sampled)
+        arrays['sample_states'] = np.stack([
+            np.stack([all_iterations[i][arm]['sample_states'] for arm in arms]) for i in sampled
+        ])
+
+    last = all_iterations[-1] if all_iterations else None
+    if last is not None and 'paired_deltas' in last:
+        delta_arms = list(last['paired_deltas'])
+        arrays['delta_arms'] = np.array(delta_arms)
+        arrays['paired_deltas'] = np.array([
+            [[it['paired_deltas'][arm][field] for field in DELTA_FIELDS] for arm in delta_arms]
+            for it in all_iterations
+        ], dtype=np.float64)
+
+    temporary = f"{path}.tmp.npz"
+    np.savez_compressed(temporary, **arrays)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint back as (config, seed, all_iterations)"""
+    arms = [name for name, _, _ in INTERVENTIONS]
+
+    with np.load(path) as data:
+        config = json.loads(str(data['config']))
+        seed = int(str(data['seed']))
+        arm_metrics = data['arm_metrics']
+        sample_states = data['sample_states'] if 'sample_states' in data else None
+        # Older checkpoints kept the reservoirs of the last iteration only
+        sample_iterations = (data['sample_iterations'].tolist() if 'sample_iterations' in data
+                             else [len(arm_metrics) - 1])
+        delta_arms = data['delta_arms'].tolist() if 'delta_arms' in data else []
+        paired_deltas = data['paired_deltas'] if 'paired_deltas' in data else None
+
+    all_iterations = []
+    for i, metrics in enumerate(arm_metrics):
+        iteration = {
+            arm: {
+                field: None if np.isnan(value) else float(value)
+                for field, value in zip(ARM_FIELDS, metrics[arm_index])
+            }
+            for arm_index, arm in enumerate(arms)
+        }
+        if paired_deltas is not None:
+            iteration['paired_deltas'] = {
+                arm: dict(zip(DELTA_FIELDS, paired_deltas[i, arm_index].tolist()))
+                for arm_index, arm in enumerate(delta_arms)
+            }
+        all_iterations.append(iteration)
+
+    if all_iterations and sample_states is not None:
+        if sample_states.ndim == 3:
+            sample_states = sample_states[None]
+        for i, states in zip(sample_iterations, sample_states):
+            for arm_index, arm in enumerate(arms):
+                all_iterations[i][arm]['sample_states'] = states[arm_index]
+
+    return config, seed, all_iterations
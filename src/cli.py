@@ -0,0 +1,305 @@
+"""Command-line entry point
+
+    python src/cli.py simulate --arm specialist --careers 100000 --seed 1
+    python src/cli.py analyze --iterations 30 --careers 2500 --workers 4 --progress
+    python src/cli.py analyze --save results/study.npz
+    python src/cli.py plot --from results/study.npz --format svg --dpi 100
+    python src/cli.py bootstrap --careers 75000 --replicates 1000 --paired
+    python src/cli.py interventions --spec examples/interventions.json --careers 20000
+    python src/cli.py workforce --spec examples/workforce.json --size 50000
+    python src/cli.py sensitivity --method sobol --samples 64 --careers 1000 --workers 4
+    python src/cli.py rare-events --event C-Suite --event "Director by 35" --careers 100000
+    python src/cli.py whatif --set "VP->C-Suite=0.12" --set generalist_exec_boost=1.4
+    python src/cli.py serve --port 8765 --cache-size 1024 --batch-window-ms 5
+    python src/cli.py export --careers 1000000 --output exports/study
+    python src/cli.py population --careers 100000000 --memory-mb 256 --workers 8
+    python src/cli.py sweep --param specialist_boost=1.0:1.6:7 --param age_thresholds=50/60/65/70,55/62/67/72
+
+simulate and analyze never import matplotlib; plot runs (or loads from the
+result cache or a saved artifact) the same analysis and only then imports
+the reporting module, rendering the figures in parallel processes.
+"""
+import argparse
+import sys
+
+from simulator import INTERVENTIONS, STUDY_SEED
+
+ARMS = {name: (spec_value, risk_value) for name, spec_value, risk_value in INTERVENTIONS}
+
+
+def add_analysis_options(parser):
+    parser.add_argument("--iterations", type=int, default=30, help="iterations per arm")
+    parser.add_argument("--careers", type=int, default=2500, help="careers per arm and iteration")
+    parser.add_argument("--engine", choices=("cohort", "python"), default="cohort")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    parser.add_argument("--paired", action="store_true", help="common random numbers across arms")
+    parser.add_argument("--antithetic", action="store_true", help="antithetic pairs (with --paired)")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file to save to / resume from")
+    parser.add_argument("--no-cache", action="store_true", help="always re-simulate")
+    parser.add_argument("--progress", action="store_true", help="throughput, ETA and running CIs")
+    parser.add_argument("--save", default=None, help="also write the results artifact (.npz) here")
+
+
+def run_analysis(args):
+    from simulator import run_uncertainty_analysis
+
+    instrumentation = None
+    if args.progress:
+        from instrumentation import Instrumentation, ProgressReporter
+        instrumentation = Instrumentation([ProgressReporter()])
+
+    arguments = dict(
+        num_iterations=args.iterations, num_simulations=args.careers, engine=args.engine,
+        workers=args.workers, seed=args.seed, paired=args.paired, antithetic=args.antithetic,
+        checkpoint=args.checkpoint, instrumentation=instrumentation
+    )
+    if args.no_cache:
+        results = run_uncertainty_analysis(**arguments)
+    else:
+        from cache import cached_call
+        results, _ = cached_call(run_uncertainty_analysis, **arguments)
+
+    if args.save:
+        from artifacts import save_results
+        save_results(results, args.save)
+        print(f"💾 Results saved to {args.save}")
+    return results
+
+
+def simulate(args):
+    from simulator import run_arm
+
+    spec_value, risk_value = ARMS[args.arm]
+    seed = None
+    if args.seed is not None:
+        from simulator import arm_seed
+        seed = arm_seed(args.seed, 0, list(ARMS).index(args.arm))
+
+    summary = run_arm(args.careers, spec_value, risk_value, engine=args.engine, seed=seed, streaming=True)
+    print(f"{args.arm}: {args.careers:,} careers ({args.engine} engine)")
+    print(f"  Director+ rate:       {summary['director_plus_rate']:.2f}%")
+    if summary['avg_retire_age'] is not None:
+        print(f"  Avg retirement age:   {summary['avg_retire_age']:.1f}")
+    if summary['median_unemp'] is not None:
+        print(f"  Median unemp. year:   {summary['median_unemp']:.1f}")
+
+
+def analyze(args):
+    from simulator import print_uncertainty_results
+    print_uncertainty_results(run_analysis(args))
+
+
+def plot(args):
+    if args.source:
+        from artifacts import load_results
+        results = load_results(args.source)
+    else:
+        results = run_analysis(args)
+
+    from reporting import render_figures
+    render_figures(results, args.output_dir, args.format, args.dpi, parallel=False if args.serial else None)
+
+
+def bootstrap(args):
+    from bootstrap import run_bootstrap_analysis, print_bootstrap_results
+    results = run_bootstrap_analysis(args.careers, args.replicates, args.method, engine=args.engine,
+                                     seed=args.seed, paired=args.paired)
+    print_bootstrap_results(results)
+    if args.save:
+        from artifacts import save_results
+        save_results(results, args.save)
+        print(f"💾 Results saved to {args.save}")
+
+
+def interventions(args):
+    from interventions import run_interventions
+    run_interventions(args.spec, args.careers, seed=args.seed, block_size=args.block_size, output=args.output)
+
+
+def workforce(args):
+    from workforce import run_workforce
+    run_workforce(args.spec, args.size, seed=args.seed, output=args.output)
+
+
+def sensitivity(args):
+    from sensitivity import run_sensitivity
+    run_sensitivity(args.method, base_samples=args.samples, trajectories=args.trajectories, spread=args.spread,
+                    careers=args.careers, seed=args.seed, workers=args.workers, output=args.output)
+
+
+def rare_events(args):
+    from rare_events import DEFAULT_EVENTS, run_rare_events
+    spec_value, risk_value = ARMS[args.arm]
+    run_rare_events(args.event or DEFAULT_EVENTS, args.careers, (spec_value, risk_value), tilt=args.tilt,
+                    pilot=args.pilot, ce_iterations=args.ce_iterations, seed=args.seed, output=args.output)
+
+
+def whatif(args):
+    from whatif import run_whatif
+    run_whatif(args.set, args.careers, ARMS[args.arm], seed=args.seed, min_ess=args.min_ess)
+
+
+def serve(args):
+    from service import run_service
+    run_service(args.host, args.port, seed=args.seed, cache_size=args.cache_size,
+                batch_window=args.batch_window_ms / 1000)
+
+
+def export(args):
+    from export import export_study
+    store = export_study(args.output, args.careers, engine=args.engine, seed=args.seed)
+    print(f"✅ {len(store):,} trajectories in '{args.output}' (open with export.TrajectoryStore)")
+
+
+def population(args):
+    from population import run_population_study
+    run_population_study(args.careers, args.memory_mb, seed=args.seed, workers=args.workers)
+
+
+def parse_grid_values(text):
+    """'a,b,c' -> [a, b, c]; 'start:stop:num' -> linspace; 'x/y/z' values -> tuples"""
+    def number(value):
+        return int(value) if value.lstrip('-').isdigit() else float(value)
+
+    if text.count(':') == 2:
+        import numpy as np
+        start, stop, num = text.split(':')
+        return [round(v, 10) for v in np.linspace(float(start), float(stop), int(num)).tolist()]
+    return [tuple(number(v) for v in value.split('/')) if '/' in value else number(value)
+            for value in text.split(',')]
+
+
+def sweep(args):
+    from sweep import run_sweep
+
+    grid = {}
+    for parameter in args.param:
+        name, _, values = parameter.partition('=')
+        grid[name] = parse_grid_values(values)
+    run_sweep(grid, num_simulations=args.careers, seed=args.seed, workers=args.workers, output=args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Career Path Butterfly Simulator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate_parser = commands.add_parser("simulate", help="simulate one intervention arm")
+    simulate_parser.add_argument("--arm", choices=list(ARMS), default="control")
+    simulate_parser.add_argument("--careers", type=int, default=10_000)
+    simulate_parser.add_argument("--engine", choices=("cohort", "python"), default="cohort")
+    simulate_parser.add_argument("--seed", type=int, default=None)
+    simulate_parser.set_defaults(handler=simulate)
+
+    analyze_parser = commands.add_parser("analyze", help="uncertainty analysis, numbers only")
+    add_analysis_options(analyze_parser)
+    analyze_parser.set_defaults(handler=analyze)
+
+    plot_parser = commands.add_parser("plot", help="uncertainty analysis figures")
+    add_analysis_options(plot_parser)
+    plot_parser.add_argument("--from", dest="source", default=None,
+                             help="redraw from a saved results artifact instead of simulating")
+    plot_parser.add_argument("--format", default="png", help="png, svg, pdf, ...")
+    plot_parser.add_argument("--dpi", type=int, default=300)
+    plot_parser.add_argument("--output-dir", default="figures")
+    plot_parser.add_argument("--serial", action="store_true", help="render figures one at a time")
+    plot_parser.set_defaults(handler=plot)
+
+    bootstrap_parser = commands.add_parser("bootstrap", help="bootstrap intervals from one large run per arm")
+    bootstrap_parser.add_argument("--careers", type=int, default=75_000, help="careers per arm")
+    bootstrap_parser.add_argument("--replicates", type=int, default=1000, help="bootstrap resamples")
+    bootstrap_parser.add_argument("--method", choices=("bca", "percentile"), default="bca")
+    bootstrap_parser.add_argument("--engine", choices=("cohort", "python"), default="cohort")
+    bootstrap_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    bootstrap_parser.add_argument("--paired", action="store_true", help="common random numbers across arms")
+    bootstrap_parser.add_argument("--save", default=None, help="also write the results artifact (.npz) here")
+    bootstrap_parser.set_defaults(handler=bootstrap)
+
+    interventions_parser = commands.add_parser("interventions", help="arms from a declarative spec in one batched pass")
+    interventions_parser.add_argument("--spec", default=None, help="JSON spec (default: the built-in arms)")
+    interventions_parser.add_argument("--careers", type=int, default=10_000, help="careers per arm")
+    interventions_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    interventions_parser.add_argument("--block-size", type=int, default=10_000, help="careers per arm and pass")
+    interventions_parser.add_argument("--output", default=None, help="also write the rows as CSV")
+    interventions_parser.set_defaults(handler=interventions)
+
+    workforce_parser = commands.add_parser("workforce", help="mixed starting ages, states and profiles, per stratum")
+    workforce_parser.add_argument("--spec", default=None, help="JSON workforce spec (default: a 50k-employee org)")
+    workforce_parser.add_argument("--size", type=int, default=50_000, help="careers in the workforce")
+    workforce_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    workforce_parser.add_argument("--output", default=None, help="also write the strata as CSV")
+    workforce_parser.set_defaults(handler=workforce)
+
+    sensitivity_parser = commands.add_parser("sensitivity", help="Sobol/Morris indices of the TRANSITIONS entries")
+    sensitivity_parser.add_argument("--method", choices=("sobol", "morris"), default="sobol")
+    sensitivity_parser.add_argument("--samples", type=int, default=64, help="Sobol base samples")
+    sensitivity_parser.add_argument("--trajectories", type=int, default=20, help="Morris trajectories")
+    sensitivity_parser.add_argument("--spread", type=float, default=0.2, help="relative perturbation of each move")
+    sensitivity_parser.add_argument("--careers", type=int, default=1000, help="careers per evaluation")
+    sensitivity_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    sensitivity_parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    sensitivity_parser.add_argument("--output", default=None, help="also write the indices as CSV")
+    sensitivity_parser.set_defaults(handler=sensitivity)
+
+    rare_parser = commands.add_parser("rare-events", help="importance-sampling estimates of rare outcomes")
+    rare_parser.add_argument("--event", action="append", default=[],
+                             help="'<state>' or '<state> by <age>'; repeatable (default: C-Suite, "
+                                  "Director by 35, C-Suite by 30)")
+    rare_parser.add_argument("--arm", choices=list(ARMS), default="control")
+    rare_parser.add_argument("--careers", type=int, default=100_000, help="careers per event")
+    rare_parser.add_argument("--tilt", type=float, default=2.0, help="initial boost of upward moves")
+    rare_parser.add_argument("--pilot", type=int, default=20_000, help="careers per cross-entropy round")
+    rare_parser.add_argument("--ce-iterations", type=int, default=3, help="cross-entropy rounds")
+    rare_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    rare_parser.add_argument("--output", default=None, help="also write the rows as CSV")
+    rare_parser.set_defaults(handler=rare_events)
+
+    whatif_parser = commands.add_parser("whatif", help="metrics under a modified table by reweighting a stored cohort")
+    whatif_parser.add_argument("--set", action="append", default=[],
+                               help="'State->Next=probability' or 'modifier=value'; repeatable")
+    whatif_parser.add_argument("--arm", choices=list(ARMS), default="control")
+    whatif_parser.add_argument("--careers", type=int, default=200_000, help="stored careers")
+    whatif_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    whatif_parser.add_argument("--min-ess", type=float, default=0.1,
+                               help="re-simulate below this effective share of the cohort")
+    whatif_parser.set_defaults(handler=whatif)
+
+    serve_parser = commands.add_parser("serve", help="local HTTP/JSON query service (batched, cached)")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    serve_parser.add_argument("--cache-size", type=int, default=1024, help="LRU cache entries")
+    serve_parser.add_argument("--batch-window-ms", type=float, default=5.0,
+                              help="how long a query waits for others to batch with")
+    serve_parser.set_defaults(handler=serve)
+
+    export_parser = commands.add_parser("export", help="write full trajectories as memory-mapped .npy columns")
+    export_parser.add_argument("--careers", type=int, default=2500, help="careers per arm")
+    export_parser.add_argument("--engine", choices=("cohort", "python"), default="cohort")
+    export_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    export_parser.add_argument("--output", default="exports/study", help="export directory")
+    export_parser.set_defaults(handler=export)
+
+    population_parser = commands.add_parser("population", help="population-scale arms in memory-bounded blocks")
+    population_parser.add_argument("--careers", type=int, default=100_000_000, help="careers per arm")
+    population_parser.add_argument("--memory-mb", type=float, default=256, help="peak working-memory budget")
+    population_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    population_parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    population_parser.set_defaults(handler=population)
+
+    sweep_parser = commands.add_parser("sweep", help="grid sweep over modifier and retirement parameters")
+    sweep_parser.add_argument("--param", action="append", default=[],
+                              help="name=v1,v2,... or name=start:stop:num (tuples as a/b/c); repeatable")
+    sweep_parser.add_argument("--careers", type=int, default=10_000, help="careers per arm and scenario")
+    sweep_parser.add_argument("--seed", type=int, default=STUDY_SEED)
+    sweep_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    sweep_parser.add_argument("--output", default="sweeps/sweep.csv", help="tidy CSV results table")
+    sweep_parser.set_defaults(handler=sweep)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Vectorized cohort engine: advances every career one year at a time with NumPy"""
+import numpy as np
+
+from simulator import STATES, STRESS_LEVELS, RETIREMENT_PARAMS, cache_table, get_transition_table, table_key
+from trajectories import STATE_INDEX, RETIRED, UNEMPLOYED, RANKS, UNEMPLOYMENT_BITS, CareerTrajectories
+
+# Per-state lookup arrays mirroring the dicts used by CareerProfile
+STRESS = np.array([STRESS_LEVELS.get(state, 0) for state in STATES], dtype=np.float64)
+LOW_LEVEL = np.isin(STATES, ["Entry Level", "Junior", "Mid-Level"])
+EXECUTIVE = np.isin(STATES, ["C-Suite", "VP", "Director"])
+
+# Transition outcomes are laid out by rank, so a given uniform maps to a
+# comparable move (demotion, stay, promotion) under every profile's table;
+# this keeps common-random-number arms coupled
+OUTCOME_ORDER = np.argsort(RANKS, kind='stable')
+
+# Guide-table resolution for transition sampling; a power of two keeps
+# draw * GUIDE_BINS exact so every draw maps to the correct bin
+GUIDE_BINS = 1024
+AMBIGUOUS = 255
+# Largest double below 1; MIRROR - u is the antithetic partner of a uniform u
+MIRROR = 1.0 - 2.0 ** -53
+
+
+# Cohort samplers (cumulative matrix, guide table) keyed like TRANSITION_TABLES
+SAMPLERS = {}
+
+
+def transition_weights(table):
+    """Dense (state x next state) probabilities of a compiled transition table, in STATES order"""
+    weights = np.zeros((len(STATES), len(STATES)))
+
+    for state, (next_states, cum_weights) in table.items():
+        previous = 0.0
+        for next_state, cum_weight in zip(next_states, cum_weights):
+            weights[STATE_INDEX[state], STATE_INDEX[next_state]] = cum_weight - previous
+            previous = cum_weight
+
+    return weights
+
+
+def cumulative_from_weights(weights):
+    """Row-wise normalized cumulative probabilities of (stacked) weight matrices
+
+    Columns follow OUTCOME_ORDER (lowest rank first) rather than STATES.
+    """
+    cumulative = np.cumsum(weights[..., OUTCOME_ORDER], axis=-1)
+    return cumulative / cumulative[..., -1:]
+
+
+def cumulative_transition_matrix(table):
+    """Row-wise cumulative probabilities from a compiled transition table"""
+    return cumulative_from_weights(transition_weights(table))
+
+
+def get_sampler(profile_spec=None, modifiers=None):
+    """Cumulative matrix and guide table for a profile type, built once from
+    the shared compiled transition table"""
+    key = table_key(profile_spec, modifiers)
+    sampler = SAMPLERS.get(key)
+    if sampler is None:
+        cumulative = cumulative_transition_matrix(get_transition_table(profile_spec, modifiers))
+        sampler = cache_table(SAMPLERS, key, (cumulative, build_guide_table(cumulative)))
+    return sampler
+
+
+def retirement_offsets(age, params=None):
+    """Age- and position-dependent part of the retirement probability, per state"""
+    params = params or RETIREMENT_PARAMS
+    base_prob = params["age_probs"][-1]
+    for threshold, prob in zip(params["age_thresholds"], params["age_probs"]):
+        if age < threshold:
+            base_prob = prob
+            break
+
+    offsets = np.full(len(STATES), base_prob)
+    if age > params["low_level_age"]:
+        offsets[LOW_LEVEL] += params["low_level_boost"]
+    offsets[EXECUTIVE] -= params["executive_discount"]
+    if age > params["unemployed_age"]:
+        offsets[UNEMPLOYED] += params["unemployed_boost"]
+    return offsets
+
+
+def retirement_probability(states, age, burnout, momentum, params=None):
+    """Vectorized get_retirement_probability for arrays of state codes"""
+    params = params or RETIREMENT_PARAMS
+    if np.ndim(age) == 0:
+        offsets = retirement_offsets(age, params)[states]
+    else:
+        offsets = np.select(
+            [age < threshold for threshold in params["age_thresholds"]],
+            params["age_probs"][:-1],
+            default=params["age_probs"][-1]
+        )
+        offsets = offsets + np.where((age > params["low_level_age"]) & LOW_LEVEL[states],
+                                     params["low_level_boost"], 0.0)
+        offsets = offsets - np.where(EXECUTIVE[states], params["executive_discount"], 0.0)
+        offsets = offsets + np.where((states == UNEMPLOYED) & (age > params["unemployed_age"]),
+                                     params["unemployed_boost"], 0.0)
+
+    burnout_factor = np.minimum(burnout / params["burnout_scale"], params["burnout_cap"])
+    momentum_factor = -np.minimum(momentum / params["momentum_scale"], params["momentum_cap"])
+
+    prob = np.clip(offsets + burnout_factor + momentum_factor, 0, 1.0)
+    return np.where(states == RETIRED, 1.0, prob)
+
+
+def advance_burnout(burnout, states):
+    """Vectorized CareerProfile.update_burnout for a year spent in `states`"""
+    return np.maximum(0, burnout + STRESS.take(states) - 0.5)
+
+
+def advance_momentum(momentum, old_states, new_states):
+    """Vectorized CareerProfile.update_momentum
+
+    Returns the new momentum and the promoted/demoted masks.
+    """
+    old_rank = RANKS.take(old_states)
+    new_rank = RANKS.take(new_states)
+    promoted = new_rank > old_rank
+    demoted = new_rank < old_rank
+    return np.maximum(0, momentum + 2 * promoted - 3 * demoted) * 0.9, promoted, demoted
+
+
+class ProfileBatch:
+    """CareerProfile counters of many careers as arrays (struct of arrays)
+
+    burnout and momentum are float64, promotions and demotions int32, and
+    unemployment is a uint64 bitmask per career (bit y set if the career
+    moved into Unemployed in year y), so a career costs 32 bytes instead of
+    a CareerProfile object. The update methods are the vectorized
+    CareerProfile ones.
+    """
+    __slots__ = ("burnout", "momentum", "promotions", "demotions", "unemployment")
+
+    def __init__(self, size=0, burnout=None, momentum=None, promotions=None, demotions=None, unemployment=None):
+        self.burnout = np.zeros(size) if burnout is None else burnout
+        self.momentum = np.zeros(size) if momentum is None else momentum
+        self.promotions = np.zeros(size, dtype=np.int32) if promotions is None else promotions
+        self.demotions = np.zeros(size, dtype=np.int32) if demotions is None else demotions
+        self.unemployment = np.zeros(size, dtype=np.uint64) if unemployment is None else unemployment
+
+    def __len__(self):
+        return len(self.burnout)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def update_burnout(self, states):
+        """A year spent in `states`"""
+        self.burnout = advance_burnout(self.burnout, states)
+
+    def update_momentum(self, old_states, new_states, moved=None):
+        """Moves from old_states to new_states; careers outside `moved` keep their counters"""
+        momentum, promoted, demoted = advance_momentum(self.momentum, old_states, new_states)
+        if moved is not None:
+            promoted &= moved
+            demoted &= moved
+            momentum = np.where(moved, momentum, self.momentum)
+        self.momentum = momentum
+        self.promotions += promoted
+        self.demotions += demoted
+
+    def record_unemployment(self, year, unemployed):
+        """Set bit `year` for the careers in the boolean mask `unemployed`"""
+        self.unemployment |= unemployed.astype(np.uint64) << np.uint64(year)
+
+    def take(self, index):
+        return ProfileBatch(**{name: getattr(self, name)[index] for name in self.__slots__})
+
+    def put(self, index, other):
+        for name in self.__slots__:
+            getattr(self, name)[index] = getattr(other, name)
+
+
+def build_guide_table(cumulative, bins=GUIDE_BINS):
+    """Index into the inverse CDF by the leading bits of the uniform draw.
+
+    Entry [state, b] holds the next state for every draw in [b/bins, (b+1)/bins)
+    or AMBIGUOUS when a transition boundary falls inside that bin.
+    """
+    lower = np.arange(bins) / bins
+    upper = np.arange(1, bins + 1) / bins
+    at_lower = (cumulative[:, None, :] <= lower[None, :, None]).sum(axis=2)
+    below_upper = (cumulative[:, None, :] < upper[None, :, None]).sum(axis=2)
+    guide = np.where(at_lower == below_upper, at_lower, AMBIGUOUS)
+    return guide.astype(np.uint8).ravel()
+
+
+def sample_transitions(cumulative, guide, states, draws):
+    """Inverse-CDF sampling of next states: a guide-table lookup per career,
+    with an exact comparison against the cumulative rows for the few draws
+    that land in a bin containing a transition boundary
+
+    states index the rows of cumulative; with several tables stacked
+    (table * len(STATES) + state) they select the table as well.
+    """
+    bins = guide.size // cumulative.shape[0]
+    next_states = guide.take(states * bins + (draws * bins).astype(np.intp))
+
+    ambiguous = np.flatnonzero(next_states == AMBIGUOUS)
+    if ambiguous.size:
+        exact = np.zeros(ambiguous.size, dtype=np.uint8)
+        for column in cumulative.T[:-1]:
+            exact += column.take(states[ambiguous]) <= draws[ambiguous]
+        next_states[ambiguous] = exact
+
+    return OUTCOME_ORDER.take(next_states.astype(np.intp))
+
+
+def yearly_draws(rng, n, antithetic=False):
+    """Retirement and transition uniforms for all n careers for one year
+
+    Antithetic partners use MIRROR - u, which maps the 2**-53 grid of
+    uniforms in [0, 1) exactly onto itself.
+    """
+    if not antithetic:
+        return rng.random((2, n))
+    half = n // 2
+    base = rng.random((2, n - half))
+    return np.concatenate([base, MIRROR - base[:, :half]], axis=1)
+
+
+def simulate_cohort(n, profile_spec=None, max_years=45, starting_age=22, rng=None,
+                    common_draws=False, antithetic=False, modifiers=None, retirement=None,
+                    policy=None, starting_state="Entry Level"):
+    """Simulate n careers of one profile type in lock-step, one year per step.
+
+    Follows the same rules as simulate_career: burnout is updated before the
+    retirement check, retirement skips the transition, and momentum and
+    promotion counters only change on transitions. Returns a
+    CareerTrajectories carrying the final profile counters of every career
+    (kept in a ProfileBatch while simulating; unemployment bits cover the
+    first UNEMPLOYMENT_BITS years) and the retirement-check probability of
+    its last year, which with the compiled table gives the probability of
+    every recorded move.
+
+    With common_draws=True career i always uses column i of a full-size
+    yearly draw, so cohorts of different profiles simulated from equally
+    seeded generators share their random numbers career by career. With
+    antithetic=True as well, the last n // 2 careers mirror the draws of
+    the first n // 2.
+
+    modifiers and retirement override MODIFIER_PARAMS and RETIREMENT_PARAMS.
+    starting_age and starting_state may also be given per career, as an
+    array of ages and an array of STATES codes.
+
+    policy (an interventions.InterventionSet) simulates n careers of each of
+    its arms in one pass instead, arm after arm: career i of every arm uses
+    column i of the yearly draws, as with common_draws, and each (arm, year)
+    samples from its own compiled table. profile_spec and modifiers are
+    then ignored.
+    """
+    rng = np.random.default_rng(rng)
+    if policy is None:
+        cumulative, guide = get_sampler(profile_spec, modifiers)
+        per_arm = n
+    else:
+        cumulative, guide = policy.cumulative, policy.guide
+        per_arm, n = n, n * len(policy)
+
+    # Retirement is absorbing, so every column starts out Retired and only
+    # careers still in the workforce are advanced and written each year
+    timeline = np.full((max_years + 1, n), RETIRED, dtype=np.uint8)
+    timeline[0] = STATE_INDEX[starting_state] if isinstance(starting_state, str) else starting_state
+
+    profiles = ProfileBatch(n)
+    retire_probability = np.full(n, np.nan)
+
+    working = np.arange(n)
+    current = timeline[0].astype(np.intp)
+    work = ProfileBatch(n)
+    per_career_age = np.ndim(starting_age) != 0
+    current_age = np.array(starting_age) if per_career_age else starting_age
+
+    for year in range(max_years):
+        current_age += 1
+        if not working.size:
+            break
+
+        work.update_burnout(current)
+
+        age = current_age.take(working) if per_career_age else current_age
+        retirement_prob = retirement_probability(current, age, work.burnout, work.momentum, retirement)
+        if policy is not None:
+            draws = yearly_draws(rng, per_arm, antithetic)[:, working % per_arm]
+        elif common_draws:
+            draws = yearly_draws(rng, n, antithetic)[:, working]
+        else:
+            draws = rng.random((2, working.size))
+        retiring = draws[0] < retirement_prob
+        transitioning = ~retiring
+
+        rows = current if policy is None else policy.table_rows(year, working // per_arm, current)
+        next_states = sample_transitions(cumulative, guide, rows, draws[1])
+        next_states[retiring] = RETIRED
+
+        work.update_momentum(current, next_states, transitioning)
+        if year < UNEMPLOYMENT_BITS:
+            work.record_unemployment(year, next_states == UNEMPLOYED)
+
+        current = next_states
+        timeline[year + 1, working] = current
+
+        leaving = current == RETIRED
+        if leaving.any():
+            done = working[leaving]
+            profiles.put(done, work.take(leaving))
+            retire_probability[done] = retirement_prob[leaving]
+
+            staying = ~leaving
+            working = working[staying]
+            current = current[staying]
+            work = work.take(staying)
+
+    profiles.put(working, work)
+    states = np.ascontiguousarray(timeline.T)
+
+    return CareerTrajectories(
+        states, starting_age,
+        burnout=profiles.burnout, momentum=profiles.momentum, promotions=profiles.promotions,
+        demotions=profiles.demotions, unemployment_mask=profiles.unemployment,
+        retire_probability=retire_probability
+    )
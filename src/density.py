@@ -0,0 +1,169 @@
+"""Deterministic density propagation: exact-in-the-limit answers without Monte Carlo
+
+Instead of sampling careers, the probability mass over (state, reached
+Director+, burnout, momentum) is pushed forward one year at a time with the
+same rules the samplers use: update_burnout, get_retirement_probability, the
+compiled apply_decision_modifiers table and update_momentum. Age is not a
+dimension because every career starts at the same age.
+
+Burnout moves in steps of 0.5, so the default burnout grid is exact up to
+max_burnout (mass beyond it is held at the cap). Momentum is continuous and
+bounded by 18 (the fixed point of (m + 2) * 0.9); it is mapped back onto its
+grid by linear interpolation, which preserves the mean.
+"""
+import numpy as np
+
+from simulator import STATES, INTERVENTIONS, get_transition_table, profile_key
+from cohort import advance_burnout, advance_momentum, retirement_probability
+from trajectories import STATE_INDEX, ENTRY_LEVEL, RETIRED, UNEMPLOYED, RANKS
+
+# Upper bound of the momentum score: m <= 0.9 * (m + 2) has fixed point 18
+MAX_MOMENTUM = 18.0
+
+
+def interpolation_matrix(values, grid):
+    """Matrix W with W[i, j] the share of grid point j's mass that lands on
+    grid point i after it moves to values[j]"""
+    step = grid[1] - grid[0]
+    position = np.clip((values - grid[0]) / step, 0, len(grid) - 1)
+    lower = np.minimum(np.floor(position).astype(np.intp), len(grid) - 2)
+    upper_share = position - lower
+
+    columns = np.arange(len(grid))
+    matrix = np.zeros((len(grid), len(grid)))
+    matrix[lower, columns] += 1 - upper_share
+    matrix[lower + 1, columns] += upper_share
+    return matrix
+
+
+def solve_density(profile_spec=None, max_years=45, starting_age=22,
+                  burnout_step=0.5, momentum_step=0.25, max_burnout=100.0):
+    """Propagate the career distribution of one profile type year by year
+
+    Returns the Director+ probability (as a percentage, like the samplers),
+    the distribution of the age at first retirement, the mean retirement
+    age and median unemployment year, and the expected state occupancy of
+    every year.
+    """
+    table = get_transition_table(profile_key(profile_spec))
+    burnout_grid = np.arange(0, max_burnout + burnout_step / 2, burnout_step)
+    momentum_grid = np.arange(0, MAX_MOMENTUM + momentum_step / 2, momentum_step)
+    burnout_mesh, momentum_mesh = np.meshgrid(burnout_grid, momentum_grid, indexing='ij')
+
+    # Precomputed per-state burnout moves and per-(old, new) momentum moves
+    burnout_moves = {
+        state: interpolation_matrix(advance_burnout(burnout_grid, state), burnout_grid)
+        for state in range(len(STATES))
+    }
+    momentum_moves = {}
+    for state, (next_states, _) in table.items():
+        for next_state in next_states:
+            old, new = STATE_INDEX[state], STATE_INDEX[next_state]
+            moved, _, _ = advance_momentum(momentum_grid, old, new)
+            momentum_moves[old, new] = interpolation_matrix(moved, momentum_grid)
+
+    # mass[state, reached_director, burnout, momentum]
+    mass = np.zeros((len(STATES), 2, len(burnout_grid), len(momentum_grid)))
+    mass[ENTRY_LEVEL, 0, 0, 0] = 1.0
+
+    retired_mass = np.zeros(2)
+    retirement_by_year = np.zeros(max_years + 1)
+    unemployment_by_year = np.zeros(max_years)
+    occupancy = np.zeros((max_years + 1, len(STATES)))
+    occupancy[0, ENTRY_LEVEL] = 1.0
+    current_age = starting_age
+
+    for year in range(max_years):
+        current_age += 1
+        new_mass = np.zeros_like(mass)
+
+        for state in range(len(STATES)):
+            if state == RETIRED or not mass[state].any():
+                continue
+
+            # Burnout is updated before the retirement check
+            working = burnout_moves[state] @ mass[state]
+
+            codes = np.full(burnout_mesh.shape, state)
+            retire_prob = retirement_probability(codes, current_age, burnout_mesh, momentum_mesh)
+            retiring = working * retire_prob
+            staying = working - retiring
+            retired_mass += retiring.sum(axis=(1, 2))
+            retirement_by_year[year + 1] += retiring.sum()
+
+            next_states, cum_weights = table[STATES[state]]
+            previous = 0.0
+            for next_state, cum_weight in zip(next_states, cum_weights):
+                prob, previous = cum_weight - previous, cum_weight
+                target = STATE_INDEX[next_state]
+                moved = prob * (staying @ momentum_moves[state, target].T)
+
+                if target == RETIRED:
+                    retired_mass += moved.sum(axis=(1, 2))
+                    retirement_by_year[year + 1] += moved.sum()
+                    continue
+                if target == UNEMPLOYED:
+                    unemployment_by_year[year] += moved.sum()
+
+                if RANKS[target] >= 7:
+                    new_mass[target, 1] += moved.sum(axis=0)
+                else:
+                    new_mass[target] += moved
+
+        mass = new_mass
+        occupancy[year + 1] = mass.sum(axis=(1, 2, 3))
+        occupancy[year + 1, RETIRED] = retirement_by_year[:year + 2].sum()
+
+    director_plus = retired_mass[1] + mass[:, 1].sum()
+    retire_ages = starting_age + np.arange(max_years + 1)
+    retired_total = retirement_by_year.sum()
+
+    return {
+        'director_plus_rate': director_plus * 100,
+        'avg_retire_age': (retire_ages @ retirement_by_year) / retired_total if retired_total else None,
+        'median_unemp': weighted_median(unemployment_by_year),
+        'retirement_age_distribution': dict(zip(retire_ages.tolist(), retirement_by_year.tolist())),
+        'retired_by_end': retired_total,
+        'occupancy': occupancy
+    }
+
+
+def weighted_median(weights):
+    """Median of the values 0..len(weights)-1 under non-negative weights"""
+    total = weights.sum()
+    if total <= 0:
+        return None
+    cumulative = np.cumsum(weights) / total
+    lower = int(np.searchsorted(cumulative, 0.5))
+    if np.isclose(cumulative[lower], 0.5) and lower + 1 < len(weights):
+        return (lower + lower + 1) / 2
+    return float(lower)
+
+
+def run_density_study(**grid):
+    """Density solution for every intervention arm"""
+    return {
+        name: solve_density((spec_value, risk_value), **grid)
+        for name, spec_value, risk_value in INTERVENTIONS
+    }
+
+
+def compare_with_sampler(num_simulations=200_000, seed=None, **grid):
+    """Print the density solution next to a cohort Monte Carlo run of each arm"""
+    from cohort import simulate_cohort
+
+    density = run_density_study(**grid)
+    rng = np.random.default_rng(seed)
+
+    print(f"{'Intervention':<15} {'Director+ (density)':<22} {'Director+ (MC)':<22} {'Retire age (density / MC)'}")
+    print("-" * 85)
+    for name, spec_value, risk_value in INTERVENTIONS:
+        sampled = simulate_cohort(num_simulations, (spec_value, risk_value), rng=rng)
+        mc = sampled.summary()
+        rate = mc['director_plus_rate']
+        std_err = np.sqrt(rate * (100 - rate) / num_simulations)
+        print(f"{name:<15} {density[name]['director_plus_rate']:>8.3f}%"
+              f"{'':<13} {rate:>8.3f}% ± {std_err:.3f}{'':<4}"
+              f"{density[name]['avg_retire_age']:.2f} / {mc['avg_retire_age']:.2f}")
+
+    return density
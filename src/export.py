@@ -0,0 +1,170 @@
+"""Memory-mapped columnar export of full trajectories
+
+An export is a directory of .npy columns with one row per career, arms
+stored one after another:
+
+    states.npy       (careers, max_years + 1) uint8 codes into STATES
+    burnout.npy      float64 final CareerProfile.burnout_score
+    momentum.npy     float64 final CareerProfile.momentum_score
+    promotions.npy   int32 total_promotions
+    demotions.npy    int32 total_demotions
+    meta.json        arms with their row ranges, STATES, ages, seed
+
+Columns are preallocated with open_memmap and filled block by block while
+the careers are simulated, so nothing larger than one block is held in
+memory. TrajectoryStore opens an export with mmap_mode='r': slicing by arm,
+year or career reads only the pages touched.
+"""
+import json
+import os
+
+import numpy as np
+
+from simulator import STATES, INTERVENTIONS, STREAM_BLOCK_SIZE, CareerProfile, simulate_career, arm_seed, make_rng
+from trajectories import CareerTrajectories, record_careers
+
+COLUMNS = {
+    'burnout': np.float64,
+    'momentum': np.float64,
+    'promotions': np.int32,
+    'demotions': np.int32
+}
+
+
+class TrajectoryWriter:
+    """Incrementally fills the columns of an export, arm by arm"""
+    def __init__(self, directory, arm_sizes, max_years=45, starting_age=22, seed=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        total = sum(arm_sizes.values())
+
+        self.arms = {}
+        start = 0
+        for name, size in arm_sizes.items():
+            self.arms[name] = {'start': start, 'stop': start + size, 'written': 0}
+            start += size
+
+        self.meta = {
+            'arms': {name: [arm['start'], arm['stop']] for name, arm in self.arms.items()},
+            'states': STATES,
+            'max_years': max_years,
+            'starting_age': starting_age,
+            'seed': None if seed is None else str(seed),
+            'complete': False
+        }
+        self.write_meta()
+
+        self.states = np.lib.format.open_memmap(
+            os.path.join(directory, 'states.npy'), mode='w+', dtype=np.uint8, shape=(total, max_years + 1)
+        )
+        self.columns = {
+            name: np.lib.format.open_memmap(os.path.join(directory, f'{name}.npy'), mode='w+',
+                                            dtype=dtype, shape=(total,))
+            for name, dtype in COLUMNS.items()
+        }
+
+    def write(self, arm, trajectories):
+        """Append a CareerTrajectories block to an arm's rows"""
+        region = self.arms[arm]
+        start = region['start'] + region['written']
+        stop = start + len(trajectories)
+        if stop > region['stop']:
+            raise ValueError(f"Arm {arm} was sized for {region['stop'] - region['start']} careers")
+
+        self.states[start:stop] = trajectories.states
+        for name in COLUMNS:
+            values = getattr(trajectories, name)
+            self.columns[name][start:stop] = 0 if values is None else values
+        region['written'] += len(trajectories)
+
+    def write_meta(self):
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as output:
+            json.dump(self.meta, output, indent=2)
+
+    def close(self):
+        self.states.flush()
+        for column in self.columns.values():
+            column.flush()
+        self.meta['complete'] = all(
+            region['written'] == region['stop'] - region['start'] for region in self.arms.values()
+        )
+        self.write_meta()
+        del self.states, self.columns
+
+
+class TrajectoryStore:
+    """Read-only, zero-copy view of an export"""
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as source:
+            self.meta = json.load(source)
+        self.states = np.load(os.path.join(directory, 'states.npy'), mmap_mode='r')
+        self.columns = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def arm_names(self):
+        return list(self.meta['arms'])
+
+    def arm_rows(self, arm):
+        start, stop = self.meta['arms'][arm]
+        return slice(start, stop)
+
+    def column(self, name, arm=None):
+        """A per-career column ('states' or a profile counter), optionally of one arm"""
+        values = self.states if name == 'states' else self.columns[name]
+        return values if arm is None else values[self.arm_rows(arm)]
+
+    def year(self, year, arm=None):
+        """State codes of every career (of one arm) in a given year"""
+        return self.column('states', arm)[:, year]
+
+    def careers(self, arm, start=0, stop=None):
+        """Careers [start, stop) of an arm as a CareerTrajectories"""
+        rows = self.arm_rows(arm)
+        stop = rows.stop - rows.start if stop is None else stop
+        selection = slice(rows.start + start, rows.start + stop)
+        return CareerTrajectories(
+            self.states[selection], self.meta['starting_age'],
+            **{name: np.asarray(column[selection]) for name, column in self.columns.items()}
+        )
+
+
+def export_study(directory, num_simulations, engine="cohort", seed=None, iteration=0,
+                 block_size=STREAM_BLOCK_SIZE):
+    """Simulate every arm and write its trajectories as they are produced
+
+    Each arm uses arm_seed(seed, iteration, arm) and, with the default
+    block_size, the same block layout as run_arm, so the export holds
+    exactly the careers of that iteration of
+    run_uncertainty_analysis(seed=seed). Returns a TrajectoryStore.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    writer = TrajectoryWriter(directory, {name: num_simulations for name, _, _ in INTERVENTIONS}, seed=seed)
+    try:
+        for arm_index, (name, spec_value, risk_value) in enumerate(INTERVENTIONS):
+            rng = make_rng(arm_seed(seed, iteration, arm_index), engine)
+            for start in range(0, num_simulations, block_size):
+                block = min(block_size, num_simulations - start)
+                if engine == "cohort":
+                    from cohort import simulate_cohort
+                    trajectories = simulate_cohort(block, (spec_value, risk_value), rng=rng)
+                else:
+                    trajectories = record_careers(
+                        (simulate_career(profile=CareerProfile(early_specialization=spec_value,
+                                                               risk_tolerance=risk_value), rng=rng)
+                         for _ in range(block)),
+                        block
+                    )
+                writer.write(name, trajectories)
+            print(f"💾 {name}: {num_simulations:,} trajectories written")
+    finally:
+        writer.close()
+
+    return TrajectoryStore(directory)
@@ -0,0 +1,124 @@
+"""Progress events, stage timings and optional per-stage profiling
+
+An Instrumentation object is passed to run_uncertainty_analysis / main and
+forwards events to listeners, callables taking (event, data):
+
+    run_start          num_iterations, careers_per_iteration, first_iteration
+    iteration_start    iteration, num_iterations
+    iteration_end      iteration, num_iterations, results, elapsed
+    careers_completed  count, total
+    stage_end          stage, seconds
+
+Stages ('simulate', 'aggregate', 'print', 'plot') are timed with
+instrumentation.stage(name). With profile=True or trace_memory=True each
+stage is also run under cProfile / tracemalloc; with worker processes only
+the parent's share of the work is profiled.
+"""
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+from simulator import INTERVENTIONS
+
+
+class Instrumentation:
+    """Event hub with stage timers"""
+    def __init__(self, listeners=(), profile=False, trace_memory=False):
+        self.listeners = list(listeners)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.timings = {}
+        self.profiles = {}
+        self.memory_peaks = {}
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def emit(self, event, **data):
+        for listener in self.listeners:
+            listener(event, data)
+
+    @contextmanager
+    def stage(self, name):
+        """Time (and optionally profile) the enclosed block as one stage"""
+        profiler = cProfile.Profile() if self.profile else None
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+                self.profiles[name] = pstats.Stats(profiler)
+            if tracing:
+                self.memory_peaks[name] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            self.emit('stage_end', stage=name, seconds=seconds)
+
+    def profile_report(self, stage, limit=15, sort='cumulative'):
+        """Top functions of a profiled stage as text"""
+        output = io.StringIO()
+        self.profiles[stage].stream = output
+        self.profiles[stage].sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def print_stage_summary(self):
+        print("\n⏱️  Stage timings:")
+        for name, seconds in self.timings.items():
+            peak = self.memory_peaks.get(name)
+            memory = f"  peak {peak / 1024 ** 2:.1f} MB" if peak is not None else ""
+            print(f"  • {name:<10} {seconds:8.2f}s{memory}")
+
+
+class ProgressReporter:
+    """Listener printing throughput, ETA and the running Director+ CI per iteration"""
+    def __init__(self, z=1.96):
+        self.z = z
+        self.rates = {name: [] for name, _, _ in INTERVENTIONS}
+
+    def __call__(self, event, data):
+        if event == 'run_start':
+            self.start = time.perf_counter()
+            self.first_iteration = data['first_iteration']
+            self.careers_per_iteration = data['careers_per_iteration']
+            self.careers_done = 0
+        elif event == 'careers_completed':
+            self.careers_done += data['count']
+        elif event == 'iteration_end':
+            self.report(data)
+
+    def running_ci(self, name):
+        rates = np.array(self.rates[name])
+        if len(rates) < 2:
+            return rates.mean(), float('nan')
+        return rates.mean(), self.z * rates.std(ddof=1) / np.sqrt(len(rates))
+
+    def report(self, data):
+        for name, _, _ in INTERVENTIONS:
+            self.rates[name].append(data['results'][name]['director_plus_rate'])
+
+        elapsed = time.perf_counter() - self.start
+        done = data['iteration'] + 1 - self.first_iteration
+        remaining = data['num_iterations'] - data['iteration'] - 1
+        eta = elapsed / done * remaining
+        throughput = self.careers_done / elapsed if elapsed > 0 else float('inf')
+
+        intervals = []
+        for name, _, _ in INTERVENTIONS:
+            mean, half = self.running_ci(name)
+            intervals.append(f"{name} {mean:.2f}%" if np.isnan(half) else f"{name} {mean:.2f}±{half:.2f}%")
+        intervals = "  ".join(intervals)
+        print(f"[Iteration {data['iteration'] + 1}/{data['num_iterations']}] "
+              f"{throughput:,.0f} careers/s  ETA {eta:.1f}s  Director+ {intervals}")
@@ -0,0 +1,278 @@
+"""Declarative intervention specs compiled into batched cohort arms
+
+A spec is a dict (or a JSON file holding one) listing arms. Each arm starts
+from a profile type's transition table and applies its modifier rules:
+
+    {
+        "arms": [
+            {"name": "control"},
+            {"name": "specialist", "profile": {"early_specialization": true}},
+            {"name": "mentoring", "rules": [
+                {"from": ["Lead", "Manager"], "to": ["Manager", "Director"],
+                 "multiply": 1.4, "years": [5, 15]}
+            ]}
+        ]
+    }
+
+profile takes early_specialization / risk_tolerance (control by default),
+modifiers overrides MODIFIER_PARAMS for the arm. A rule multiplies the
+probability of every from -> to move (from defaults to every working
+state) during the years-worked window [start, stop) (the whole career by
+default); moves are renormalized afterwards, like apply_decision_modifiers.
+
+compile_interventions turns a spec into one weight matrix per (arm, year),
+keeps the distinct ones and stacks them for the cohort sampler.
+run_interventions then advances every arm in a single simulate_cohort pass
+per block: all arms share the yearly draws career by career (common random
+numbers) and all compiled tables.
+"""
+import json
+import time
+
+import numpy as np
+
+from simulator import STATES, INTERVENTIONS, MODIFIER_PARAMS, RISK_LEVELS, get_transition_table
+from cohort import build_guide_table, cumulative_from_weights, simulate_cohort, transition_weights
+from trajectories import STATE_INDEX, RETIRED, UNEMPLOYED
+
+# Careers per arm simulated in one pass; a pass holds this many careers of
+# every arm, so memory grows with the number of arms
+INTERVENTION_BLOCK_SIZE = 10_000
+
+ARM_KEYS = {"name", "profile", "modifiers", "rules"}
+RULE_KEYS = {"from", "to", "multiply", "years"}
+WORKING_STATES = [state for state in STATES if state != "Retired"]
+
+TABLE_COLUMNS = [
+    'arm', 'careers', 'director_plus_rate', 'director_std_err',
+    'delta_vs_control', 'delta_std_err', 'avg_retire_age', 'median_unemp'
+]
+
+
+def default_spec():
+    """The hardcoded INTERVENTIONS arms as a spec"""
+    return {"arms": [
+        {"name": name, "profile": {"early_specialization": spec_value, "risk_tolerance": risk_value}}
+        for name, spec_value, risk_value in INTERVENTIONS
+    ]}
+
+
+def load_spec(path):
+    with open(path) as source:
+        return json.load(source)
+
+
+def non_negative_number(value):
+    """A finite, non-negative int or float (JSON true/false are not numbers)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value < float('inf')
+
+
+def state_indices(states, what):
+    if isinstance(states, str):
+        states = [states]
+    elif not isinstance(states, list) or not all(isinstance(state, str) for state in states):
+        raise ValueError(f"{what} must be a state name or a list of them")
+    unknown = [state for state in states if state not in STATE_INDEX]
+    if unknown:
+        raise ValueError(f"Unknown states in {what}: {unknown}")
+    return np.array([STATE_INDEX[state] for state in states], dtype=np.intp)
+
+
+def rule_factors(rules, max_years, arm):
+    """(years x state x next state) product of an arm's rule multipliers"""
+    factors = np.ones((max_years, len(STATES), len(STATES)))
+    if not isinstance(rules, list):
+        raise ValueError(f"Arm {arm}: rules must be a list")
+    for rule in rules:
+        if not isinstance(rule, dict) or set(rule) - RULE_KEYS or "to" not in rule or "multiply" not in rule:
+            raise ValueError(f"Arm {arm}: a rule needs 'to' and 'multiply' (and optionally 'from', "
+                             f"'years'), got {rule!r}")
+        sources = state_indices(rule.get("from", WORKING_STATES), f"arm {arm} 'from'")
+        if (sources == RETIRED).any():
+            raise ValueError(f"Arm {arm}: Retired is absorbing and cannot be a rule's 'from' state")
+        targets = state_indices(rule["to"], f"arm {arm} 'to'")
+        if not non_negative_number(rule["multiply"]):
+            raise ValueError(f"Arm {arm}: multiply must be a non-negative number, got {rule['multiply']!r}")
+        years = rule.get("years", [0, max_years])
+        if (not isinstance(years, (list, tuple)) or len(years) != 2
+                or not all(isinstance(year, int) and not isinstance(year, bool) for year in years)):
+            raise ValueError(f"Arm {arm}: years must be a [start, stop] pair of integers, got {years!r}")
+        start, stop = years
+        if not 0 <= start < stop <= max_years:
+            raise ValueError(f"Arm {arm}: years window {[start, stop]} outside [0, {max_years}]")
+        factors[start:stop, sources[:, None], targets] *= rule["multiply"]
+    return factors
+
+
+def arm_weights(arm, max_years):
+    """Transition weights of one spec arm for every year worked"""
+    unknown = set(arm) - ARM_KEYS
+    if unknown or "name" not in arm:
+        raise ValueError(f"An arm needs a 'name' (and optionally 'profile', 'modifiers', 'rules'), "
+                         f"got {sorted(arm)}")
+    profile = arm.get("profile", {})
+    if not isinstance(profile, dict):
+        raise ValueError(f"Arm {arm['name']}: profile must be an object")
+    unknown = set(profile) - {"early_specialization", "risk_tolerance"}
+    if unknown:
+        raise ValueError(f"Arm {arm['name']}: unknown profile fields {sorted(unknown)}")
+    profile_spec = (profile.get("early_specialization", False), profile.get("risk_tolerance", "medium"))
+    if not isinstance(profile_spec[0], bool):
+        raise ValueError(f"Arm {arm['name']}: early_specialization must be true or false")
+    if not isinstance(profile_spec[1], str) or profile_spec[1] not in RISK_LEVELS:
+        raise ValueError(f"Arm {arm['name']}: risk_tolerance must be one of {list(RISK_LEVELS)}, "
+                         f"got {profile_spec[1]!r}")
+
+    modifiers = arm.get("modifiers", {})
+    if not isinstance(modifiers, dict):
+        raise ValueError(f"Arm {arm['name']}: modifiers must be an object")
+    unknown = set(modifiers) - set(MODIFIER_PARAMS)
+    if unknown:
+        raise ValueError(f"Arm {arm['name']}: unknown modifiers {sorted(unknown)}")
+    invalid = sorted(name for name, value in modifiers.items() if not non_negative_number(value))
+    if invalid:
+        raise ValueError(f"Arm {arm['name']}: modifiers {invalid} must be non-negative numbers")
+
+    base = transition_weights(get_transition_table(profile_spec, {**MODIFIER_PARAMS, **modifiers}))
+    weights = base * rule_factors(arm.get("rules", []), max_years, arm["name"])
+
+    stuck = [STATES[state] for state in np.flatnonzero((weights.sum(axis=-1) == 0).any(axis=0))]
+    if stuck:
+        raise ValueError(f"Arm {arm['name']}: rules leave no possible move from {stuck}")
+    return weights
+
+
+class InterventionSet:
+    """Compiled arms of a spec
+
+    cumulative stacks the distinct (state x next state) tables row-wise for
+    sample_transitions, and table_index[arm, year] picks the table an arm
+    uses in a given year worked.
+    """
+    def __init__(self, names, weights):
+        arms, max_years = weights.shape[:2]
+        tables, index = np.unique(weights.reshape(arms * max_years, -1), axis=0, return_inverse=True)
+        self.names = names
+        self.table_index = index.reshape(arms, max_years)
+        self.cumulative = cumulative_from_weights(tables.reshape(-1, len(STATES)))
+        self.guide = build_guide_table(self.cumulative)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def num_tables(self):
+        return len(self.cumulative) // len(STATES)
+
+    def table_rows(self, year, arms, states):
+        """Rows of the stacked tables for careers of the given arms in a given year"""
+        return self.table_index[:, year].take(arms) * len(STATES) + states
+
+
+def compile_interventions(spec, max_years=45):
+    """InterventionSet of a spec dict or JSON path"""
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    arms = spec.get("arms") if isinstance(spec, dict) else None
+    if not isinstance(arms, list) or not arms or not all(isinstance(arm, dict) for arm in arms):
+        raise ValueError("A spec must be an object whose 'arms' is a non-empty list of arm objects")
+    names = [arm.get("name") for arm in arms]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Arm names must be unique, got {names}")
+    weights = np.stack([arm_weights(arm, max_years) for arm in arms])
+    return InterventionSet(names, weights)
+
+
+def arm_outcome_counts(trajectories, arms):
+    """outcome_counts of every arm of a batched pass, as arrays over arms"""
+    size = len(trajectories) // arms
+    reached = trajectories.director_plus().reshape(arms, size)
+    retire_year = trajectories.retire_year.reshape(arms, size).astype(np.int64)
+    retired = retire_year >= 0
+    unemployed = (trajectories.states[:, 1:] == UNEMPLOYED).reshape(arms, size, -1)
+    return (
+        reached,
+        retired.sum(axis=1),
+        np.where(retired, trajectories.starting_age + retire_year, 0).sum(axis=1),
+        unemployed.sum(axis=1)
+    )
+
+
+def run_interventions(spec=None, num_simulations=10_000, seed=None, block_size=INTERVENTION_BLOCK_SIZE,
+                      max_years=45, output=None):
+    """Simulate every arm of a spec in batched passes; one row per arm
+
+    Block b of every arm draws from SeedSequence(seed, spawn_key=(b,)), so an
+    arm's careers depend only on its own tables, the seed and block_size:
+    adding arms to a spec leaves the others unchanged. Deltas are against
+    the first arm, with paired standard errors from the common random
+    numbers. Returns the rows and, with output set, writes them as CSV.
+    """
+    from trajectories import metrics_from_counts
+
+    policy = compile_interventions(spec or default_spec(), max_years)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    arms = len(policy)
+
+    print("=" * 70)
+    print("INTERVENTION SPEC: Batched Arms")
+    print("=" * 70)
+    print(f"\n{arms} arms x {num_simulations:,} careers ({policy.num_tables} distinct tables)")
+    print(f"Seed: {seed}\n")
+
+    director_plus = np.zeros(arms, dtype=np.int64)
+    retired = np.zeros(arms, dtype=np.int64)
+    retire_age_sum = np.zeros(arms, dtype=np.int64)
+    unemp_counts = np.zeros((arms, max_years), dtype=np.int64)
+    differences = np.zeros((arms, 2))
+
+    start = time.perf_counter()
+    for block_index, block_start in enumerate(range(0, num_simulations, block_size)):
+        size = min(block_size, num_simulations - block_start)
+        block_seed = np.random.SeedSequence(seed, spawn_key=(block_index,))
+        trajectories = simulate_cohort(size, max_years=max_years, rng=np.random.default_rng(block_seed),
+                                       policy=policy)
+        reached, block_retired, block_age_sum, block_unemp = arm_outcome_counts(trajectories, arms)
+        director_plus += reached.sum(axis=1)
+        retired += block_retired
+        retire_age_sum += block_age_sum
+        unemp_counts += block_unemp
+        difference = reached.astype(np.float64) - reached[0]
+        differences += np.stack([difference.sum(axis=1), np.square(difference).sum(axis=1)], axis=1)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    rates = director_plus / num_simulations
+    for index, name in enumerate(policy.names):
+        metrics = metrics_from_counts(num_simulations, director_plus[index], retired[index],
+                                      retire_age_sum[index], unemp_counts[index])
+        total, total_sq = differences[index]
+        mean = total / num_simulations
+        variance = (total_sq - num_simulations * mean ** 2) / (num_simulations - 1) if num_simulations > 1 else 0.0
+        rows.append({
+            'arm': name,
+            'careers': num_simulations,
+            'director_plus_rate': float(metrics['director_plus_rate']),
+            'director_std_err': float(np.sqrt(rates[index] * (1 - rates[index]) / num_simulations)) * 100,
+            'delta_vs_control': float(rates[index] - rates[0]) * 100,
+            'delta_std_err': float(np.sqrt(max(variance, 0.0) / num_simulations)) * 100,
+            'avg_retire_age': None if metrics['avg_retire_age'] is None else float(metrics['avg_retire_age']),
+            'median_unemp': metrics['median_unemp']
+        })
+
+    careers = arms * num_simulations
+    print(f"{'Arm':<20} {'Director+':>10} {'Delta':>16} {'Retire':>8} {'Unemp':>6}")
+    print("-" * 70)
+    for row in rows:
+        retire = "n/a" if row['avg_retire_age'] is None else f"{row['avg_retire_age']:.1f}"
+        unemp = "n/a" if row['median_unemp'] is None else f"{row['median_unemp']:.1f}"
+        print(f"{row['arm']:<20} {row['director_plus_rate']:9.2f}%  "
+              f"{row['delta_vs_control']:+6.2f} ± {row['delta_std_err']:.2f}pp {retire:>8} {unemp:>6}")
+    print(f"\n✅ {careers:,} careers in {elapsed:.1f}s ({careers / elapsed:,.0f} careers/s)")
+
+    if output:
+        from sweep import write_table
+        write_table(rows, output, TABLE_COLUMNS)
+        print(f"💾 Results table saved to '{output}'")
+    return rows
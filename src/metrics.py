@@ -0,0 +1,76 @@
+"""Streaming metric accumulation: careers are reduced as they finish, never stored"""
+import numpy as np
+
+from simulator import STATE_RANKS, get_peak_position
+from trajectories import STATE_INDEX, metrics_from_counts
+
+
+class ArmAccumulator:
+    """Online Director+, retirement-age and unemployment-year metrics for one arm
+
+    Keeps running counts plus a fixed-size reservoir sample of trajectories
+    (as uint8 state codes) for the heatmap panels, so memory does not grow
+    with the number of careers.
+    """
+    def __init__(self, max_years=45, starting_age=22, reservoir_size=50, rng=None):
+        self.starting_age = starting_age
+        self.num_careers = 0
+        self.director_plus = 0
+        self.retired = 0
+        self.retire_age_sum = 0
+        self.unemp_counts = np.zeros(max_years, dtype=np.int64)
+        self.reservoir = np.empty((reservoir_size, max_years + 1), dtype=np.uint8)
+        self.rng = np.random.default_rng(rng)
+
+    def add_career(self, career, profile):
+        """Feed one finished career from simulate_career"""
+        if STATE_RANKS.get(get_peak_position(career), 0) >= 7:
+            self.director_plus += 1
+        if "Retired" in career:
+            self.retired += 1
+            self.retire_age_sum += self.starting_age + career.index("Retired")
+        for year in profile.unemployment_history:
+            self.unemp_counts[year] += 1
+
+        slot = self._reservoir_slot(self.num_careers)
+        if slot is not None:
+            self.reservoir[slot] = [STATE_INDEX[state] for state in career]
+        self.num_careers += 1
+
+    def add_trajectories(self, trajectories):
+        """Feed a block of finished careers as a CareerTrajectories"""
+        states = trajectories.states
+        director_plus, retired, retire_age_sum, unemp_counts = trajectories.outcome_counts()
+        self.director_plus += director_plus
+        self.retired += retired
+        self.retire_age_sum += retire_age_sum
+        self.unemp_counts += unemp_counts
+
+        # Algorithm R: career t replaces a random slot with probability k/(t+1)
+        size = len(self.reservoir)
+        first = self.num_careers
+        filling = max(0, min(size - first, len(states)))
+        self.reservoir[first:first + filling] = states[:filling]
+
+        positions = np.arange(first + filling, first + len(states))
+        slots = self.rng.integers(0, positions + 1)
+        for offset, slot in zip(np.flatnonzero(slots < size), slots[slots < size]):
+            self.reservoir[slot] = states[filling + offset]
+
+        self.num_careers += len(states)
+
+    def _reservoir_slot(self, position):
+        size = len(self.reservoir)
+        if position < size:
+            return position
+        slot = self.rng.integers(0, position + 1)
+        return slot if slot < size else None
+
+    def summary(self):
+        """Arm metrics in the run_arm format plus the reservoir sample"""
+        summary = metrics_from_counts(
+            self.num_careers, self.director_plus, self.retired,
+            self.retire_age_sum, self.unemp_counts
+        )
+        summary['sample_states'] = self.reservoir[:min(self.num_careers, len(self.reservoir))].copy()
+        return summary
@@ -0,0 +1,203 @@
+"""Importance sampling of rare career outcomes
+
+An event is a state, reached at or above its rank ("C-Suite"), optionally
+by an age ("Director by 35"). Careers are simulated under a proposal table
+that favours moves up the ladder, and each career is weighted by its
+likelihood ratio: the product of base / proposal probabilities of its
+moves. The weighted event indicator then has the event probability as its
+mean, so estimates stay unbiased however strong the tilt.
+
+The proposal starts from the base table with every upward move multiplied
+by tilt, then a few cross-entropy pilot rounds refit it to the weighted
+moves of the careers that hit the event. It only applies inside the event's
+age window (one table per year worked, as in interventions.InterventionSet),
+and it never changes the probability of a move into Retired: the retirement
+check happens before the transition, with a probability that depends on the
+career so far, so keeping that move as is makes every ratio exact.
+"""
+import re
+import time
+
+import numpy as np
+
+from simulator import STATES, STATE_RANKS, STREAM_BLOCK_SIZE, get_transition_table
+from cohort import simulate_cohort, transition_weights
+from interventions import InterventionSet
+from trajectories import RANKS, RETIRED
+
+DEFAULT_EVENTS = ("C-Suite", "Director by 35", "C-Suite by 30")
+
+TABLE_COLUMNS = [
+    'event', 'careers', 'probability', 'std_err', 'relative_error', 'hits',
+    'effective_sample_size', 'variance_reduction', 'naive_careers_equivalent'
+]
+
+EVENT_PATTERN = re.compile(r"^\s*(?P<state>.+?)(?:\s+by\s+(?P<age>\d+))?\s*$")
+
+
+def parse_event(event, starting_age=22, max_years=45):
+    """'C-Suite' or 'Director by 35' -> (rank, years worked in the window)"""
+    match = EVENT_PATTERN.match(event)
+    state = match.group("state") if match else None
+    if state not in STATE_RANKS or not STATE_RANKS[state]:
+        raise ValueError(f"Unknown event {event!r}: expected '<state>' or '<state> by <age>' "
+                         f"with a ranked state")
+    if match.group("age") is None:
+        return STATE_RANKS[state], max_years
+    window = int(match.group("age")) - starting_age
+    if not 0 < window <= max_years:
+        raise ValueError(f"Event {event!r}: age must be within the first {max_years} years of a career "
+                         f"starting at {starting_age}")
+    return STATE_RANKS[state], window
+
+
+def event_mask(states, rank, window):
+    """Careers that reached rank within the first window years worked"""
+    return RANKS.take(states[:, :window + 1]).max(axis=1) >= rank
+
+
+def keep_retirement(weights, base):
+    """Normalize rows so that each move into Retired keeps its base probability"""
+    weights = np.where(base > 0, weights, 0.0)
+    weights[..., RETIRED] = 0.0
+    total = weights.sum(axis=-1, keepdims=True)
+    weights = weights / np.where(total > 0, total, 1.0) * (1 - base[..., RETIRED, None])
+    weights[..., RETIRED] = base[..., RETIRED]
+    return weights
+
+
+def tilted_proposal(base, tilt, window, max_years):
+    """Per-year proposal: upward moves multiplied by tilt inside the window, base after it"""
+    upward = RANKS[None, :] > RANKS[:, None]
+    proposal = np.repeat(base[None], max_years, axis=0)
+    proposal[:window] = keep_retirement(base * np.where(upward, tilt, 1.0), base)
+    return proposal
+
+
+def path_log_ratios(states, log_ratios, window):
+    """log(base / proposal) summed over the moves of each career inside the window"""
+    years = np.arange(window)
+    return log_ratios[years, states[:, :window], states[:, 1:window + 1]].sum(axis=1)
+
+
+def simulate_proposal(proposal, size, rng):
+    policy = InterventionSet(["proposal"], proposal[None])
+    return simulate_cohort(size, max_years=len(proposal), rng=rng, policy=policy)
+
+
+def weighted_outcomes(proposal, base, rank, window, size, rng):
+    """Simulate size careers under proposal; states, likelihood ratios and event mask"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ratios = np.where(base > 0, np.log(base) - np.log(proposal), 0.0)
+    states = simulate_proposal(proposal, size, rng).states.astype(np.intp)
+    hits = event_mask(states, rank, window)
+    ratios = np.exp(path_log_ratios(states, log_ratios, window))
+    return states, ratios, hits
+
+
+def cross_entropy_update(proposal, base, states, scores, window, smoothing):
+    """Refit the in-window table to the moves of careers weighted by score
+
+    The table becomes the score-weighted move frequencies over the window,
+    pooled across years, mixed with a smoothing share of the base table so
+    that no move the base allows gets probability zero.
+    """
+    size = len(STATES)
+    moves = states[:, :window] * size + states[:, 1:window + 1]
+    counts = np.bincount(moves.ravel(), np.repeat(scores, window), minlength=size * size).reshape(size, size)
+    total = counts.sum(axis=1, keepdims=True)
+    fitted = np.where(total > 0, counts / np.where(total > 0, total, 1.0), proposal[0])
+    updated = proposal.copy()
+    updated[:window] = keep_retirement((1 - smoothing) * fitted + smoothing * base, base)
+    return updated
+
+
+def estimate_event(event, base, num_simulations, seed, index=0, tilt=2.0, pilot=20_000, ce_iterations=3,
+                   smoothing=0.1, starting_age=22, max_years=45):
+    """Importance-sampling estimate of one event's probability
+
+    The pilot rounds only shape the proposal; the estimate comes from a
+    fresh num_simulations careers, in STREAM_BLOCK_SIZE blocks, so it is
+    unbiased with the usual sample variance of the weighted indicator.
+    """
+    rank, window = parse_event(event, starting_age, max_years)
+    base = np.broadcast_to(base, (max_years,) + base.shape)
+    proposal = tilted_proposal(base[0], tilt, window, max_years)
+
+    for iteration in range(ce_iterations):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index, 0, iteration)))
+        states, ratios, hits = weighted_outcomes(proposal, base, rank, window, pilot, rng)
+        if hits.any():
+            proposal = cross_entropy_update(proposal, base[0], states, ratios * hits, window, smoothing)
+
+    total = total_sq = 0.0
+    hit_count = 0
+    for block_index, block_start in enumerate(range(0, num_simulations, STREAM_BLOCK_SIZE)):
+        size = min(STREAM_BLOCK_SIZE, num_simulations - block_start)
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index, 1, block_index)))
+        _, ratios, hits = weighted_outcomes(proposal, base, rank, window, size, rng)
+        scores = ratios[hits]
+        total += scores.sum()
+        total_sq += np.square(scores).sum()
+        hit_count += int(hits.sum())
+
+    probability = total / num_simulations
+    variance = max(total_sq / num_simulations - probability ** 2, 0.0) * num_simulations / max(num_simulations - 1, 1)
+    std_err = np.sqrt(variance / num_simulations)
+    reduction = probability * (1 - probability) / variance if variance > 0 else None
+    return {
+        'event': event,
+        'careers': num_simulations,
+        'probability': float(probability),
+        'std_err': float(std_err),
+        'relative_error': float(std_err / probability) if probability > 0 else None,
+        'hits': hit_count,
+        'effective_sample_size': float(total ** 2 / total_sq) if total_sq > 0 else 0.0,
+        'variance_reduction': None if reduction is None else float(reduction),
+        'naive_careers_equivalent': None if reduction is None else int(reduction * num_simulations)
+    }
+
+
+def run_rare_events(events=DEFAULT_EVENTS, num_simulations=100_000, profile_spec=None, tilt=2.0,
+                    pilot=20_000, ce_iterations=3, seed=None, output=None):
+    """Importance-sampling estimates of rare events for one profile type
+
+    Event i draws from SeedSequence(seed, spawn_key=(i, stage, block)), so each
+    estimate is reproducible on its own. variance_reduction is the naive
+    per-career variance p(1 - p) over the weighted one: how many times more
+    plain Monte Carlo careers the same standard error would take. Returns
+    one row per event and, with output set, writes them as CSV.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    base = transition_weights(get_transition_table(profile_spec))
+    base = base / base.sum(axis=1, keepdims=True)
+
+    print("=" * 70)
+    print("RARE EVENTS: Importance Sampling")
+    print("=" * 70)
+    print(f"\n{num_simulations:,} careers per event (tilt {tilt}, {ce_iterations} x {pilot:,} "
+          f"cross-entropy pilot careers)")
+    print(f"Seed: {seed}\n")
+
+    rows = []
+    start = time.perf_counter()
+    for index, event in enumerate(events):
+        rows.append(estimate_event(event, base, num_simulations, seed, index, tilt, pilot, ce_iterations))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Event':<20} {'Probability':>22} {'Rel. err':>9} {'Var. red.':>10} {'Naive equiv.':>14}")
+    print("-" * 80)
+    for row in rows:
+        relative = "n/a" if row['relative_error'] is None else f"{row['relative_error']:.2%}"
+        reduction = "n/a" if row['variance_reduction'] is None else f"{row['variance_reduction']:.1f}x"
+        naive = "n/a" if row['naive_careers_equivalent'] is None else f"{row['naive_careers_equivalent']:,}"
+        print(f"{row['event']:<20} {row['probability'] * 100:>10.4g}% ± {row['std_err'] * 100:.2g}% "
+              f"{relative:>9} {reduction:>10} {naive:>14}")
+    print(f"\n✅ {len(rows)} events in {elapsed:.1f}s")
+
+    if output:
+        from sweep import write_table
+        write_table(rows, output, TABLE_COLUMNS)
+        print(f"💾 Results table saved to '{output}'")
+    return rows
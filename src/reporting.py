@@ -0,0 +1,259 @@
+"""Figures of the uncertainty analysis
+
+Kept apart from simulator.py so that importing the simulation code does not
+pull in matplotlib; simulator loads this module only when a figure is asked for.
+Every figure takes output_dir, fmt ('png', 'svg', 'pdf', ...) and dpi, so
+draft renders can be cheap.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from simulator import STATES
+
+
+def sample_description(results):
+    """(what the rate distribution is over, sample-size note) of a results dict"""
+    count = len(results['control']['all_director_rates'])
+    if 'replicates' in results:
+        return (f"{count:,} Bootstrap Replicates",
+                f"n = {results['careers_per_arm']:,} careers, {count:,} bootstrap replicates")
+    careers = results.get('careers_per_iteration')
+    iterations = f"{count} iteration{'s' if count != 1 else ''}"
+    return iterations.title(), (f"n = {careers:,} careers × {iterations}" if careers else f"n = {iterations}")
+
+
+def plot_uncertainty_results(results, output_dir="figures", fmt="png", dpi=300):
+    """Create publication-quality plots with confidence intervals"""
+    fig = plt.figure(figsize=(18, 12))
+    
+    # Plot 1: Director+ Rate with Error Bars (THE KILLER FIGURE)
+    ax1 = plt.subplot(2, 3, 1)
+    
+    interventions = ['Control', 'Early\nSpecialization', 'High\nRisk']
+    means = [
+        results['control']['director_mean'],
+        results['specialist']['director_mean'],
+        results['risktaker']['director_mean']
+    ]
+    
+    ci_lows = [
+        results['control']['director_ci_lower'],
+        results['specialist']['director_ci_lower'],
+        results['risktaker']['director_ci_lower']
+    ]
+    
+    ci_highs = [
+        results['control']['director_ci_upper'],
+        results['specialist']['director_ci_upper'],
+        results['risktaker']['director_ci_upper']
+    ]
+    
+    errors_low = [means[i] - ci_lows[i] for i in range(3)]
+    errors_high = [ci_highs[i] - means[i] for i in range(3)]
+    
+    colors = ['#3498db', '#e74c3c', '#f39c12']
+    x_pos = np.arange(len(interventions))
+    
+    bars = ax1.bar(x_pos, means, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
+    ax1.errorbar(x_pos, means, yerr=[errors_low, errors_high], 
+                 fmt='none', ecolor='black', capsize=8, capthick=2, linewidth=2)
+    
+    ax1.set_ylabel('Director+ Achievement Rate (%)', fontsize=12, fontweight='bold')
+    ax1.set_title('BUTTERFLY EFFECT: Director+ Achievement\nwith 95% Confidence Intervals', 
+                  fontsize=13, fontweight='bold')
+    ax1.set_xticks(x_pos)
+    ax1.set_xticklabels(interventions, fontsize=11)
+    ax1.grid(axis='y', alpha=0.3, linestyle='--')
+    ax1.set_ylim(0, max(ci_highs) * 1.15)
+    
+    # Add value labels on bars
+    for i, (bar, mean) in enumerate(zip(bars, means)):
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + errors_high[i] + 0.5,
+                f'{mean:.2f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    
+    # Plot 2: Distribution of Director+ Rates Across Iterations
+    ax2 = plt.subplot(2, 3, 2)
+    
+    data_to_plot = [
+        results['control']['all_director_rates'],
+        results['specialist']['all_director_rates'],
+        results['risktaker']['all_director_rates']
+    ]
+    
+    bp = ax2.boxplot(data_to_plot, patch_artist=True, notch=True, showmeans=True)
+    ax2.set_xticks(range(1, len(interventions) + 1), interventions)
+    
+    for patch, color in zip(bp['boxes'], colors):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+    
+    ax2.set_ylabel('Director+ Rate (%)', fontsize=12, fontweight='bold')
+    ax2.set_title(f'Distribution Across {sample_description(results)[0]}\n(Uncertainty Visualization)',
+                  fontsize=13, fontweight='bold')
+    ax2.grid(axis='y', alpha=0.3, linestyle='--')
+    
+    # Plot 3: Retirement Age with Error Bars
+    ax3 = plt.subplot(2, 3, 3)
+    
+    retire_means = [
+        results['control']['retire_mean'],
+        results['specialist']['retire_mean'],
+        results['risktaker']['retire_mean']
+    ]
+    
+    retire_stds = [
+        results['control']['retire_std'],
+        results['specialist']['retire_std'],
+        results['risktaker']['retire_std']
+    ]
+    
+    bars3 = ax3.bar(x_pos, retire_means, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
+    ax3.errorbar(x_pos, retire_means, yerr=retire_stds,
+                 fmt='none', ecolor='black', capsize=8, capthick=2, linewidth=2)
+    
+    ax3.set_ylabel('Average Retirement Age', fontsize=12, fontweight='bold')
+    ax3.set_title('Path-Dependent Retirement Age\nwith Standard Deviation', 
+                  fontsize=13, fontweight='bold')
+    ax3.set_xticks(x_pos)
+    ax3.set_xticklabels(interventions, fontsize=11)
+    ax3.grid(axis='y', alpha=0.3, linestyle='--')
+    
+    # Add value labels
+    for bar, mean, std in zip(bars3, retire_means, retire_stds):
+        height = bar.get_height()
+        ax3.text(bar.get_x() + bar.get_width()/2., height + std + 0.3,
+                f'{mean:.1f}', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    
+    # Plot 4-6: Career Trajectories from Last Iteration
+    last_iter = results['last_iteration']
+    
+    for idx, (intervention, title) in enumerate([
+        ('control', 'Control Group'),
+        ('specialist', 'Early Specialization'),
+        ('risktaker', 'High Risk Tolerance')
+    ]):
+        ax = plt.subplot(2, 3, 4 + idx)
+        
+        career_matrix = last_iter[intervention]['sample_states']
+        sample_size = len(career_matrix)
+        
+        im = ax.imshow(career_matrix, aspect='auto', cmap='RdYlGn', interpolation='nearest')
+        ax.set_xlabel('Years', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Career Sample', fontsize=11, fontweight='bold')
+        ax.set_title(f'{title}\n(n={sample_size} trajectories)', fontsize=12, fontweight='bold')
+    
+    # Add colorbar
+    cbar = plt.colorbar(im, ax=fig.get_axes()[3:], location='right', shrink=0.6)
+    cbar.set_ticks(range(len(STATES)))
+    cbar.set_ticklabels(STATES, fontsize=9)
+    
+    plt.tight_layout()
+    path = os.path.join(output_dir, f"uncertainty_analysis.{fmt}")
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    print(f"\n✅ Uncertainty analysis plot saved to '{path}'")
+    return path
+
+
+def create_killer_figure(results, output_dir="figures", fmt="png", dpi=300):
+    """Create ONE publication-quality figure that tells the whole story"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    interventions = ['Control', 'Early Specialization', 'High Risk Tolerance']
+    means = [
+        results['control']['director_mean'],
+        results['specialist']['director_mean'],
+        results['risktaker']['director_mean']
+    ]
+    
+    ci_lows = [
+        results['control']['director_ci_lower'],
+        results['specialist']['director_ci_lower'],
+        results['risktaker']['director_ci_lower']
+    ]
+    
+    ci_highs = [
+        results['control']['director_ci_upper'],
+        results['specialist']['director_ci_upper'],
+        results['risktaker']['director_ci_upper']
+    ]
+    
+    errors_low = [means[i] - ci_lows[i] for i in range(3)]
+    errors_high = [ci_highs[i] - means[i] for i in range(3)]
+    
+    colors = ['#2C3E50', '#E74C3C', '#F39C12']
+    x_pos = np.arange(len(interventions))
+    
+    bars = ax.bar(x_pos, means, color=colors, alpha=0.85, edgecolor='black', linewidth=2)
+    ax.errorbar(x_pos, means, yerr=[errors_low, errors_high],
+                fmt='none', ecolor='black', capsize=10, capthick=2.5, linewidth=2.5, zorder=10)
+    
+    # Styling
+    ax.set_ylabel('Director+ Achievement Rate (%)', fontsize=16, fontweight='bold')
+    ax.set_title('The Butterfly Effect in Career Progression\nImpact of Early Decisions on Long-Term Success',
+                 fontsize=18, fontweight='bold', pad=20)
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(interventions, fontsize=14, fontweight='bold')
+    ax.tick_params(axis='both', which='major', labelsize=12)
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=1.5)
+    ax.set_ylim(0, max(ci_highs) * 1.2)
+    
+    # Add value labels with CI
+    for i, (bar, mean, ci_low, ci_high) in enumerate(zip(bars, means, ci_lows, ci_highs)):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + errors_high[i] + 1,
+                f'{mean:.2f}%\n[{ci_low:.2f}%, {ci_high:.2f}%]',
+                ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    # Add delta annotations
+    control_mean = means[0]
+    for i in range(1, 3):
+        delta = means[i] - control_mean
+        y_pos = max(means[0], means[i]) + max(errors_high[0], errors_high[i]) + 3
+        ax.annotate(f'Δ = {delta:+.2f}%',
+                   xy=(i, y_pos), fontsize=12, fontweight='bold',
+                   ha='center', color=colors[i],
+                   bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor=colors[i], linewidth=2))
+    
+    # Add sample size annotation
+    ax.text(0.02, 0.98, f'{sample_description(results)[1]}\n95% Confidence Intervals',
+            transform=ax.transAxes, fontsize=11, verticalalignment='top',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+    
+    plt.tight_layout()
+    path = os.path.join(output_dir, f"butterfly_effect_ci.{fmt}")
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    print(f"✅ Killer figure saved to '{path}'")
+    return path
+
+
+# Independent figures rendered by render_figures
+FIGURES = (plot_uncertainty_results, create_killer_figure)
+
+
+def render_figure(task):
+    """Process-pool entry point: (figure function, results, output_dir, fmt, dpi)"""
+    figure, results, output_dir, fmt, dpi = task
+    return figure(results, output_dir, fmt, dpi)
+
+
+def render_figures(results, output_dir="figures", fmt="png", dpi=300, parallel=None):
+    """Draw every figure, each in its own process when parallel; returns the paths
+
+    parallel=None renders in parallel only when more than one CPU is available.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(figure, results, output_dir, fmt, dpi) for figure in FIGURES]
+    if parallel is None:
+        parallel = (os.cpu_count() or 1) > 1
+    if not parallel:
+        return [render_figure(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+        return list(pool.map(render_figure, tasks))
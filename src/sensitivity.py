@@ -0,0 +1,265 @@
+"""Global sensitivity of the study metrics to the TRANSITIONS table
+
+Every non-zero move probability of a working state is a parameter. A
+sample scales each one by a factor in [1 - spread, 1 + spread], then
+renormalizes the rows, and applies the profile's decision modifiers as
+compile_transition_table does. Each sample is one arm of an
+interventions.InterventionSet, so a batch of samples runs through the
+cohort engine in one vectorized pass. Batches are spread over worker
+processes, and every sample uses the same random numbers career by career
+(common random numbers), so metric differences between samples come from
+the parameters rather than from sampling noise.
+
+    method="sobol"   first-order (Saltelli 2010) and total (Jansen) indices
+                     from base_samples * (parameters + 2) evaluations, with
+                     bootstrap 95% half-widths
+    method="morris"  elementary-effect screening (mu*, mu, sigma) from
+                     trajectories * (parameters + 1) evaluations
+
+Outputs are the Director+ rate and the mean retirement age.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulator import (STATES, TRANSITIONS, STREAM_BLOCK_SIZE, CareerProfile,
+                       apply_decision_modifiers, profile_key)
+from cohort import simulate_cohort
+from interventions import InterventionSet, arm_outcome_counts
+from trajectories import STATE_INDEX
+
+OUTPUTS = ('director_plus_rate', 'avg_retire_age')
+
+# Moves with a non-zero base probability, out of every state but Retired
+PARAMETERS = [
+    (state, next_state)
+    for state, transitions in TRANSITIONS.items() if state != "Retired"
+    for next_state, probability in transitions.items() if probability > 0
+]
+
+TABLE_COLUMNS = ['parameter', 'output', 'first_order', 'first_order_conf', 'total', 'total_conf',
+                 'mu_star', 'mu', 'sigma']
+
+
+def parameter_name(parameter):
+    return f"{parameter[0]} -> {parameter[1]}"
+
+
+def base_weights(profile_spec=None, modifiers=None, table=None):
+    """TRANSITIONS (or table, in the same format) with a profile's decision
+    modifiers applied, as a dense matrix
+
+    apply_decision_modifiers only scales individual moves before
+    normalizing, so applying it to a row of ones gives the per-move factors.
+    """
+    profile = CareerProfile(*profile_key(profile_spec))
+    weights = np.zeros((len(STATES), len(STATES)))
+    for state, transitions in (table or TRANSITIONS).items():
+        factors = apply_decision_modifiers(profile, {next_state: 1.0 for next_state in transitions},
+                                           state, 0, modifiers)
+        for next_state, probability in transitions.items():
+            weights[STATE_INDEX[state], STATE_INDEX[next_state]] = probability * factors.get(next_state, 0.0)
+    return weights
+
+
+def perturbed_weights(units, spread, base):
+    """Weight matrices of samples given as points of the unit cube (samples x parameters)"""
+    sources = np.array([STATE_INDEX[state] for state, _ in PARAMETERS])
+    targets = np.array([STATE_INDEX[next_state] for _, next_state in PARAMETERS])
+    weights = np.repeat(base[None], len(units), axis=0)
+    weights[:, sources, targets] *= 1 - spread + 2 * spread * units
+    return weights
+
+
+def evaluate_batch(task):
+    """Process-pool entry point: Director+ rate and mean retirement age of each sample"""
+    units, spread, base, careers, seed, max_years = task
+    weights = perturbed_weights(units, spread, base)
+    policy = InterventionSet(list(range(len(units))),
+                             np.broadcast_to(weights[:, None], (len(units), max_years) + weights.shape[1:]))
+    trajectories = simulate_cohort(careers, max_years=max_years, rng=np.random.default_rng(seed), policy=policy)
+    reached, retired, retire_age_sum, _ = arm_outcome_counts(trajectories, len(units))
+    return np.column_stack([reached.mean(axis=1) * 100, retire_age_sum / np.maximum(retired, 1)])
+
+
+def evaluate(units, spread, base, careers, seed, workers=None, max_years=45):
+    """Model outputs (samples x OUTPUTS) for every sample, in batched passes"""
+    batch = max(1, STREAM_BLOCK_SIZE // careers)
+    tasks = [(units[start:start + batch], spread, base, careers, seed, max_years)
+             for start in range(0, len(units), batch)]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(evaluate_batch, tasks))
+    else:
+        results = [evaluate_batch(task) for task in tasks]
+    return np.concatenate(results)
+
+
+def sobol_indices(y_a, y_b, y_ab):
+    """First-order and total indices from f(A), f(B) and f(A with column i from B)
+
+    y_a and y_b are (..., samples), y_ab is (..., samples, parameters).
+    Outputs are centered first: the estimators are unchanged in expectation
+    but the first-order one loses the variance the mean would add.
+    """
+    pooled = np.concatenate([y_a, y_b], axis=-1)
+    mean = pooled.mean(axis=-1, keepdims=True)
+    y_a, y_b, y_ab = y_a - mean, y_b - mean, y_ab - mean[..., None]
+    variance = np.var(pooled, axis=-1)[..., None]
+    first = np.mean(y_b[..., None] * (y_ab - y_a[..., None]), axis=-2) / variance
+    total = 0.5 * np.mean(np.square(y_a[..., None] - y_ab), axis=-2) / variance
+    return first, total
+
+
+def sobol_analysis(outputs, num_samples, resamples, rng):
+    """Indices per output with bootstrap 95% half-widths over the base samples"""
+    num_params = len(PARAMETERS)
+    y_a = outputs[:num_samples]
+    y_b = outputs[num_samples:2 * num_samples]
+    y_ab = outputs[2 * num_samples:].reshape(num_params, num_samples, -1).transpose(1, 0, 2)
+
+    results = {}
+    for index, output in enumerate(OUTPUTS):
+        a, b, ab = y_a[:, index], y_b[:, index], y_ab[:, :, index]
+        first, total = sobol_indices(a, b, ab)
+        picks = rng.integers(0, num_samples, (resamples, num_samples))
+        boot_first, boot_total = sobol_indices(a[picks], b[picks], ab[picks])
+        results[output] = {
+            'first_order': first,
+            'first_order_conf': 1.96 * np.std(boot_first, axis=0),
+            'total': total,
+            'total_conf': 1.96 * np.std(boot_total, axis=0)
+        }
+    return results
+
+
+def morris_design(num_trajectories, levels, rng):
+    """One-at-a-time trajectories on a levels-point grid of the unit cube
+
+    Returns the points (trajectories * (parameters + 1), parameters), the
+    parameter moved at each step and the signed step size.
+    """
+    num_params = len(PARAMETERS)
+    delta = levels / (2 * (levels - 1))
+    starts = np.arange(levels // 2) / (levels - 1)
+
+    points, moved, steps = [], [], []
+    for _ in range(num_trajectories):
+        direction = rng.choice([-1.0, 1.0], num_params)
+        point = rng.choice(starts, num_params) + np.where(direction < 0, delta, 0.0)
+        order = rng.permutation(num_params)
+        points.append(point.copy())
+        for parameter in order:
+            point[parameter] += direction[parameter] * delta
+            points.append(point.copy())
+        moved.append(order)
+        steps.append(direction[order] * delta)
+    return np.array(points), np.array(moved), np.array(steps)
+
+
+def morris_analysis(outputs, moved, steps):
+    num_params = len(PARAMETERS)
+    outputs = outputs.reshape(len(moved), num_params + 1, -1)
+    effects = np.empty((len(moved), num_params, len(OUTPUTS)))
+    for trajectory, (order, step) in enumerate(zip(moved, steps)):
+        effects[trajectory, order] = np.diff(outputs[trajectory], axis=0) / step[:, None]
+    return {
+        output: {
+            'mu_star': np.abs(effects[:, :, index]).mean(axis=0),
+            'mu': effects[:, :, index].mean(axis=0),
+            'sigma': effects[:, :, index].std(axis=0, ddof=1) if len(moved) > 1 else np.zeros(num_params)
+        }
+        for index, output in enumerate(OUTPUTS)
+    }
+
+
+def run_sensitivity(method="sobol", base_samples=64, trajectories=20, levels=4, spread=0.2,
+                    careers=1000, profile_spec=None, modifiers=None, seed=None, workers=None,
+                    resamples=500, output=None):
+    """Sobol or Morris sensitivity of the study metrics to every TRANSITIONS entry
+
+    Each evaluation simulates `careers` careers of profile_spec (control by
+    default) under one perturbed table. Returns the indices per output as
+    arrays over PARAMETERS, plus the parameter names; with output set the
+    tidy table is also written as CSV.
+    """
+    if method not in ("sobol", "morris"):
+        raise ValueError(f"Unknown sensitivity method: {method}")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    design_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+    simulation_seed = np.random.SeedSequence(seed, spawn_key=(1,))
+    num_params = len(PARAMETERS)
+
+    if method == "sobol":
+        a = design_rng.random((base_samples, num_params))
+        b = design_rng.random((base_samples, num_params))
+        ab = np.repeat(a[None], num_params, axis=0)
+        ab[np.arange(num_params), :, np.arange(num_params)] = b.T
+        units = np.concatenate([a, b, ab.reshape(-1, num_params)])
+    else:
+        units, moved, steps = morris_design(trajectories, levels, design_rng)
+
+    print("=" * 70)
+    print(f"SENSITIVITY ANALYSIS ({method.title()}): TRANSITIONS entries")
+    print("=" * 70)
+    print(f"\n{num_params} parameters (±{spread:.0%} per move, rows renormalized), "
+          f"{len(units):,} evaluations x {careers:,} careers")
+    print(f"Seed: {seed}  Workers: {workers or 1}\n")
+
+    start = time.perf_counter()
+    outputs = evaluate(units, spread, base_weights(profile_spec, modifiers), careers, simulation_seed, workers)
+    elapsed = time.perf_counter() - start
+
+    if method == "sobol":
+        indices = sobol_analysis(outputs, base_samples, resamples, design_rng)
+    else:
+        indices = morris_analysis(outputs, moved, steps)
+
+    results = {
+        'method': method,
+        'parameters': [parameter_name(parameter) for parameter in PARAMETERS],
+        'indices': indices,
+        'evaluations': len(units),
+        'careers_per_evaluation': careers,
+        'elapsed_seconds': elapsed,
+        'seed': seed
+    }
+    print(f"✅ {len(units) * careers:,} careers in {elapsed:.1f}s")
+    print_sensitivity_results(results)
+
+    if output:
+        from sweep import write_table
+        write_table(sensitivity_rows(results), output, TABLE_COLUMNS)
+        print(f"💾 Sensitivity table saved to '{output}'")
+    return results
+
+
+def sensitivity_rows(results):
+    """One row per (parameter, output) with the indices the method produced"""
+    rows = []
+    for output, indices in results['indices'].items():
+        for index, name in enumerate(results['parameters']):
+            row = {'parameter': name, 'output': output}
+            row.update({key: float(values[index]) for key, values in indices.items()})
+            rows.append(row)
+    return rows
+
+
+def print_sensitivity_results(results, top=10):
+    ranking = 'total' if results['method'] == "sobol" else 'mu_star'
+    for output, indices in results['indices'].items():
+        print(f"\n📊 {output} — top {top} by {ranking}:")
+        if results['method'] == "sobol":
+            print(f"  {'Parameter':<28} {'First-order':>16} {'Total':>16}")
+        else:
+            print(f"  {'Parameter':<28} {'mu*':>10} {'mu':>10} {'sigma':>10}")
+        for index in np.argsort(indices[ranking])[::-1][:top]:
+            name = results['parameters'][index]
+            if results['method'] == "sobol":
+                print(f"  {name:<28} {indices['first_order'][index]:>7.3f} ± {indices['first_order_conf'][index]:.3f}"
+                      f" {indices['total'][index]:>7.3f} ± {indices['total_conf'][index]:.3f}")
+            else:
+                print(f"  {name:<28} {indices['mu_star'][index]:>10.3f} {indices['mu'][index]:>+10.3f} "
+                      f"{indices['sigma'][index]:>10.3f}")
@@ -0,0 +1,265 @@
+"""Local HTTP/JSON what-if service
+
+    python src/cli.py serve --port 8765
+
+    POST /query    {"profile": {"early_specialization": true, "risk_tolerance": "high"},
+                    "modifiers": {...}, "rules": [...], "careers": 20000}
+    GET  /metrics  throughput, latency percentiles, cache and batching counters
+    GET  /health
+
+A query is an interventions spec arm (name optional) plus a careers count,
+answered with its Director+ rate (and standard error), mean retirement age
+and median unemployment year. The process stays up, so compiled transition
+tables and samplers stay warm and matplotlib is never imported.
+
+Queries arriving within batch_window of each other are simulated together:
+identical ones share one result, and distinct ones with the same careers
+count become arms of one InterventionSet pass. Every pass draws from the
+service seed, and an arm's careers depend only on its own tables, so a
+query's answer does not depend on what it was batched with. Answers are
+kept in an LRU cache keyed by the canonical query.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from simulator import STUDY_SEED, RISK_LEVELS
+from cohort import simulate_cohort
+from interventions import InterventionSet, arm_outcome_counts, arm_weights
+from trajectories import metrics_from_counts
+
+QUERY_KEYS = {"name", "profile", "modifiers", "rules", "careers"}
+DEFAULT_CAREERS = 10_000
+MAX_CAREERS = 1_000_000
+
+# Careers simulated in one pass over all arms of a batch
+BATCH_CAREERS = 1_000_000
+
+# Latency samples kept for /metrics, and the window QPS is measured over
+LATENCY_SAMPLES = 100_000
+METRICS_WINDOW = 60.0
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+PROFILE_TYPES = [
+    {"early_specialization": spec_value, "risk_tolerance": risk_value}
+    for spec_value in (False, True) for risk_value in RISK_LEVELS
+]
+
+
+def simulate_batch(weights, careers, seed, max_years):
+    """Metrics of each arm of one batched pass"""
+    policy = InterventionSet(list(range(len(weights))), np.stack(weights))
+    trajectories = simulate_cohort(careers, max_years=max_years, rng=np.random.default_rng(seed), policy=policy)
+    reached, retired, retire_age_sum, unemp_counts = arm_outcome_counts(trajectories, len(weights))
+
+    results = []
+    for index in range(len(weights)):
+        rate = reached[index].mean()
+        metrics = metrics_from_counts(careers, reached[index].sum(), retired[index], retire_age_sum[index],
+                                      unemp_counts[index])
+        results.append({
+            'director_plus_rate': float(metrics['director_plus_rate']),
+            'director_std_err': float(np.sqrt(rate * (1 - rate) / careers)) * 100,
+            'avg_retire_age': None if metrics['avg_retire_age'] is None else float(metrics['avg_retire_age']),
+            'median_unemp': None if metrics['median_unemp'] is None else float(metrics['median_unemp']),
+            'careers': careers
+        })
+    return results
+
+
+class QueryService:
+    """Coalescing, caching query engine behind the HTTP handler"""
+    def __init__(self, seed=STUDY_SEED, cache_size=1024, batch_window=0.005, max_years=45):
+        self.seed = seed
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.max_years = max_years
+
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.waiting = []
+        self.flush_task = None
+        # One simulation at a time; queries arriving meanwhile join the next batch
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.started = time.perf_counter()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.counters = dict(requests=0, errors=0, cache_hits=0, coalesced=0, batches=0, arms=0,
+                             careers_simulated=0)
+
+        for profile in PROFILE_TYPES:
+            arm_weights({"name": "warm-up", "profile": profile}, max_years)
+
+    def parse(self, query):
+        """Validated (cache key, weights, careers) of a query body"""
+        if not isinstance(query, dict):
+            raise ValueError("A query must be a JSON object")
+        unknown = set(query) - QUERY_KEYS
+        if unknown:
+            raise ValueError(f"Unknown query fields: {sorted(unknown)}")
+        careers = query.get("careers", DEFAULT_CAREERS)
+        if not isinstance(careers, int) or isinstance(careers, bool) or not 0 < careers <= MAX_CAREERS:
+            raise ValueError(f"careers must be an integer in [1, {MAX_CAREERS:,}]")
+        arm = {key: value for key, value in query.items() if key != "careers"}
+        arm["name"] = "query"
+        key = (json.dumps(arm, sort_keys=True), careers)
+        return key, arm, careers
+
+    async def query(self, body):
+        key, arm, careers = self.parse(body)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.counters['cache_hits'] += 1
+            return {**self.cache[key], 'cached': True}
+
+        future = self.pending.get(key)
+        if future is not None:
+            self.counters['coalesced'] += 1
+        else:
+            weights = arm_weights(arm, self.max_years)
+            future = self.pending[key] = asyncio.get_running_loop().create_future()
+            self.waiting.append((key, weights, careers))
+            if self.flush_task is None:
+                self.flush_task = asyncio.ensure_future(self.flush())
+        return {**await asyncio.shield(future), 'cached': False}
+
+    async def flush(self):
+        await asyncio.sleep(self.batch_window)
+        batch, self.waiting, self.flush_task = self.waiting, [], None
+
+        groups = {}
+        for key, weights, careers in batch:
+            groups.setdefault(careers, []).append((key, weights))
+
+        loop = asyncio.get_running_loop()
+        for careers, members in groups.items():
+            per_pass = max(1, BATCH_CAREERS // careers)
+            for start in range(0, len(members), per_pass):
+                chunk = members[start:start + per_pass]
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, simulate_batch, [weights for _, weights in chunk], careers,
+                        np.random.SeedSequence(self.seed), self.max_years)
+                except Exception as error:
+                    for key, _ in chunk:
+                        self.pending.pop(key).set_exception(error)
+                    continue
+
+                self.counters['batches'] += 1
+                self.counters['arms'] += len(chunk)
+                self.counters['careers_simulated'] += len(chunk) * careers
+                for (key, _), result in zip(chunk, results):
+                    self.remember(key, result)
+                    self.pending.pop(key).set_result(result)
+
+    def remember(self, key, result):
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def record(self, started, failed=False):
+        finished = time.perf_counter()
+        self.counters['requests'] += 1
+        self.counters['errors'] += failed
+        self.latencies.append((finished, finished - started))
+
+    def metrics(self):
+        """QPS over the last METRICS_WINDOW seconds, latency percentiles and counters"""
+        now = time.perf_counter()
+        uptime = now - self.started
+        latencies = np.array([latency for finished, latency in self.latencies if now - finished <= METRICS_WINDOW])
+        percentiles = (np.percentile(latencies, [50, 90, 99]) * 1000).tolist() if latencies.size else [None] * 3
+        hits = self.counters['cache_hits']
+        return {
+            'uptime_seconds': uptime,
+            'qps': latencies.size / min(METRICS_WINDOW, uptime) if uptime > 0 else 0.0,
+            'latency_ms': dict(zip(('p50', 'p90', 'p99'), percentiles)),
+            **self.counters,
+            'cache_hit_rate': hits / self.counters['requests'] if self.counters['requests'] else None,
+            'cache_entries': len(self.cache),
+            'arms_per_batch': self.counters['arms'] / self.counters['batches'] if self.counters['batches'] else None
+        }
+
+    async def dispatch(self, method, path, body):
+        """(status, payload) of one request; unexpected failures are a 500
+        counted in errors, never a dropped connection"""
+        try:
+            return await self.route(method, path, body)
+        except Exception as error:
+            self.counters['errors'] += 1
+            return 500, {'error': f"Internal error: {type(error).__name__}: {error}"}
+
+    async def route(self, method, path, body):
+        path = path.split('?', 1)[0]
+        if path == "/query":
+            if method != "POST":
+                return 405, {'error': "POST a JSON query to /query"}
+            started = time.perf_counter()
+            try:
+                result = await self.query(json.loads(body or b"{}"))
+            except (ValueError, TypeError) as error:
+                self.record(started, failed=True)
+                return 400, {'error': str(error)}
+            except Exception as error:
+                self.record(started, failed=True)
+                return 500, {'error': f"Internal error: {type(error).__name__}: {error}"}
+            self.record(started)
+            return 200, result
+        if path == "/metrics" and method == "GET":
+            return 200, self.metrics()
+        if path == "/health" and method == "GET":
+            return 200, {'status': "ok"}
+        return 404, {'error': f"No route for {method} {path}"}
+
+    async def handle(self, reader, writer):
+        """Minimal HTTP/1.1 with keep-alive: one JSON response per request"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self.dispatch(method, path, body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    service = QueryService(**options)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"🚀 Serving what-if queries on http://{host}:{port} (POST /query, GET /metrics)")
+    async with server:
+        await server.serve_forever()
+
+
+def run_service(host="127.0.0.1", port=8765, seed=STUDY_SEED, cache_size=1024, batch_window=0.005):
+    try:
+        asyncio.run(serve(host, port, seed=seed, cache_size=cache_size, batch_window=batch_window))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
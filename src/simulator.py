@@ -1,9 +1,9 @@
+import os
 import random
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import time
+from bisect import bisect_right
+from itertools import accumulate
 from collections import Counter, defaultdict
-import numpy as np
 
 # Career states
 STATES = [
@@ -27,33 +27,108 @@ TRANSITIONS = {
     "Unemployed": {"Unemployed": 0.50, "Entry Level": 0.25, "Junior": 0.15, "Mid-Level": 0.08, "Retired": 0.02}
 }
 
+# Careers simulated per vectorized block when streaming an arm
+STREAM_BLOCK_SIZE = 100_000
+
+# Seed of the default study run by main(), so repeated runs can be cached
+STUDY_SEED = 20240601
+
+# Values of CareerProfile.risk_tolerance
+RISK_LEVELS = ("low", "medium", "high")
+
+# Intervention arms: (name, early_specialization, risk_tolerance)
+INTERVENTIONS = [
+    ("control", False, "medium"),
+    ("specialist", True, "medium"),
+    ("risktaker", False, "high")
+]
+
+# Burnout added for each year spent in a state
+STRESS_LEVELS = {
+    "C-Suite": 5, "VP": 4, "Director": 3, "Manager": 2, "Lead": 2,
+    "Senior": 1, "Mid-Level": 0, "Junior": 0, "Entry Level": 0, "Unemployed": -2
+}
+
+# Multipliers applied by apply_decision_modifiers
+MODIFIER_PARAMS = {
+    "specialist_boost": 1.3,        # early specialists: Junior/Mid-Level/Senior moves out of Entry Level/Junior
+    "specialist_plateau": 1.2,      # early specialists: staying Senior/Lead
+    "generalist_exec_boost": 1.25,  # generalists: Director/VP/C-Suite moves from Manager and up
+    "high_risk_rehire": 1.5,        # high risk tolerance: Unemployed -> Mid-Level
+    "high_risk_stay": 0.8,          # high risk tolerance: staying Unemployed
+    "low_risk_rehire": 1.3,         # low risk tolerance: Unemployed -> Entry Level
+    "low_risk_stay": 1.1            # low risk tolerance: staying Unemployed
+}
+
+# Retirement model of get_retirement_probability
+RETIREMENT_PARAMS = {
+    "age_thresholds": (50, 60, 65, 70),         # base probability applies below each age...
+    "age_probs": (0.0, 0.01, 0.08, 0.25, 0.50),  # ...with the last one from the final threshold on
+    "low_level_age": 60,                        # Entry Level/Junior/Mid-Level past this age...
+    "low_level_boost": 0.15,                    # ...retire more often
+    "executive_discount": 0.10,                 # Director/VP/C-Suite retire less often
+    "unemployed_age": 55,                       # Unemployed past this age...
+    "unemployed_boost": 0.20,                   # ...retire more often
+    "burnout_scale": 100, "burnout_cap": 0.3,
+    "momentum_scale": 50, "momentum_cap": 0.2
+}
+
+# Seniority ranks used for momentum and peak position
+STATE_RANKS = {
+    "Entry Level": 1, "Junior": 2, "Mid-Level": 3, "Senior": 4, "Lead": 5,
+    "Manager": 6, "Director": 7, "VP": 8, "C-Suite": 9, "Unemployed": 0, "Retired": 0
+}
+
 
 class CareerProfile:
-    """Track career decisions and their impacts"""
+    """Track career decisions and their impacts
+
+    Slotted, with the unemployment years kept as an int bitmask (bit y set
+    if the career moved into Unemployed in year y); unemployment_history is
+    a read-only tuple view of it, so record a year with
+    record_unemployment(year) rather than unemployment_history.append(year). Bulk runs keep the same counters as arrays in a
+    cohort.ProfileBatch instead.
+    """
+    __slots__ = ("early_specialization", "risk_tolerance", "unemployment_mask", "burnout_score",
+                 "momentum_score", "total_demotions", "total_promotions")
+
     def __init__(self, early_specialization=False, risk_tolerance="medium"):
         self.early_specialization = early_specialization
         self.risk_tolerance = risk_tolerance
-        self.unemployment_history = []
+        self.unemployment_mask = 0
         self.burnout_score = 0
         self.momentum_score = 0
         self.total_demotions = 0
         self.total_promotions = 0
+
+    @property
+    def unemployment_history(self):
+        """Years in which the career moved into (or stayed) Unemployed, in
+        order, as a tuple: appending to it would not reach the bitmask"""
+        mask, years = self.unemployment_mask, []
+        while mask:
+            low = mask & -mask
+            years.append(low.bit_length() - 1)
+            mask ^= low
+        return tuple(years)
+
+    @unemployment_history.setter
+    def unemployment_history(self, years):
+        self.unemployment_mask = 0
+        for year in years:
+            self.record_unemployment(year)
+
+    def record_unemployment(self, year):
+        """Mark year as unemployed (replaces unemployment_history.append)"""
+        self.unemployment_mask |= 1 << int(year)
         
     def update_burnout(self, current_state, years_worked):
-        stress_levels = {
-            "C-Suite": 5, "VP": 4, "Director": 3, "Manager": 2, "Lead": 2,
-            "Senior": 1, "Mid-Level": 0, "Junior": 0, "Entry Level": 0, "Unemployed": -2
-        }
-        self.burnout_score += stress_levels.get(current_state, 0)
+        self.burnout_score += STRESS_LEVELS.get(current_state, 0)
         self.burnout_score = max(0, self.burnout_score - 0.5)
         
     def update_momentum(self, old_state, new_state):
-        state_ranks = {
-            "Entry Level": 1, "Junior": 2, "Mid-Level": 3, "Senior": 4, "Lead": 5,
-            "Manager": 6, "Director": 7, "VP": 8, "C-Suite": 9, "Unemployed": 0, "Retired": 0
-        }
-        old_rank = state_ranks.get(old_state, 0)
-        new_rank = state_ranks.get(new_state, 0)
+        old_rank = STATE_RANKS.get(old_state, 0)
+        new_rank = STATE_RANKS.get(new_state, 0)
         
         if new_rank > old_rank:
             self.momentum_score += 2
@@ -65,58 +140,54 @@ class CareerProfile:
         self.momentum_score = max(0, self.momentum_score * 0.9)
 
 
-def get_retirement_probability(profile, current_state, years_worked, age):
+def get_retirement_probability(profile, current_state, years_worked, age, params=None):
     if current_state == "Retired":
         return 1.0
+    params = params or RETIREMENT_PARAMS
     
-    base_prob = 0.0
-    if age < 50:
-        base_prob = 0.0
-    elif age < 60:
-        base_prob = 0.01
-    elif age < 65:
-        base_prob = 0.08
-    elif age < 70:
-        base_prob = 0.25
-    else:
-        base_prob = 0.50
+    base_prob = params["age_probs"][-1]
+    for threshold, prob in zip(params["age_thresholds"], params["age_probs"]):
+        if age < threshold:
+            base_prob = prob
+            break
     
-    burnout_factor = min(profile.burnout_score / 100, 0.3)
-    momentum_factor = -min(profile.momentum_score / 50, 0.2)
+    burnout_factor = min(profile.burnout_score / params["burnout_scale"], params["burnout_cap"])
+    momentum_factor = -min(profile.momentum_score / params["momentum_scale"], params["momentum_cap"])
     
-    if age > 60 and current_state in ["Entry Level", "Junior", "Mid-Level"]:
-        base_prob += 0.15
+    if age > params["low_level_age"] and current_state in ["Entry Level", "Junior", "Mid-Level"]:
+        base_prob += params["low_level_boost"]
     if current_state in ["C-Suite", "VP", "Director"]:
-        base_prob -= 0.10
-    if current_state == "Unemployed" and age > 55:
-        base_prob += 0.20
+        base_prob -= params["executive_discount"]
+    if current_state == "Unemployed" and age > params["unemployed_age"]:
+        base_prob += params["unemployed_boost"]
     
     return max(0, min(1.0, base_prob + burnout_factor + momentum_factor))
 
 
-def apply_decision_modifiers(profile, transitions, current_state, years_worked):
+def apply_decision_modifiers(profile, transitions, current_state, years_worked, params=None):
+    params = params or MODIFIER_PARAMS
     modified = transitions.copy()
     
     if profile.early_specialization:
         if current_state in ["Entry Level", "Junior"]:
             for state in modified:
                 if state in ["Junior", "Mid-Level", "Senior"]:
-                    modified[state] = modified.get(state, 0) * 1.3
+                    modified[state] = modified.get(state, 0) * params["specialist_boost"]
         elif current_state in ["Senior", "Lead"]:
-            modified[current_state] = modified.get(current_state, 0) * 1.2
+            modified[current_state] = modified.get(current_state, 0) * params["specialist_plateau"]
     else:
         if current_state in ["Manager", "Director", "VP"]:
             for state in ["Director", "VP", "C-Suite"]:
                 if state in modified:
-                    modified[state] = modified.get(state, 0) * 1.25
+                    modified[state] = modified.get(state, 0) * params["generalist_exec_boost"]
     
     if current_state == "Unemployed":
         if profile.risk_tolerance == "high":
-            modified["Mid-Level"] = modified.get("Mid-Level", 0) * 1.5
-            modified["Unemployed"] = modified.get("Unemployed", 0) * 0.8
+            modified["Mid-Level"] = modified.get("Mid-Level", 0) * params["high_risk_rehire"]
+            modified["Unemployed"] = modified.get("Unemployed", 0) * params["high_risk_stay"]
         elif profile.risk_tolerance == "low":
-            modified["Entry Level"] = modified.get("Entry Level", 0) * 1.3
-            modified["Unemployed"] = modified.get("Unemployed", 0) * 1.1
+            modified["Entry Level"] = modified.get("Entry Level", 0) * params["low_risk_rehire"]
+            modified["Unemployed"] = modified.get("Unemployed", 0) * params["low_risk_stay"]
     
     total = sum(modified.values())
     if total > 0:
@@ -125,11 +196,85 @@ def apply_decision_modifiers(profile, transitions, current_state, years_worked):
     return modified
 
 
-def simulate_career(max_years=45, starting_age=22, profile=None):
+# Compiled transition tables keyed by (early_specialization, risk_tolerance),
+# extended with the modifier values when they differ from MODIFIER_PARAMS
+TRANSITION_TABLES = {}
+
+# Most tables kept per cache: every distinct set of modifier values (sweep
+# scenarios, service queries) adds a key, so the oldest are dropped
+TABLE_CACHE_SIZE = 256
+
+
+def cache_table(cache, key, table):
+    """Store table under key, dropping the oldest entries beyond TABLE_CACHE_SIZE"""
+    cache[key] = table
+    while len(cache) > TABLE_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    return table
+
+
+def profile_key(profile=None):
+    """Profile type of a CareerProfile, an (early_specialization, risk_tolerance) tuple or None"""
+    if profile is None:
+        return (False, "medium")
+    if isinstance(profile, tuple):
+        return (bool(profile[0]), profile[1])
+    return (bool(profile.early_specialization), profile.risk_tolerance)
+
+
+def table_key(profile=None, modifiers=None):
+    """Cache key of a compiled table: the profile type, plus the modifier
+    values when they are not the defaults"""
+    key = profile_key(profile)
+    if modifiers is None or modifiers == MODIFIER_PARAMS:
+        return key
+    return key + (tuple(sorted(modifiers.items())),)
+
+
+def compile_transition_table(early_specialization=False, risk_tolerance="medium", modifiers=None):
+    """Precompute the modified transition distribution of every state for one profile type
+
+    The decision modifiers depend only on the profile type and the current
+    state, so one table serves a whole career. Returns
+    {state: (next_states, cum_weights)} with zero-probability moves dropped,
+    next states in rank order (so equal draws give comparable moves under
+    every profile) and cum_weights ending at exactly 1.0.
+    """
+    profile = CareerProfile(early_specialization=early_specialization, risk_tolerance=risk_tolerance)
+    table = {}
+    
+    for state, transitions in TRANSITIONS.items():
+        modified = apply_decision_modifiers(profile, transitions, state, 0, modifiers)
+        next_states = sorted((s for s, p in modified.items() if p > 0), key=STATE_RANKS.get)
+        cum_weights = list(accumulate(modified[s] for s in next_states))
+        cum_weights[-1] = 1.0
+        table[state] = (next_states, cum_weights)
+    
+    return table
+
+
+def get_transition_table(profile=None, modifiers=None):
+    """Compiled transition table for a profile's type (and modifier values), built on first use"""
+    key = table_key(profile, modifiers)
+    table = TRANSITION_TABLES.get(key)
+    if table is None:
+        table = cache_table(TRANSITION_TABLES, key, compile_transition_table(*profile_key(profile), modifiers))
+    return table
+
+
+def sample_next_state(table, current_state, draw):
+    """Map one uniform draw in [0, 1) to the next state with a binary search"""
+    next_states, cum_weights = table[current_state]
+    return next_states[bisect_right(cum_weights, draw)]
+
+
+def simulate_career(max_years=45, starting_age=22, profile=None, rng=random,
+                    modifiers=None, retirement=None, starting_state="Entry Level"):
     if profile is None:
         profile = CareerProfile()
     
-    current_state = "Entry Level"
+    table = get_transition_table(profile, modifiers)
+    current_state = starting_state
     career_path = [current_state]
     current_age = starting_age
     
@@ -142,25 +287,19 @@ def simulate_career(max_years=45, starting_age=22, profile=None):
         
         profile.update_burnout(current_state, year)
         
-        retirement_prob = get_retirement_probability(profile, current_state, year, current_age)
-        if random.random() < retirement_prob:
+        retirement_prob = get_retirement_probability(profile, current_state, year, current_age, retirement)
+        if rng.random() < retirement_prob:
             current_state = "Retired"
             career_path.append(current_state)
             continue
         
-        base_transitions = TRANSITIONS[current_state]
-        modified_transitions = apply_decision_modifiers(profile, base_transitions, current_state, year)
-        
-        next_states = list(modified_transitions.keys())
-        probabilities = list(modified_transitions.values())
-        
         old_state = current_state
-        next_state = random.choices(next_states, weights=probabilities, k=1)[0]
+        next_state = sample_next_state(table, current_state, rng.random())
         
         profile.update_momentum(old_state, next_state)
         
         if next_state == "Unemployed":
-            profile.unemployment_history.append(year)
+            profile.record_unemployment(year)
         
         career_path.append(next_state)
         current_state = next_state
@@ -169,17 +308,11 @@ def simulate_career(max_years=45, starting_age=22, profile=None):
 
 
 def get_peak_position(career):
-    state_ranks = {
-        "Unemployed": 0, "Entry Level": 1, "Junior": 2, "Mid-Level": 3,
-        "Senior": 4, "Lead": 5, "Manager": 6, "Director": 7,
-        "VP": 8, "C-Suite": 9, "Retired": 0
-    }
-    
     max_rank = 0
     peak_state = "Entry Level"
     
     for state in career:
-        rank = state_ranks.get(state, 0)
+        rank = STATE_RANKS.get(state, 0)
         if rank > max_rank:
             max_rank = rank
             peak_state = state
@@ -187,75 +320,226 @@ def get_peak_position(career):
     return peak_state
 
 
-def run_single_iteration(num_simulations=2500):
-    """Run one complete iteration of the intervention study"""
-    state_ranks = {
-        "Entry Level": 1, "Junior": 2, "Mid-Level": 3, "Senior": 4,
-        "Lead": 5, "Manager": 6, "Director": 7, "VP": 8, "C-Suite": 9
-    }
-    
+def arm_seed(seed, iteration, arm_index):
+    """Independent random stream for one (iteration, arm) task of a study seed"""
+    import numpy as np
+    return np.random.SeedSequence(seed, spawn_key=(iteration, arm_index))
+
+
+def child_seed(seed, *key):
+    """Child stream of a SeedSequence, derived without spawn() so that seed
+    itself is left unchanged and can be reused with the same results"""
+    import numpy as np
+    return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + key)
+
+
+def make_rng(seed, engine="python"):
+    """Engine-specific generator from a SeedSequence (None uses the global stream)"""
+    import numpy as np
+    if engine == "cohort":
+        return np.random.default_rng(seed)
+    if seed is None:
+        return random
+    return random.Random(int.from_bytes(seed.generate_state(4).tobytes(), "little"))
+
+
+def run_arm(num_simulations, spec_value, risk_value, engine="python", seed=None,
+            streaming=False, reservoir_size=50):
+    """Simulate one intervention arm and calculate its metrics
+
+    engine="python" simulates careers one by one, engine="cohort" uses the
+    vectorized engine. Either way the careers are kept as a compact
+    CareerTrajectories, with careers_data available as a read-only view of
+    it. With streaming=True each finished career is fed into an
+    ArmAccumulator instead and only its summary (metrics plus a reservoir
+    sample of trajectories) is returned.
+    """
+    rng = make_rng(seed, engine)
+    
+    if streaming:
+        from metrics import ArmAccumulator
+        accumulator = ArmAccumulator(
+            reservoir_size=reservoir_size,
+            rng=None if seed is None else child_seed(seed, 0)
+        )
+        if engine == "cohort":
+            from cohort import simulate_cohort
+            for start in range(0, num_simulations, STREAM_BLOCK_SIZE):
+                block = min(STREAM_BLOCK_SIZE, num_simulations - start)
+                accumulator.add_trajectories(simulate_cohort(block, (spec_value, risk_value), rng=rng))
+        else:
+            for _ in range(num_simulations):
+                profile = CareerProfile(early_specialization=spec_value, risk_tolerance=risk_value)
+                career, profile = simulate_career(profile=profile, rng=rng)
+                accumulator.add_career(career, profile)
+        return accumulator.summary()
+    
+    if engine == "cohort":
+        from cohort import simulate_cohort
+        trajectories = simulate_cohort(num_simulations, (spec_value, risk_value), rng=rng)
+    else:
+        from trajectories import record_careers
+        trajectories = record_careers(
+            (simulate_career(profile=CareerProfile(early_specialization=spec_value, risk_tolerance=risk_value), rng=rng)
+             for _ in range(num_simulations)),
+            num_simulations
+        )
+    
+    arm_results = trajectories.summary()
+    arm_results['trajectories'] = trajectories
+    arm_results['careers_data'] = trajectories.records()
+    return arm_results
+
+
+def run_arm_task(task):
+    """Process-pool entry point: stream one arm and return only its summary"""
+    num_simulations, spec_value, risk_value, engine, seed = task
+    return run_arm(num_simulations, spec_value, risk_value, engine, seed, streaming=True)
+
+
+def run_single_iteration(num_simulations=2500, engine="python", seed=None, iteration=0,
+                         streaming=False):
+    """Run one complete iteration of the intervention study
+
+    With a seed, each arm draws from arm_seed(seed, iteration, arm), so this
+    reproduces iteration `iteration` of run_uncertainty_analysis(seed=seed).
+    """
     results = {}
     
-    for intervention_name, spec_value, risk_value in [
-        ("control", False, "medium"),
-        ("specialist", True, "medium"),
-        ("risktaker", False, "high")
-    ]:
-        careers_data = []
-        
-        for _ in range(num_simulations):
-            profile = CareerProfile(early_specialization=spec_value, risk_tolerance=risk_value)
-            career, profile = simulate_career(profile=profile)
-            peak = get_peak_position(career)
-            
-            careers_data.append({
-                'career': career,
-                'peak': peak,
-                'profile': profile,
-                'final_state': career[-1]
-            })
-        
-        # Calculate metrics
-        director_plus = sum(1 for r in careers_data if state_ranks.get(r['peak'], 0) >= 7)
-        director_plus_rate = (director_plus / len(careers_data)) * 100
-        
-        retire_ages = [22 + r['career'].index("Retired") for r in careers_data if "Retired" in r['career']]
-        avg_retire_age = np.mean(retire_ages) if retire_ages else None
-        
-        unemp_years = [year for r in careers_data for year in r['profile'].unemployment_history]
-        median_unemp = np.median(unemp_years) if unemp_years else None
-        
-        results[intervention_name] = {
-            'director_plus_rate': director_plus_rate,
-            'avg_retire_age': avg_retire_age,
-            'median_unemp': median_unemp,
-            'careers_data': careers_data
-        }
+    for arm_index, (intervention_name, spec_value, risk_value) in enumerate(INTERVENTIONS):
+        arm = None if seed is None else arm_seed(seed, iteration, arm_index)
+        results[intervention_name] = run_arm(num_simulations, spec_value, risk_value, engine, arm,
+                                             streaming=streaming)
     
     return results
 
 
-def run_uncertainty_analysis(num_iterations=30, num_simulations=2500):
-    """Run multiple iterations to calculate confidence intervals"""
+def run_uncertainty_analysis(num_iterations=30, num_simulations=2500, engine="cohort",
+                             workers=None, seed=None, paired=False, antithetic=False,
+                             checkpoint=None, checkpoint_every=1, instrumentation=None):
+    """Run multiple iterations to calculate confidence intervals
+
+    Every (iteration, arm) pair is an independent task with its own random
+    stream spawned from `seed`, so results are identical for a given seed
+    whatever the number of worker processes. Tasks stream careers into
+    online accumulators and return only compact summaries.
+
+    With paired=True all arms of an iteration share one stream career by
+    career (common random numbers, optionally antithetic), and the paired
+    standard error of every delta vs control is reported.
+
+    With checkpoint set to a file path, completed iterations are saved there
+    every checkpoint_every iterations. If the file already exists the run
+    resumes from it (reusing its seed), and a larger num_iterations extends a
+    finished run without recomputing the iterations it already holds.
+
+    instrumentation (an instrumentation.Instrumentation) receives progress
+    events and times the 'simulate' and 'aggregate' stages.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    config = {'num_simulations': num_simulations, 'engine': engine,
+              'paired': paired, 'antithetic': paired and antithetic}
+    completed = []
+    if checkpoint and os.path.exists(checkpoint):
+        from checkpoint import load_checkpoint
+        saved_config, saved_seed, completed = load_checkpoint(checkpoint)
+        if saved_config != config:
+            raise ValueError(f"Checkpoint {checkpoint} was written with {saved_config}, not {config}")
+        if seed is not None and seed != saved_seed:
+            raise ValueError(f"Checkpoint {checkpoint} was written with seed {saved_seed}, not {seed}")
+        seed = saved_seed
+        saved = len(completed)
+        completed = completed[:num_iterations]
+        if saved > num_iterations and 'sample_states' not in completed[-1][INTERVENTIONS[0][0]]:
+            raise ValueError(f"Checkpoint {checkpoint} has no trajectory sample for iteration {num_iterations} "
+                             f"(it predates per-iteration samples); run all {saved} iterations")
+    
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    
     print("=" * 70)
     print("UNCERTAINTY ANALYSIS: Running Multiple Iterations")
     print("=" * 70)
     print(f"\nRunning {num_iterations} iterations with {num_simulations} careers each...")
-    print(f"Total careers to simulate: {num_iterations * num_simulations * 3:,}\n")
-    
-    all_iterations = []
-    
-    for i in range(num_iterations):
-        print(f"[Iteration {i+1}/{num_iterations}] Running intervention study...")
-        iteration_results = run_single_iteration(num_simulations)
-        all_iterations.append(iteration_results)
+    print(f"Total careers to simulate: {num_iterations * num_simulations * 3:,}")
+    print(f"Seed: {seed}  Workers: {workers or 1}"
+          + ("  Paired (common random numbers)" if paired else "")
+          + ("  Antithetic" if paired and antithetic else "") + "\n")
+    if completed:
+        print(f"Resuming from {checkpoint}: {len(completed)} iterations already done\n")
+    
+    if paired:
+        from paired import run_paired_task
+        task_function = run_paired_task
+        tasks = [
+            (num_simulations, engine, np.random.SeedSequence(seed, spawn_key=(i,)), antithetic)
+            for i in range(len(completed), num_iterations)
+        ]
+    else:
+        task_function = run_arm_task
+        tasks = iteration_tasks(range(len(completed), num_iterations), num_simulations, engine, seed)
+    
+    from instrumentation import Instrumentation
+    hooks = instrumentation or Instrumentation()
+    careers_per_iteration = num_simulations * len(INTERVENTIONS)
+    hooks.emit('run_start', num_iterations=num_iterations, first_iteration=len(completed),
+               careers_per_iteration=careers_per_iteration)
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        with hooks.stage('simulate'):
+            summaries = pool.map(task_function, tasks) if pool else map(task_function, tasks)
+            
+            all_iterations = list(completed)
+            for i in range(len(completed), num_iterations):
+                if instrumentation is None:
+                    print(f"[Iteration {i+1}/{num_iterations}] Running intervention study...")
+                hooks.emit('iteration_start', iteration=i, num_iterations=num_iterations)
+                iteration_start = time.perf_counter()
+                if paired:
+                    iteration_results = next(summaries)
+                else:
+                    iteration_results = {name: next(summaries) for name, _, _ in INTERVENTIONS}
+                all_iterations.append(iteration_results)
+                hooks.emit('careers_completed', count=careers_per_iteration,
+                           total=(i + 1 - len(completed)) * careers_per_iteration)
+                hooks.emit('iteration_end', iteration=i, num_iterations=num_iterations,
+                           results=iteration_results, elapsed=time.perf_counter() - iteration_start)
+                
+                if checkpoint and ((i + 1) % checkpoint_every == 0 or i + 1 == num_iterations):
+                    from checkpoint import save_checkpoint
+                    save_checkpoint(checkpoint, config, seed, all_iterations)
+    finally:
+        if pool:
+            pool.shutdown()
+    
+    with hooks.stage('aggregate'):
+        aggregated = aggregate_iterations(all_iterations)
+    aggregated['seed'] = seed
+    aggregated['careers_per_iteration'] = num_simulations
     
-    # Aggregate results
+    return aggregated
+
+
+def iteration_tasks(iterations, num_simulations, engine, seed):
+    """run_arm_task arguments for every arm of the given iteration indices"""
+    return [
+        (num_simulations, spec_value, risk_value, engine, arm_seed(seed, i, arm_index))
+        for i in iterations
+        for arm_index, (_, spec_value, risk_value) in enumerate(INTERVENTIONS)
+    ]
+
+
+def aggregate_iterations(all_iterations):
+    """Means, spreads and percentile intervals of the per-iteration arm summaries"""
+    import numpy as np
     aggregated = {}
     
-    for intervention in ["control", "specialist", "risktaker"]:
+    for intervention, _, _ in INTERVENTIONS:
         director_rates = [it[intervention]['director_plus_rate'] for it in all_iterations]
-        retire_ages = [it[intervention]['avg_retire_age'] for it in all_iterations if it[intervention]['avg_retire_age']]
+        retire_ages = [it[intervention]['avg_retire_age'] for it in all_iterations
+                       if it[intervention]['avg_retire_age']]
         
         aggregated[intervention] = {
             'director_mean': np.mean(director_rates),
@@ -268,12 +552,125 @@ def run_uncertainty_analysis(num_iterations=30, num_simulations=2500):
             'all_retire_ages': retire_ages
         }
     
+    if 'paired_deltas' in all_iterations[0]:
+        aggregated['paired_deltas'] = {}
+        for intervention in all_iterations[0]['paired_deltas']:
+            deltas = [it['paired_deltas'][intervention] for it in all_iterations]
+            aggregated['paired_deltas'][intervention] = {
+                'delta': np.mean([d['delta'] for d in deltas]),
+                'std_err': np.sqrt(sum(d['std_err'] ** 2 for d in deltas)) / len(deltas),
+                'independent_std_err': np.sqrt(sum(d['independent_std_err'] ** 2 for d in deltas)) / len(deltas)
+            }
+    
     # Store last iteration for detailed plots
     aggregated['last_iteration'] = all_iterations[-1]
     
     return aggregated
 
 
+def pooled_half_widths(aggregated, careers_per_arm, z=1.96):
+    """95% CI half-widths (percentage points) of each arm's pooled Director+
+    rate and of each arm's difference from control, using binomial standard
+    errors of independent arms"""
+    import numpy as np
+    std_errs = {}
+    for intervention, _, _ in INTERVENTIONS:
+        rate = aggregated[intervention]['director_mean']
+        std_errs[intervention] = np.sqrt(rate * (100 - rate) / careers_per_arm)
+    
+    half_widths = {name: z * se for name, se in std_errs.items()}
+    for intervention, _, _ in INTERVENTIONS[1:]:
+        half_widths[f"{intervention}_vs_control"] = z * np.sqrt(std_errs[intervention] ** 2 + std_errs['control'] ** 2)
+    return half_widths
+
+
+def run_adaptive_analysis(target_half_width=0.2, batch_size=2500, min_batches=2,
+                          max_careers=None, max_seconds=None, engine="cohort",
+                          workers=None, seed=None):
+    """Add careers in batches until every Director+ CI is tight enough
+
+    A batch is one iteration of all arms. After each round the pooled 95% CI
+    half-width of every arm's Director+ rate and of every delta vs control is
+    compared with target_half_width (percentage points). The run stops when
+    all are below it, or when max_careers (all arms together) or max_seconds
+    would be exceeded. Each round runs `workers` batches in parallel, so the
+    result is reproducible for a given seed and worker count.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    batches_per_round = workers if workers and workers > 1 else 1
+    careers_per_batch = batch_size * len(INTERVENTIONS)
+    
+    print("=" * 70)
+    print("ADAPTIVE UNCERTAINTY ANALYSIS: Sampling Until CIs Settle")
+    print("=" * 70)
+    print(f"\nTarget 95% CI half-width: {target_half_width}pp  Batch: {batch_size:,} careers per arm")
+    print(f"Seed: {seed}  Workers: {workers or 1}\n")
+    
+    start_time = time.perf_counter()
+    all_iterations = []
+    stopping_reason = None
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if batches_per_round > 1 else None
+    try:
+        while stopping_reason is None:
+            round_size = batches_per_round
+            if max_careers is not None:
+                affordable = (max_careers - len(all_iterations) * careers_per_batch) // careers_per_batch
+                round_size = min(round_size, affordable)
+                if round_size <= 0:
+                    stopping_reason = "career_budget"
+                    break
+            
+            first = len(all_iterations)
+            tasks = iteration_tasks(range(first, first + round_size), batch_size, engine, seed)
+            summaries = pool.map(run_arm_task, tasks) if pool else map(run_arm_task, tasks)
+            for _ in range(round_size):
+                all_iterations.append({name: next(summaries) for name, _, _ in INTERVENTIONS})
+            
+            aggregated = aggregate_iterations(all_iterations)
+            half_widths = pooled_half_widths(aggregated, len(all_iterations) * batch_size)
+            widest = max(half_widths.values())
+            elapsed = time.perf_counter() - start_time
+            print(f"[Batch {len(all_iterations)}] {len(all_iterations) * batch_size:,} careers per arm, "
+                  f"widest half-width {widest:.3f}pp, {elapsed:.1f}s")
+            
+            if len(all_iterations) >= min_batches and widest <= target_half_width:
+                stopping_reason = "target_precision"
+            elif max_seconds is not None and elapsed >= max_seconds:
+                stopping_reason = "time_budget"
+    finally:
+        if pool:
+            pool.shutdown()
+    
+    if not all_iterations:
+        raise ValueError("max_careers is smaller than one batch of all arms")
+    
+    careers_per_arm = len(all_iterations) * batch_size
+    aggregated = aggregate_iterations(all_iterations)
+    half_widths = pooled_half_widths(aggregated, careers_per_arm)
+    
+    # CI columns describe the pooled estimate rather than single batches
+    for intervention, _, _ in INTERVENTIONS:
+        mean = aggregated[intervention]['director_mean']
+        aggregated[intervention]['director_ci_lower'] = mean - half_widths[intervention]
+        aggregated[intervention]['director_ci_upper'] = mean + half_widths[intervention]
+    
+    aggregated['seed'] = seed
+    aggregated['stopping_reason'] = stopping_reason
+    aggregated['batches'] = len(all_iterations)
+    aggregated['careers_per_arm'] = careers_per_arm
+    aggregated['careers_per_iteration'] = batch_size
+    aggregated['careers_used'] = careers_per_arm * len(INTERVENTIONS)
+    aggregated['elapsed_seconds'] = time.perf_counter() - start_time
+    aggregated['target_half_width'] = target_half_width
+    aggregated['half_widths'] = half_widths
+    
+    return aggregated
+
+
 def print_uncertainty_results(results):
     """Print results with confidence intervals"""
     print("\n" + "=" * 70)
@@ -301,6 +698,20 @@ def print_uncertainty_results(results):
     print(f"  Early Specialization: {spec_delta:+.2f} percentage points")
     print(f"  High Risk Tolerance:  {risk_delta:+.2f} percentage points")
     
+    if 'paired_deltas' in results:
+        print("\n🔗 Paired Deltas (common random numbers):")
+        for name, label in [("specialist", "Early Specialization"), ("risktaker", "High Risk Tolerance")]:
+            paired = results['paired_deltas'][name]
+            reduction = (paired['independent_std_err'] / paired['std_err']) ** 2 if paired['std_err'] else float('inf')
+            print(f"  {label + ':':<22}{paired['delta']:+.2f} ± {paired['std_err']:.3f}pp (SE)  "
+                  f"vs ± {paired['independent_std_err']:.3f}pp independent, {reduction:.1f}x fewer careers")
+    
+    if 'stopping_reason' in results:
+        print(f"\n⏱️  Adaptive stop: {results['stopping_reason']} after {results['batches']} batches "
+              f"({results['careers_used']:,} careers, {results['elapsed_seconds']:.1f}s)")
+        print(f"  Widest 95% CI half-width: {max(results['half_widths'].values()):.3f}pp "
+              f"(target {results['target_half_width']}pp)")
+    
     print("\n🎯 Retirement Age:")
     print(f"{'Intervention':<15} {'Mean':<10} {'Std Dev':<10}")
     print("-" * 70)
@@ -314,224 +725,43 @@ def print_uncertainty_results(results):
     print("\n" + "=" * 70)
 
 
-def plot_uncertainty_results(results):
-    """Create publication-quality plots with confidence intervals"""
-    fig = plt.figure(figsize=(18, 12))
-    
-    # Plot 1: Director+ Rate with Error Bars (THE KILLER FIGURE)
-    ax1 = plt.subplot(2, 3, 1)
-    
-    interventions = ['Control', 'Early\nSpecialization', 'High\nRisk']
-    means = [
-        results['control']['director_mean'],
-        results['specialist']['director_mean'],
-        results['risktaker']['director_mean']
-    ]
-    
-    ci_lows = [
-        results['control']['director_ci_lower'],
-        results['specialist']['director_ci_lower'],
-        results['risktaker']['director_ci_lower']
-    ]
-    
-    ci_highs = [
-        results['control']['director_ci_upper'],
-        results['specialist']['director_ci_upper'],
-        results['risktaker']['director_ci_upper']
-    ]
-    
-    errors_low = [means[i] - ci_lows[i] for i in range(3)]
-    errors_high = [ci_highs[i] - means[i] for i in range(3)]
-    
-    colors = ['#3498db', '#e74c3c', '#f39c12']
-    x_pos = np.arange(len(interventions))
-    
-    bars = ax1.bar(x_pos, means, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-    ax1.errorbar(x_pos, means, yerr=[errors_low, errors_high], 
-                 fmt='none', ecolor='black', capsize=8, capthick=2, linewidth=2)
-    
-    ax1.set_ylabel('Director+ Achievement Rate (%)', fontsize=12, fontweight='bold')
-    ax1.set_title('BUTTERFLY EFFECT: Director+ Achievement\nwith 95% Confidence Intervals', 
-                  fontsize=13, fontweight='bold')
-    ax1.set_xticks(x_pos)
-    ax1.set_xticklabels(interventions, fontsize=11)
-    ax1.grid(axis='y', alpha=0.3, linestyle='--')
-    ax1.set_ylim(0, max(ci_highs) * 1.15)
-    
-    # Add value labels on bars
-    for i, (bar, mean) in enumerate(zip(bars, means)):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + errors_high[i] + 0.5,
-                f'{mean:.2f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
-    
-    # Plot 2: Distribution of Director+ Rates Across Iterations
-    ax2 = plt.subplot(2, 3, 2)
-    
-    data_to_plot = [
-        results['control']['all_director_rates'],
-        results['specialist']['all_director_rates'],
-        results['risktaker']['all_director_rates']
-    ]
-    
-    bp = ax2.boxplot(data_to_plot, labels=interventions, patch_artist=True,
-                     notch=True, showmeans=True)
-    
-    for patch, color in zip(bp['boxes'], colors):
-        patch.set_facecolor(color)
-        patch.set_alpha(0.7)
-    
-    ax2.set_ylabel('Director+ Rate (%)', fontsize=12, fontweight='bold')
-    ax2.set_title('Distribution Across 30 Iterations\n(Uncertainty Visualization)', 
-                  fontsize=13, fontweight='bold')
-    ax2.grid(axis='y', alpha=0.3, linestyle='--')
-    
-    # Plot 3: Retirement Age with Error Bars
-    ax3 = plt.subplot(2, 3, 3)
-    
-    retire_means = [
-        results['control']['retire_mean'],
-        results['specialist']['retire_mean'],
-        results['risktaker']['retire_mean']
-    ]
-    
-    retire_stds = [
-        results['control']['retire_std'],
-        results['specialist']['retire_std'],
-        results['risktaker']['retire_std']
-    ]
-    
-    bars3 = ax3.bar(x_pos, retire_means, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-    ax3.errorbar(x_pos, retire_means, yerr=retire_stds,
-                 fmt='none', ecolor='black', capsize=8, capthick=2, linewidth=2)
-    
-    ax3.set_ylabel('Average Retirement Age', fontsize=12, fontweight='bold')
-    ax3.set_title('Path-Dependent Retirement Age\nwith Standard Deviation', 
-                  fontsize=13, fontweight='bold')
-    ax3.set_xticks(x_pos)
-    ax3.set_xticklabels(interventions, fontsize=11)
-    ax3.grid(axis='y', alpha=0.3, linestyle='--')
-    
-    # Add value labels
-    for bar, mean, std in zip(bars3, retire_means, retire_stds):
-        height = bar.get_height()
-        ax3.text(bar.get_x() + bar.get_width()/2., height + std + 0.3,
-                f'{mean:.1f}', ha='center', va='bottom', fontweight='bold', fontsize=10)
-    
-    # Plot 4-6: Career Trajectories from Last Iteration
-    last_iter = results['last_iteration']
-    state_to_num = {state: idx for idx, state in enumerate(STATES)}
-    
-    for idx, (intervention, title) in enumerate([
-        ('control', 'Control Group'),
-        ('specialist', 'Early Specialization'),
-        ('risktaker', 'High Risk Tolerance')
-    ]):
-        ax = plt.subplot(2, 3, 4 + idx)
-        
-        sample_size = 50
-        careers = random.sample([r['career'] for r in last_iter[intervention]['careers_data']], sample_size)
-        career_matrix = [[state_to_num[state] for state in career] for career in careers]
-        
-        im = ax.imshow(career_matrix, aspect='auto', cmap='RdYlGn', interpolation='nearest')
-        ax.set_xlabel('Years', fontsize=11, fontweight='bold')
-        ax.set_ylabel('Career Sample', fontsize=11, fontweight='bold')
-        ax.set_title(f'{title}\n(n={sample_size} trajectories)', fontsize=12, fontweight='bold')
-    
-    # Add colorbar
-    cbar = plt.colorbar(im, ax=fig.get_axes()[3:], location='right', shrink=0.6)
-    cbar.set_ticks(range(len(STATES)))
-    cbar.set_ticklabels(STATES, fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig('figures/uncertainty_analysis.png', dpi=300, bbox_inches='tight')
-    print("\n✅ Uncertainty analysis plot saved to 'figures/uncertainty_analysis.png'")
-
-
-def create_killer_figure(results):
-    """Create ONE publication-quality figure that tells the whole story"""
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    interventions = ['Control', 'Early Specialization', 'High Risk Tolerance']
-    means = [
-        results['control']['director_mean'],
-        results['specialist']['director_mean'],
-        results['risktaker']['director_mean']
-    ]
-    
-    ci_lows = [
-        results['control']['director_ci_lower'],
-        results['specialist']['director_ci_lower'],
-        results['risktaker']['director_ci_lower']
-    ]
-    
-    ci_highs = [
-        results['control']['director_ci_upper'],
-        results['specialist']['director_ci_upper'],
-        results['risktaker']['director_ci_upper']
-    ]
-    
-    errors_low = [means[i] - ci_lows[i] for i in range(3)]
-    errors_high = [ci_highs[i] - means[i] for i in range(3)]
-    
-    colors = ['#2C3E50', '#E74C3C', '#F39C12']
-    x_pos = np.arange(len(interventions))
-    
-    bars = ax.bar(x_pos, means, color=colors, alpha=0.85, edgecolor='black', linewidth=2)
-    ax.errorbar(x_pos, means, yerr=[errors_low, errors_high],
-                fmt='none', ecolor='black', capsize=10, capthick=2.5, linewidth=2.5, zorder=10)
-    
-    # Styling
-    ax.set_ylabel('Director+ Achievement Rate (%)', fontsize=16, fontweight='bold')
-    ax.set_title('The Butterfly Effect in Career Progression\nImpact of Early Decisions on Long-Term Success',
-                 fontsize=18, fontweight='bold', pad=20)
-    ax.set_xticks(x_pos)
-    ax.set_xticklabels(interventions, fontsize=14, fontweight='bold')
-    ax.tick_params(axis='both', which='major', labelsize=12)
-    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=1.5)
-    ax.set_ylim(0, max(ci_highs) * 1.2)
-    
-    # Add value labels with CI
-    for i, (bar, mean, ci_low, ci_high) in enumerate(zip(bars, means, ci_lows, ci_highs)):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height + errors_high[i] + 1,
-                f'{mean:.2f}%\n[{ci_low:.2f}%, {ci_high:.2f}%]',
-                ha='center', va='bottom', fontweight='bold', fontsize=11)
-    
-    # Add delta annotations
-    control_mean = means[0]
-    for i in range(1, 3):
-        delta = means[i] - control_mean
-        y_pos = max(means[0], means[i]) + max(errors_high[0], errors_high[i]) + 3
-        ax.annotate(f'Δ = {delta:+.2f}%',
-                   xy=(i, y_pos), fontsize=12, fontweight='bold',
-                   ha='center', color=colors[i],
-                   bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor=colors[i], linewidth=2))
-    
-    # Add sample size annotation
-    ax.text(0.02, 0.98, f'n = 2,500 careers × 30 iterations\n95% Confidence Intervals',
-            transform=ax.transAxes, fontsize=11, verticalalignment='top',
-            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-    
-    plt.tight_layout()
-    plt.savefig('figures/butterfly_effect_ci.png', dpi=300, bbox_inches='tight')
-    print("✅ Killer figure saved to 'figures/butterfly_effect_ci.png'")
-
-
-def main():
+# Plotting lives in reporting.py and is imported on first use
+REPORTING_FUNCTIONS = ("plot_uncertainty_results", "create_killer_figure")
+
+
+def __getattr__(name):
+    if name in REPORTING_FUNCTIONS:
+        import reporting
+        return getattr(reporting, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(seed=STUDY_SEED, use_cache=True, instrumentation=None):
     print("=" * 70)
     print("CAREER PATH BUTTERFLY SIMULATOR v3.0")
     print("With Uncertainty Quantification")
     print("=" * 70)
     
-    # Run uncertainty analysis
-    results = run_uncertainty_analysis(num_iterations=30, num_simulations=2500)
+    from instrumentation import Instrumentation
+    hooks = instrumentation or Instrumentation()
+    
+    # Run uncertainty analysis (reused from the result cache if the model is unchanged)
+    if use_cache:
+        from cache import cached_call
+        results, _ = cached_call(run_uncertainty_analysis, num_iterations=30, num_simulations=2500,
+                                 seed=seed, instrumentation=instrumentation)
+    else:
+        results = run_uncertainty_analysis(num_iterations=30, num_simulations=2500, seed=seed,
+                                           instrumentation=instrumentation)
     
     # Print results
-    print_uncertainty_results(results)
+    with hooks.stage('print'):
+        print_uncertainty_results(results)
     
     # Create plots
-    plot_uncertainty_results(results)
-    create_killer_figure(results)
+    with hooks.stage('plot'):
+        from reporting import render_figures
+        render_figures(results)
     
     print("\n" + "=" * 70)
     print("ANALYSIS COMPLETE!")
@@ -543,6 +773,9 @@ def main():
     print("   not just random noise. Early decisions have measurable, statistically")
     print("   significant impacts on long-term career outcomes.")
     print("=" * 70)
+    
+    if instrumentation is not None:
+        hooks.print_stage_summary()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+"""Parameter sweeps over the decision-modifier constants and retirement model
+
+A scenario overrides any MODIFIER_PARAMS / RETIREMENT_PARAMS entries, e.g.
+
+    run_sweep(
+        grid={'specialist_boost': np.linspace(1.0, 1.6, 7), 'high_risk_rehire': [1.2, 1.5, 2.0]},
+        num_simulations=20_000, seed=1, output='sweeps/modifiers.csv'
+    )
+
+Every scenario runs all intervention arms with the cohort engine. Cohort
+samplers are compiled once per distinct set of modifier values in the parent
+process and installed in each worker when it starts, so workers never
+rebuild tables. All scenarios and arms share the same random numbers career
+by career (common random numbers), so differences between scenarios and
+arms are not masked by sampling noise. The result is a tidy table with one
+row per (scenario, arm).
+"""
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulator import INTERVENTIONS, STREAM_BLOCK_SIZE, MODIFIER_PARAMS, RETIREMENT_PARAMS, table_key
+import cohort
+from cohort import get_sampler, simulate_cohort
+from trajectories import metrics_from_counts
+
+TABLE_COLUMNS = [
+    'scenario', 'arm', 'careers', 'director_plus_rate', 'director_std_err',
+    'delta_vs_control', 'delta_std_err', 'avg_retire_age', 'median_unemp'
+]
+
+
+def scenario_grid(**grid):
+    """Cartesian product of parameter values as a list of override dicts
+
+    Each value may be a single setting or any iterable of settings (lists,
+    ranges, np.linspace); tuple-valued parameters such as age_thresholds
+    must be given as a list of tuples.
+    """
+    names = list(grid)
+    choices = []
+    for name in names:
+        values = grid[name]
+        if isinstance(values, (str, tuple)) or np.ndim(values) == 0:
+            values = [values]
+        choices.append([value.item() if isinstance(value, np.generic) else value for value in values])
+    return [dict(zip(names, combination)) for combination in itertools.product(*choices)]
+
+
+def split_scenario(overrides):
+    """Full (modifiers, retirement) parameter dicts for one scenario"""
+    unknown = set(overrides) - set(MODIFIER_PARAMS) - set(RETIREMENT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    modifiers = {**MODIFIER_PARAMS, **{k: v for k, v in overrides.items() if k in MODIFIER_PARAMS}}
+    retirement = {**RETIREMENT_PARAMS, **{k: v for k, v in overrides.items() if k in RETIREMENT_PARAMS}}
+    if len(retirement['age_probs']) != len(retirement['age_thresholds']) + 1:
+        raise ValueError("age_probs needs one more entry than age_thresholds")
+    return modifiers, retirement
+
+
+def compile_samplers(scenarios):
+    """Cohort samplers for every arm under every distinct set of modifiers
+
+    Collected here rather than copied from cohort.SAMPLERS, which only keeps
+    the most recent TABLE_CACHE_SIZE of a large grid.
+    """
+    samplers = {}
+    for overrides in scenarios:
+        modifiers, _ = split_scenario(overrides)
+        for _, spec_value, risk_value in INTERVENTIONS:
+            profile_spec = (spec_value, risk_value)
+            samplers[table_key(profile_spec, modifiers)] = get_sampler(profile_spec, modifiers)
+    return samplers
+
+
+def install_samplers(samplers):
+    """Process-pool initializer: share the parent's compiled samplers"""
+    cohort.SAMPLERS.update(samplers)
+
+
+def run_scenario(task):
+    """All arms of one scenario on common random numbers; one row per arm"""
+    index, overrides, num_simulations, seed = task
+    modifiers, retirement = split_scenario(overrides)
+
+    counts = {name: [0, 0, 0, 0] for name, _, _ in INTERVENTIONS}
+    unemp_counts = {name: 0 for name, _, _ in INTERVENTIONS}
+    differences = {name: np.zeros(2) for name, _, _ in INTERVENTIONS[1:]}
+
+    for block_index, start in enumerate(range(0, num_simulations, STREAM_BLOCK_SIZE)):
+        block_size = min(STREAM_BLOCK_SIZE, num_simulations - start)
+        block_seed = np.random.SeedSequence(seed, spawn_key=(block_index,))
+        control = None
+        for name, spec_value, risk_value in INTERVENTIONS:
+            trajectories = simulate_cohort(
+                block_size, (spec_value, risk_value), rng=np.random.default_rng(block_seed),
+                common_draws=True, modifiers=modifiers, retirement=retirement
+            )
+            director_plus, retired, retire_age_sum, unemp = trajectories.outcome_counts()
+            counts[name][0] += block_size
+            counts[name][1] += director_plus
+            counts[name][2] += retired
+            counts[name][3] += retire_age_sum
+            unemp_counts[name] = unemp_counts[name] + unemp
+
+            reached = trajectories.director_plus().astype(np.float64)
+            if control is None:
+                control = reached
+            else:
+                difference = reached - control
+                differences[name] += [difference.sum(), np.square(difference).sum()]
+
+    rows = []
+    control_rate = counts['control'][1] / num_simulations
+    for name, _, _ in INTERVENTIONS:
+        careers, director_plus, retired, retire_age_sum = counts[name]
+        metrics = metrics_from_counts(careers, director_plus, retired, retire_age_sum, unemp_counts[name])
+        rate = director_plus / careers
+        row = {
+            'scenario': index, **overrides, 'arm': name, 'careers': careers,
+            'director_plus_rate': metrics['director_plus_rate'],
+            'director_std_err': np.sqrt(rate * (1 - rate) / careers) * 100,
+            'delta_vs_control': (rate - control_rate) * 100,
+            'delta_std_err': 0.0,
+            'avg_retire_age': metrics['avg_retire_age'],
+            'median_unemp': metrics['median_unemp']
+        }
+        if name in differences:
+            total, total_sq = differences[name]
+            mean = total / careers
+            variance = (total_sq - careers * mean ** 2) / (careers - 1) if careers > 1 else 0.0
+            row['delta_std_err'] = np.sqrt(max(variance, 0.0) / careers) * 100
+        rows.append(row)
+    return rows
+
+
+def run_sweep(grid=None, scenarios=None, num_simulations=10_000, seed=None, workers=None,
+              output=None):
+    """Run every scenario of a grid (or an explicit list of override dicts)
+
+    Scenarios are spread over `workers` processes (all cores by default).
+    Returns the tidy rows and, with output set, writes them as CSV.
+    """
+    if scenarios is None:
+        scenarios = scenario_grid(**(grid or {}))
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    workers = workers or os.cpu_count() or 1
+
+    print("=" * 70)
+    print("PARAMETER SWEEP")
+    print("=" * 70)
+    print(f"\n{len(scenarios)} scenarios x {len(INTERVENTIONS)} arms x {num_simulations:,} careers")
+    print(f"Seed: {seed}  Workers: {workers}\n")
+
+    start = time.perf_counter()
+    samplers = compile_samplers(scenarios)
+    tasks = [(index, overrides, num_simulations, seed) for index, overrides in enumerate(scenarios)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=install_samplers,
+                                 initargs=(samplers,)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(run_scenario, tasks, chunksize=chunksize))
+    else:
+        results = [run_scenario(task) for task in tasks]
+
+    rows = [row for scenario_rows in results for row in scenario_rows]
+    elapsed = time.perf_counter() - start
+    careers = len(scenarios) * len(INTERVENTIONS) * num_simulations
+    print(f"✅ {len(scenarios)} scenarios in {elapsed:.1f}s ({careers / elapsed:,.0f} careers/s)")
+
+    if output:
+        write_table(rows, output)
+        print(f"💾 Results table saved to '{output}'")
+    return rows
+
+
+def format_value(value):
+    if isinstance(value, (tuple, list)):
+        return "/".join(str(v) for v in value)
+    return value
+
+
+def write_table(rows, path, table_columns=TABLE_COLUMNS):
+    """Tidy CSV: scenario, swept parameters, arm and metrics per row
+
+    Keys of a row that are not table_columns go right after the first column.
+    """
+    parameters = []
+    for row in rows:
+        for key in row:
+            if key not in table_columns and key not in parameters:
+                parameters.append(key)
+    columns = table_columns[:1] + parameters + table_columns[1:]
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', newline='') as output:
+        writer = csv.DictWriter(output, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: format_value(value) for key, value in row.items()})
@@ -0,0 +1,208 @@
+"""Compact trajectory storage: careers as uint8 state codes with precomputed outcomes"""
+from collections.abc import Sequence
+
+import numpy as np
+
+from simulator import STATES, STATE_RANKS, CareerProfile
+
+STATE_INDEX = {state: idx for idx, state in enumerate(STATES)}
+ENTRY_LEVEL = STATE_INDEX["Entry Level"]
+RETIRED = STATE_INDEX["Retired"]
+UNEMPLOYED = STATE_INDEX["Unemployed"]
+RANKS = np.array([STATE_RANKS.get(state, 0) for state in STATES], dtype=np.int8)
+
+# Years an unemployment_mask (one uint64 per career) can cover
+UNEMPLOYMENT_BITS = 64
+
+# State name for each peak rank; rank 0 falls back to Entry Level like get_peak_position
+PEAK_NAMES = ["Entry Level"] * (max(STATE_RANKS.values()) + 1)
+for _state, _rank in STATE_RANKS.items():
+    if _rank:
+        PEAK_NAMES[_rank] = _state
+
+
+def encode_career(career):
+    """State names to a uint8 code array (indices into STATES)"""
+    return np.array([STATE_INDEX[state] for state in career], dtype=np.uint8)
+
+
+def record_careers(careers, num_careers, max_years=45, starting_age=22):
+    """Encode (career, profile) pairs from simulate_career as they are produced
+
+    Only the uint8 codes and the profile counters are kept, so the career
+    lists and CareerProfile objects can be freed immediately.
+    """
+    states = np.empty((num_careers, max_years + 1), dtype=np.uint8)
+    burnout = np.empty(num_careers)
+    momentum = np.empty(num_careers)
+    promotions = np.empty(num_careers, dtype=np.int32)
+    demotions = np.empty(num_careers, dtype=np.int32)
+    unemployment = np.empty(num_careers, dtype=np.uint64) if max_years <= UNEMPLOYMENT_BITS else None
+
+    for i, (career, profile) in enumerate(careers):
+        states[i] = encode_career(career)
+        burnout[i] = profile.burnout_score
+        momentum[i] = profile.momentum_score
+        promotions[i] = profile.total_promotions
+        demotions[i] = profile.total_demotions
+        if unemployment is not None:
+            unemployment[i] = profile.unemployment_mask
+
+    return CareerTrajectories(
+        states, starting_age,
+        burnout=burnout, momentum=momentum, promotions=promotions, demotions=demotions,
+        unemployment_mask=unemployment
+    )
+
+
+def median_from_counts(counts):
+    """Median of integer values 0..len(counts)-1 given their frequencies"""
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    cumulative = np.cumsum(counts)
+    lower = np.searchsorted(cumulative, (total - 1) // 2, side='right')
+    upper = np.searchsorted(cumulative, total // 2, side='right')
+    return (lower + upper) / 2
+
+
+def metrics_from_counts(num_careers, director_plus, retired, retire_age_sum, unemp_counts):
+    """Director+ rate, mean retirement age and median unemployment year from outcome counts"""
+    return {
+        'director_plus_rate': (director_plus / num_careers) * 100,
+        'avg_retire_age': retire_age_sum / retired if retired else None,
+        'median_unemp': median_from_counts(unemp_counts)
+    }
+
+
+class CareerTrajectories:
+    """A block of careers as a (careers x years) uint8 matrix of STATES codes
+
+    First-retirement year (-1 if never), peak rank and unemployment-year
+    count are computed once per career, so study metrics are plain array
+    reductions. starting_age is one age, or an array with one per career.
+    Optional per-career CareerProfile counters (burnout, momentum,
+    promotions, demotions) ride along as flat arrays, as may
+    unemployment_mask (CareerProfile.unemployment_mask as uint64) and
+    retire_probability: the retirement-check probability in the year each
+    career retired (NaN if it never did).
+    """
+    def __init__(self, states, starting_age=22, burnout=None, momentum=None,
+                 promotions=None, demotions=None, unemployment_mask=None, retire_probability=None):
+        self.states = np.asarray(states, dtype=np.uint8)
+        self.starting_age = starting_age
+        self.burnout = burnout
+        self.momentum = momentum
+        self.promotions = promotions
+        self.demotions = demotions
+        self.unemployment_mask = unemployment_mask
+        self.retire_probability = retire_probability
+
+        retired = self.states == RETIRED
+        self.retire_year = np.where(retired.any(axis=1), retired.argmax(axis=1), -1).astype(np.int16)
+        self.peak_rank = RANKS[self.states].max(axis=1).astype(np.uint8)
+        self.unemployment_years = np.count_nonzero(self.states[:, 1:] == UNEMPLOYED, axis=1).astype(np.uint16)
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def max_years(self):
+        return self.states.shape[1] - 1
+
+    @property
+    def careers(self):
+        """Read-only list-of-state-names view, one list per career"""
+        return CareerView(self)
+
+    def records(self):
+        """careers_data-style view: {'career', 'peak', 'profile', 'final_state'} per career"""
+        return CareerRecords(self)
+
+    def career(self, index):
+        return [STATES[code] for code in self.states[index]]
+
+    def unemployment_history(self, index):
+        """Years in which the career moved into (or stayed) Unemployed"""
+        return np.flatnonzero(self.states[index, 1:] == UNEMPLOYED).tolist()
+
+    def profile(self, index):
+        """Rebuild the CareerProfile counters of one career"""
+        profile = CareerProfile()
+        if self.unemployment_mask is not None:
+            profile.unemployment_mask = int(self.unemployment_mask[index])
+        else:
+            profile.unemployment_history = self.unemployment_history(index)
+        if self.burnout is not None:
+            profile.burnout_score = float(self.burnout[index])
+            profile.momentum_score = float(self.momentum[index])
+            profile.total_promotions = int(self.promotions[index])
+            profile.total_demotions = int(self.demotions[index])
+        return profile
+
+    def director_plus(self):
+        """Boolean mask of careers that peaked at Director or above"""
+        return self.peak_rank >= STATE_RANKS["Director"]
+
+    def retirement_ages(self):
+        """Age at first retirement for the careers that retired"""
+        retired = self.retire_year >= 0
+        starting_age = self.starting_age if np.ndim(self.starting_age) == 0 else self.starting_age[retired]
+        return starting_age + self.retire_year[retired].astype(np.int64)
+
+    def unemployment_year_counts(self):
+        """Number of careers unemployed in each simulated year"""
+        return np.count_nonzero(self.states[:, 1:] == UNEMPLOYED, axis=0)
+
+    def outcome_counts(self):
+        """Sufficient statistics of the study metrics
+
+        Returns (director_plus, retired, retire_age_sum, unemp_counts); counts
+        from separate blocks can be summed and passed to metrics_from_counts.
+        """
+        retire_ages = self.retirement_ages()
+        return (
+            int(np.count_nonzero(self.director_plus())),
+            retire_ages.size,
+            int(retire_ages.sum()),
+            self.unemployment_year_counts()
+        )
+
+    def summary(self):
+        """Director+ rate, mean retirement age and median unemployment year"""
+        return metrics_from_counts(len(self), *self.outcome_counts())
+
+
+class CareerView(Sequence):
+    """Careers of a CareerTrajectories as lists of state names, decoded on access"""
+    def __init__(self, trajectories):
+        self.trajectories = trajectories
+
+    def __len__(self):
+        return len(self.trajectories)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.trajectories.career(i) for i in range(*index.indices(len(self)))]
+        return self.trajectories.career(index)
+
+
+class CareerRecords(Sequence):
+    """careers_data compatibility view over a CareerTrajectories"""
+    def __init__(self, trajectories):
+        self.trajectories = trajectories
+
+    def __len__(self):
+        return len(self.trajectories)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        trajectories = self.trajectories
+        career = trajectories.career(index)
+        return {
+            'career': career,
+            'peak': PEAK_NAMES[trajectories.peak_rank[index]],
+            'profile': trajectories.profile(index),
+            'final_state': career[-1]
+        }
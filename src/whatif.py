@@ -0,0 +1,226 @@
+"""What-if queries answered by reweighting one stored cohort
+
+A WhatIf simulates a cohort once and keeps, per career, the moves it made
+and the retirement-check probability of the year it retired; with the
+compiled table those give the probability every recorded move was drawn
+with. A query for a modified table (TRANSITIONS rows and/or
+MODIFIER_PARAMS overrides) weights each career by its likelihood ratio
+
+    prod over moves  p_new(s, s') / p_old(s, s')
+
+where a move into Retired, made either by the retirement check (r) or by
+the transition, counts as (r + (1 - r) p_new) / (r + (1 - r) p_old); the
+other moves happen only when the check did not fire, so r cancels. The
+metrics are then self-normalized weighted averages over the stored
+careers, and the effective sample size (sum w)^2 / sum w^2 says how many
+careers' worth of information is left. Queries whose ESS falls below
+min_ess of the cohort, or that allow a move the stored cohort could never
+have made, are re-simulated instead.
+"""
+import time
+
+import numpy as np
+
+from simulator import STATES, TRANSITIONS, MODIFIER_PARAMS, STREAM_BLOCK_SIZE, profile_key
+from cohort import simulate_cohort
+from interventions import InterventionSet
+from sensitivity import base_weights
+from trajectories import STATE_INDEX, RETIRED, UNEMPLOYED
+
+# Re-simulate when fewer than this share of the stored careers remain effective
+DEFAULT_MIN_ESS = 0.1
+
+
+def normalized(weights):
+    total = weights.sum(axis=1, keepdims=True)
+    return weights / np.where(total > 0, total, 1.0)
+
+
+def weighted_median(counts):
+    """median_from_counts for non-negative real frequencies"""
+    cumulative = np.cumsum(counts)
+    if cumulative[-1] <= 0:
+        return None
+    half = cumulative[-1] / 2
+    lower = np.searchsorted(cumulative, half, side='left')
+    upper = np.searchsorted(cumulative, half, side='right')
+    return float(lower + min(upper, len(counts) - 1)) / 2
+
+
+class CohortOutcomes:
+    """What the metrics need from a cohort, plus its moves for reweighting"""
+    def __init__(self, trajectories):
+        states = trajectories.states
+        size = len(STATES)
+        self.size = len(trajectories)
+        self.moves = states[:, :-1] * np.uint8(size) + states[:, 1:]
+        self.director_plus = trajectories.director_plus()
+
+        self.retired = np.flatnonzero(trajectories.retire_year >= 0)
+        retire_year = trajectories.retire_year[self.retired].astype(np.intp)
+        self.retire_age = trajectories.starting_age + retire_year
+        self.retire_from = states[self.retired, retire_year - 1].astype(np.intp)
+        self.retire_probability = trajectories.retire_probability[self.retired]
+
+        self.unemployed_career, self.unemployed_year = np.nonzero(states[:, 1:] == UNEMPLOYED)
+        self.max_years = trajectories.max_years
+
+    def log_ratios(self, old, new):
+        """Per-career log likelihood ratio of table new against table old"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(old > 0, np.log(new) - np.log(old), 0.0)
+        step[:, RETIRED] = 0.0
+        step = step.ravel()
+
+        log_ratios = np.empty(self.size)
+        for start in range(0, self.size, STREAM_BLOCK_SIZE):
+            block = slice(start, start + STREAM_BLOCK_SIZE)
+            log_ratios[block] = step.take(self.moves[block]).sum(axis=1)
+
+        r = self.retire_probability
+        log_ratios[self.retired] += np.log((r + (1 - r) * new[self.retire_from, RETIRED]) /
+                                           (r + (1 - r) * old[self.retire_from, RETIRED]))
+        return log_ratios
+
+    def metrics(self, weights=None):
+        """Study metrics, weighted per career (self-normalized)"""
+        if weights is None:
+            weights = np.ones(self.size)
+        total = weights.sum()
+        rate = weights @ self.director_plus / total
+        std_err = np.sqrt(np.square(weights) @ np.square(self.director_plus - rate)) / total
+        retired_weights = weights[self.retired]
+        unemp_counts = np.bincount(self.unemployed_year, weights[self.unemployed_career], minlength=self.max_years)
+        return {
+            'director_plus_rate': float(rate) * 100,
+            'director_std_err': float(std_err) * 100,
+            'avg_retire_age': float(retired_weights @ self.retire_age / retired_weights.sum())
+            if retired_weights.sum() > 0 else None,
+            'median_unemp': weighted_median(unemp_counts)
+        }
+
+
+class WhatIf:
+    """One stored cohort of a profile type that answers what-if queries
+
+        whatif = WhatIf(200_000, seed=1)
+        whatif.query(transitions={"VP": {"VP": 0.5, "C-Suite": 0.12, ...}})
+        whatif.query(modifiers={"generalist_exec_boost": 1.5})
+    """
+    def __init__(self, num_simulations=200_000, profile_spec=None, modifiers=None, seed=None,
+                 max_years=45, min_ess=DEFAULT_MIN_ESS):
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.profile_spec = profile_key(profile_spec)
+        self.modifiers = {**MODIFIER_PARAMS, **(modifiers or {})}
+        self.num_simulations = num_simulations
+        self.seed = seed
+        self.max_years = max_years
+        self.min_ess = min_ess
+        self.table = normalized(base_weights(self.profile_spec, self.modifiers))
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+        self.outcomes = CohortOutcomes(simulate_cohort(num_simulations, self.profile_spec, max_years, rng=rng,
+                                                       modifiers=self.modifiers))
+        self.baseline = self.outcomes.metrics()
+
+    def compile(self, transitions=None, modifiers=None):
+        """Dense table of the stored profile with TRANSITIONS rows and MODIFIER_PARAMS overridden"""
+        transitions = transitions or {}
+        modifiers = modifiers or {}
+        unknown = set(modifiers) - set(MODIFIER_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown modifiers: {sorted(unknown)}")
+        for state, row in transitions.items():
+            unknown = ({state} | set(row)) - set(STATE_INDEX)
+            if unknown:
+                raise ValueError(f"Unknown states in transitions: {sorted(unknown)}")
+            if any(probability < 0 for probability in row.values()) or not sum(row.values()) > 0:
+                raise ValueError(f"Transitions from {state} must be non-negative and not all zero")
+        table = base_weights(self.profile_spec, {**self.modifiers, **modifiers}, {**TRANSITIONS, **transitions})
+        return normalized(table)
+
+    def query(self, transitions=None, modifiers=None, min_ess=None):
+        """Study metrics under a modified table, reweighted or (if needed) re-simulated
+
+        transitions maps states to replacement TRANSITIONS rows, modifiers
+        overrides MODIFIER_PARAMS. The result carries the metrics, the
+        method used, the ESS (and its share of the cohort) of the weights and
+        the elapsed time.
+        """
+        start = time.perf_counter()
+        min_ess = self.min_ess if min_ess is None else min_ess
+        table = self.compile(transitions, modifiers)
+
+        new_moves = (table > 0) & (self.table == 0)
+        new_moves[RETIRED] = False
+        if new_moves.any():
+            ess, reason = 0.0, "the table allows moves the stored cohort never made"
+        else:
+            log_ratios = self.outcomes.log_ratios(self.table, table)
+            weights = np.exp(log_ratios - log_ratios.max())
+            ess = float(weights.sum() ** 2 / np.square(weights).sum())
+            reason = None if ess >= min_ess * self.num_simulations else "weights degenerated"
+
+        if reason is None:
+            metrics, method = self.outcomes.metrics(weights), "reweighted"
+        else:
+            metrics, method = self.resimulate(table), "resimulated"
+        return {
+            **metrics,
+            'method': method,
+            'reason': reason,
+            'ess': ess,
+            'ess_fraction': ess / self.num_simulations,
+            'elapsed_seconds': time.perf_counter() - start
+        }
+
+    def resimulate(self, table):
+        """Metrics of a fresh cohort simulated under table"""
+        policy = InterventionSet(["what-if"], np.broadcast_to(table, (1, self.max_years) + table.shape))
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(1,)))
+        trajectories = simulate_cohort(self.num_simulations, max_years=self.max_years, rng=rng, policy=policy)
+        return CohortOutcomes(trajectories).metrics()
+
+
+def parse_assignment(text):
+    """'VP->C-Suite=0.12' -> ('VP', 'C-Suite', 0.12); 'name=value' -> (name, None, value)"""
+    target, _, value = text.partition('=')
+    state, _, next_state = target.partition('->')
+    return state.strip(), next_state.strip() or None, float(value)
+
+
+def run_whatif(settings=(), num_simulations=200_000, profile_spec=None, seed=None, min_ess=DEFAULT_MIN_ESS):
+    """Build a stored cohort and answer one query given as assignments
+
+    Each setting is 'State->Next=probability' (the rest of the row is kept
+    and renormalized) or 'modifier=value'. Returns the query result.
+    """
+    transitions, modifiers = {}, {}
+    for setting in settings:
+        state, next_state, value = parse_assignment(setting)
+        if next_state is None:
+            modifiers[state] = value
+        else:
+            if state not in TRANSITIONS:
+                raise ValueError(f"Unknown state: {state}")
+            transitions.setdefault(state, dict(TRANSITIONS[state]))[next_state] = value
+
+    print("=" * 70)
+    print("WHAT-IF: Likelihood-Ratio Reweighting")
+    print("=" * 70)
+    start = time.perf_counter()
+    whatif = WhatIf(num_simulations, profile_spec, seed=seed, min_ess=min_ess)
+    print(f"\n{num_simulations:,} stored careers in {time.perf_counter() - start:.1f}s (seed {whatif.seed})")
+    result = whatif.query(transitions, modifiers)
+
+    print(f"Query: {', '.join(settings) or '(baseline)'}")
+    print(f"  {result['method']} in {result['elapsed_seconds']:.2f}s, ESS {result['ess']:,.0f} "
+          f"({result['ess_fraction']:.1%})" + (f" — {result['reason']}" if result['reason'] else ""))
+    print(f"\n{'Metric':<22} {'Baseline':>10} {'What-if':>10}")
+    print("-" * 44)
+    for metric in ('director_plus_rate', 'avg_retire_age', 'median_unemp'):
+        before, after = whatif.baseline[metric], result[metric]
+        print(f"{metric:<22} {'n/a' if before is None else f'{before:.2f}':>10} "
+              f"{'n/a' if after is None else f'{after:.2f}':>10}")
+    return result
@@ -0,0 +1,288 @@
+"""Heterogeneous workforce: careers with mixed starting ages, states and profiles
+
+A workforce spec splits the population into segments, each with a share
+and distributions for the starting conditions and the profile:
+
+    {
+        "segments": [
+            {"name": "graduates", "share": 0.3, "age": [21, 25], "state": "Entry Level",
+             "early_specialization": 0.3, "risk_tolerance": {"medium": 0.7, "high": 0.3}},
+            {"name": "leadership", "share": 0.1, "age": {"45": 2, "50": 1},
+             "state": {"Director": 0.7, "VP": 0.3}}
+        ]
+    }
+
+age is a fixed age, an inclusive [low, high] range or {age: weight};
+state and risk_tolerance are a value or {value: weight};
+early_specialization is a bool or the probability of being a specialist.
+Missing fields default to the single-profile study (age 22, Entry Level,
+generalist, medium risk).
+
+Every career's segment and attributes are sampled up front. Careers are
+then grouped by profile type, so each group runs through the vectorized
+cohort engine with per-career starting ages and states, and the outcomes
+are reduced into (segment, profile) cells. Results are reported overall,
+per segment and per profile, together with the headcount in every state
+for each year of the run.
+
+director_plus_rate counts the careers that reach Director or above during
+the simulated years, having started below it; careers that start there
+are reported separately as started_director_plus_rate, so a leadership
+segment does not inflate the promotion rate.
+"""
+import json
+import time
+
+import numpy as np
+
+from simulator import STATES, STATE_RANKS, STREAM_BLOCK_SIZE, RISK_LEVELS
+from cohort import simulate_cohort
+from trajectories import STATE_INDEX, RETIRED, UNEMPLOYED, RANKS, metrics_from_counts
+
+RISK_CODES = {risk: index for index, risk in enumerate(RISK_LEVELS)}
+
+# Careers can start in any state but Retired
+WORKING_CODES = {state: index for state, index in STATE_INDEX.items() if state != "Retired"}
+
+# Profile types in a fixed order; a group's random stream is keyed by its
+# position here, so adding a profile to the mix leaves the others unchanged
+PROFILE_TYPES = [(spec_value, risk) for spec_value in (False, True) for risk in RISK_LEVELS]
+
+SEGMENT_KEYS = {"name", "share", "age", "state", "early_specialization", "risk_tolerance"}
+
+TABLE_COLUMNS = [
+    'stratum_type', 'stratum', 'careers', 'share',
+    'director_plus_rate', 'started_director_plus_rate', 'avg_retire_age', 'median_unemp'
+]
+
+# A 50k-employee org: graduates, early career, mid career and leadership
+DEFAULT_WORKFORCE = {
+    "segments": [
+        {"name": "graduates", "share": 0.25, "age": [21, 25], "state": "Entry Level",
+         "early_specialization": 0.3, "risk_tolerance": {"low": 0.2, "medium": 0.5, "high": 0.3}},
+        {"name": "early_career", "share": 0.35, "age": [25, 32],
+         "state": {"Junior": 0.5, "Mid-Level": 0.4, "Unemployed": 0.1},
+         "early_specialization": 0.4, "risk_tolerance": {"low": 0.2, "medium": 0.5, "high": 0.3}},
+        {"name": "mid_career", "share": 0.3, "age": [32, 45],
+         "state": {"Senior": 0.4, "Lead": 0.3, "Manager": 0.3},
+         "early_specialization": 0.5, "risk_tolerance": {"low": 0.3, "medium": 0.5, "high": 0.2}},
+        {"name": "leadership", "share": 0.1, "age": [40, 55],
+         "state": {"Director": 0.6, "VP": 0.3, "C-Suite": 0.1},
+         "early_specialization": 0.3, "risk_tolerance": {"low": 0.2, "medium": 0.4, "high": 0.4}}
+    ]
+}
+
+
+def load_spec(path):
+    with open(path) as source:
+        return json.load(source)
+
+
+def profile_label(profile_type):
+    spec_value, risk = profile_type
+    return f"{'specialist' if spec_value else 'generalist'}/{risk}"
+
+
+def categorical(distribution, size, rng, what):
+    """Draws from a {value: weight} dict: the dict's values and the index drawn for each career"""
+    weights = np.array(list(distribution.values()), dtype=np.float64)
+    if not len(weights) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"{what}: weights must be non-negative and not all zero")
+    return list(distribution), rng.choice(len(weights), size, p=weights / weights.sum())
+
+
+def sample_ages(distribution, size, rng, what):
+    if isinstance(distribution, dict):
+        values, picks = categorical(distribution, size, rng, what)
+        ages = np.array([int(age) for age in values]).take(picks)
+    elif isinstance(distribution, (list, tuple)):
+        low, high = distribution
+        ages = rng.integers(low, high + 1, size)
+    else:
+        ages = np.full(size, int(distribution))
+    if (ages < 0).any():
+        raise ValueError(f"{what}: ages must not be negative")
+    return ages
+
+
+def sample_codes(distribution, size, rng, what, codes):
+    """Codes (looked up in `codes`) of a value or {value: weight} distribution"""
+    if isinstance(distribution, str):
+        values, picks = [distribution], np.zeros(size, dtype=np.intp)
+    else:
+        values, picks = categorical(distribution, size, rng, what)
+    unknown = [value for value in values if value not in codes]
+    if unknown:
+        raise ValueError(f"{what}: unknown values {unknown}, expected {sorted(codes)}")
+    return np.array([codes[value] for value in values]).take(picks)
+
+
+def sample_workforce(spec, size, rng):
+    """Segment, starting age, starting state and profile type of every career"""
+    segments = spec["segments"]
+    names = [segment.get("name") for segment in segments]
+    if None in names or len(set(names)) != len(names):
+        raise ValueError(f"Segments need unique names, got {names}")
+    for segment in segments:
+        unknown = set(segment) - SEGMENT_KEYS
+        if unknown:
+            raise ValueError(f"Segment {segment['name']}: unknown fields {sorted(unknown)}")
+
+    _, segment_of = categorical({name: segment.get("share", 1.0) for name, segment in zip(names, segments)},
+                                size, rng, "segment shares")
+
+    ages = np.empty(size, dtype=np.int64)
+    states = np.empty(size, dtype=np.uint8)
+    profile_of = np.empty(size, dtype=np.intp)
+    for index, segment in enumerate(segments):
+        members = np.flatnonzero(segment_of == index)
+        count = members.size
+        what = f"Segment {segment['name']}"
+        ages[members] = sample_ages(segment.get("age", 22), count, rng, f"{what} age")
+        states[members] = sample_codes(segment.get("state", "Entry Level"), count, rng, f"{what} state",
+                                       WORKING_CODES)
+
+        specialization = segment.get("early_specialization", False)
+        if isinstance(specialization, bool):
+            specialists = np.full(count, specialization)
+        elif isinstance(specialization, (int, float)) and 0 <= specialization <= 1:
+            specialists = rng.random(count) < specialization
+        else:
+            raise ValueError(f"{what}: early_specialization must be a bool or a probability")
+
+        risks = sample_codes(segment.get("risk_tolerance", "medium"), count, rng, f"{what} risk_tolerance",
+                             RISK_CODES)
+        profile_of[members] = specialists * len(RISK_LEVELS) + risks
+
+    return names, segment_of, ages, states, profile_of
+
+
+def run_workforce(spec=None, size=50_000, seed=None, max_years=45, output=None):
+    """Simulate a heterogeneous workforce; metrics overall, per segment and per profile
+
+    spec is a dict or JSON path (DEFAULT_WORKFORCE when omitted). Returns
+    {'overall', 'segments', 'profiles'} metrics (each with careers and
+    share), 'occupancy' (headcount per year and state) and throughput;
+    with output set the strata are also written as a CSV table.
+    """
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    spec = spec or DEFAULT_WORKFORCE
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    names, segment_of, ages, states, profile_of = sample_workforce(
+        spec, size, np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+    )
+
+    print("=" * 70)
+    print("WORKFORCE: Mixed Starting Ages, States and Profiles")
+    print("=" * 70)
+    print(f"\n{size:,} careers in {len(names)} segments, "
+          f"{len(np.unique(profile_of))} profile types  Seed: {seed}\n")
+
+    # Outcome counts per (segment, profile) cell
+    cells = (len(names), len(PROFILE_TYPES))
+    careers = np.zeros(cells, dtype=np.int64)
+    director_plus = np.zeros(cells, dtype=np.int64)
+    started_director_plus = np.zeros(cells, dtype=np.int64)
+    retired = np.zeros(cells, dtype=np.int64)
+    retire_age_sum = np.zeros(cells, dtype=np.int64)
+    unemp_counts = np.zeros(cells + (max_years,), dtype=np.int64)
+    occupancy = np.zeros((max_years + 1, len(STATES)), dtype=np.int64)
+    year_offsets = np.arange(max_years + 1) * len(STATES)
+
+    start = time.perf_counter()
+    for profile_index, profile_type in enumerate(PROFILE_TYPES):
+        group = np.flatnonzero(profile_of == profile_index)
+        if not group.size:
+            continue
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1, profile_index)))
+        for block_start in range(0, group.size, STREAM_BLOCK_SIZE):
+            block = group[block_start:block_start + STREAM_BLOCK_SIZE]
+            trajectories = simulate_cohort(len(block), profile_type, max_years, ages[block], rng=rng,
+                                           starting_state=states[block])
+            segment = segment_of[block]
+            careers[:, profile_index] += np.bincount(segment, minlength=len(names))
+            started = RANKS.take(states[block]) >= STATE_RANKS["Director"]
+            reached = ~started & (RANKS.take(trajectories.states[:, 1:]).max(axis=1) >= STATE_RANKS["Director"])
+            director_plus[:, profile_index] += np.bincount(segment, weights=reached,
+                                                           minlength=len(names)).astype(np.int64)
+            started_director_plus[:, profile_index] += np.bincount(segment, weights=started,
+                                                                   minlength=len(names)).astype(np.int64)
+            has_retired = trajectories.retire_year >= 0
+            retired[:, profile_index] += np.bincount(segment, weights=has_retired,
+                                                     minlength=len(names)).astype(np.int64)
+            retire_ages = np.where(has_retired, ages[block] + trajectories.retire_year, 0)
+            retire_age_sum[:, profile_index] += np.bincount(segment, weights=retire_ages,
+                                                            minlength=len(names)).astype(np.int64)
+            rows, years = np.nonzero(trajectories.states[:, 1:] == UNEMPLOYED)
+            unemp_counts[:, profile_index] += np.bincount(
+                segment[rows] * max_years + years, minlength=len(names) * max_years
+            ).reshape(len(names), max_years)
+            occupancy += np.bincount((trajectories.states + year_offsets).ravel(),
+                                     minlength=occupancy.size).reshape(occupancy.shape)
+    elapsed = time.perf_counter() - start
+
+    def stratum(selection):
+        count = int(careers[selection].sum())
+        # An empty stratum (a zero share) reports a 0% rate rather than dividing by zero
+        metrics = metrics_from_counts(
+            max(count, 1), int(director_plus[selection].sum()), int(retired[selection].sum()),
+            int(retire_age_sum[selection].sum()), unemp_counts[selection].reshape(-1, max_years).sum(axis=0)
+        )
+        metrics['started_director_plus_rate'] = started_director_plus[selection].sum() / max(count, 1) * 100
+        metrics['careers'] = count
+        metrics['share'] = count / size
+        return metrics
+
+    results = {
+        'overall': stratum(np.s_[:, :]),
+        'segments': {name: stratum(np.s_[index, :]) for index, name in enumerate(names)},
+        'profiles': {
+            profile_label(profile_type): stratum(np.s_[:, index])
+            for index, profile_type in enumerate(PROFILE_TYPES) if careers[:, index].any()
+        },
+        'occupancy': occupancy,
+        'seed': seed,
+        'elapsed_seconds': elapsed,
+        'careers_per_sec': size / elapsed if elapsed > 0 else float('inf')
+    }
+
+    print_workforce_results(results)
+    if output:
+        from sweep import write_table
+        write_table(workforce_rows(results), output, TABLE_COLUMNS)
+        print(f"💾 Strata table saved to '{output}'")
+    return results
+
+
+def workforce_rows(results):
+    """One tidy row per stratum: overall, then segments, then profiles"""
+    rows = [{'stratum_type': 'overall', 'stratum': 'all', **results['overall']}]
+    for stratum_type in ('segments', 'profiles'):
+        for name, metrics in results[stratum_type].items():
+            rows.append({'stratum_type': stratum_type[:-1], 'stratum': name, **metrics})
+    return [{key: row[key] for key in TABLE_COLUMNS} for row in rows]
+
+
+def print_workforce_results(results):
+    print(f"{'Stratum':<24} {'Careers':>8} {'Share':>7} {'Director+':>10} {'Started D+':>10} "
+          f"{'Retire':>8} {'Unemp':>6}")
+    print("-" * 81)
+    for row in workforce_rows(results):
+        retire = "n/a" if row['avg_retire_age'] is None else f"{row['avg_retire_age']:.1f}"
+        unemp = "n/a" if row['median_unemp'] is None else f"{row['median_unemp']:.1f}"
+        label = row['stratum'] if row['stratum_type'] == 'overall' else f"  {row['stratum']}"
+        print(f"{label:<24} {row['careers']:>8,} {row['share']:>7.1%} {row['director_plus_rate']:>9.2f}% "
+              f"{row['started_director_plus_rate']:>9.2f}% {retire:>8} {unemp:>6}")
+
+    occupancy = results['occupancy']
+    director_plus = [STATE_INDEX[state] for state in ("Director", "VP", "C-Suite")]
+    print("\n👥 Headcount by year:")
+    for year in (0, 5, 10, 20):
+        if year < len(occupancy):
+            counts = occupancy[year]
+            print(f"  Year {year:>2}: {counts[director_plus].sum():>7,} Director+  "
+                  f"{counts[UNEMPLOYED]:>7,} unemployed  {counts[RETIRED]:>7,} retired")
+    print(f"\n✅ {results['careers_per_sec']:,.0f} careers/s ({results['elapsed_seconds']:.2f}s)")
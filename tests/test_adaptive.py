@@ -0,0 +1,16 @@
+from simulator import run_adaptive_analysis
+
+
+def test_loose_target_stops_on_precision():
+    results = run_adaptive_analysis(target_half_width=1.5, batch_size=2_500, seed=3)
+    assert results['stopping_reason'] == "target_precision"
+    assert all(half_width <= 1.5 for half_width in results['half_widths'].values())
+    assert results['batches'] >= 2
+
+
+def test_career_budget_stops_the_run():
+    budget = 3 * 2_500 * 3 + 100
+    results = run_adaptive_analysis(target_half_width=0.01, batch_size=2_500, max_careers=budget, seed=3)
+    assert results['stopping_reason'] == "career_budget"
+    assert results['careers_used'] <= budget
+    assert results['batches'] == 3
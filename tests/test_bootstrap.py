@@ -0,0 +1,20 @@
+import numpy as np
+
+from simulator import INTERVENTIONS, arm_seed, run_arm
+from bootstrap import simulate_arms
+from paired import run_paired_arms
+
+
+def test_simulate_arms_reproduces_iteration_zero():
+    """Metrics and reservoir samples match iteration 0 of the matching uncertainty run"""
+    _, summaries = simulate_arms(3_000, "cohort", 9, paired=False)
+    for arm_index, (name, spec_value, risk_value) in enumerate(INTERVENTIONS):
+        expected = run_arm(3_000, spec_value, risk_value, "cohort", arm_seed(9, 0, arm_index), streaming=True)
+        assert summaries[name]['director_plus_rate'] == expected['director_plus_rate']
+        assert np.array_equal(summaries[name]['sample_states'], expected['sample_states'])
+
+    _, summaries = simulate_arms(3_000, "cohort", 9, paired=True)
+    expected = run_paired_arms(3_000, "cohort", np.random.SeedSequence(9, spawn_key=(0,)))
+    for name, _, _ in INTERVENTIONS:
+        assert summaries[name]['director_plus_rate'] == expected[name]['director_plus_rate']
+        assert np.array_equal(summaries[name]['sample_states'], expected[name]['sample_states'])
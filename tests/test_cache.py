@@ -0,0 +1,51 @@
+import os
+import shutil
+
+import simulator
+from cache import ENGINE_MODULES, ResultCache, cache_key, cached_call
+from simulator import run_uncertainty_analysis
+
+ARGUMENTS = dict(num_iterations=2, num_simulations=200, engine="cohort", seed=7)
+
+
+def test_cache_hits_until_the_model_changes(tmp_path, monkeypatch):
+    """Identical calls hit; editing simulator.py (outside the career model
+    itself) or a model table invalidates the entry"""
+    source_dir = os.path.dirname(simulator.__file__)
+    copy_dir = tmp_path / "src"
+    copy_dir.mkdir()
+    for module in ENGINE_MODULES:
+        shutil.copy(os.path.join(source_dir, f"{module}.py"), copy_dir)
+    monkeypatch.setattr(simulator, "__file__", str(copy_dir / "simulator.py"))
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    first, hit = cached_call(run_uncertainty_analysis, cache=cache, **ARGUMENTS)
+    assert not hit
+    second, hit = cached_call(run_uncertainty_analysis, cache=cache, **ARGUMENTS)
+    assert hit
+    assert second['control']['all_director_rates'] == first['control']['all_director_rates']
+
+    path = copy_dir / "simulator.py"
+    source = path.read_text()
+    assert "np.percentile(director_rates, 2.5)" in source
+    path.write_text(source.replace("np.percentile(director_rates, 2.5)", "np.percentile(director_rates, 5)"))
+    _, hit = cached_call(run_uncertainty_analysis, cache=cache, **ARGUMENTS)
+    assert not hit
+    _, hit = cached_call(run_uncertainty_analysis, cache=cache, **ARGUMENTS)
+    assert hit
+
+    # Only the key is compared here, so no table gets compiled from the edited TRANSITIONS
+    key = cache_key(run_uncertainty_analysis, ARGUMENTS)
+    monkeypatch.setitem(simulator.TRANSITIONS, "Entry Level",
+                        {**simulator.TRANSITIONS["Entry Level"], "Entry Level": 0.5})
+    assert cache_key(run_uncertainty_analysis, ARGUMENTS) != key
+
+
+def test_workers_are_part_of_the_key_only_where_they_change_the_result():
+    from simulator import run_adaptive_analysis
+
+    arguments = dict(target_half_width=0.5, seed=7)
+    assert (cache_key(run_adaptive_analysis, {**arguments, 'workers': 4})
+            != cache_key(run_adaptive_analysis, {**arguments, 'workers': 8}))
+    assert (cache_key(run_uncertainty_analysis, {**ARGUMENTS, 'workers': 4})
+            == cache_key(run_uncertainty_analysis, {**ARGUMENTS, 'workers': 8}))
@@ -0,0 +1,36 @@
+from simulator import INTERVENTIONS, run_uncertainty_analysis
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    """Stopping after two iterations and extending to four from the checkpoint
+    reproduces the four-iteration run exactly, paired or not"""
+    for paired in (False, True):
+        checkpoint = str(tmp_path / f"run-{paired}.npz")
+        options = dict(num_simulations=500, engine="cohort", seed=42, paired=paired)
+        full = run_uncertainty_analysis(num_iterations=4, **options)
+        run_uncertainty_analysis(num_iterations=2, checkpoint=checkpoint, **options)
+        resumed = run_uncertainty_analysis(num_iterations=4, checkpoint=checkpoint, **options)
+
+        for name, _, _ in INTERVENTIONS:
+            assert resumed[name]['all_director_rates'] == full[name]['all_director_rates']
+            assert resumed[name]['all_retire_ages'] == full[name]['all_retire_ages']
+
+
+def test_shrunk_run_keeps_the_sample_of_its_last_iteration(tmp_path):
+    """Re-running a checkpoint with fewer iterations reports (and plots) exactly the shorter run"""
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")
+    from reporting import plot_uncertainty_results
+
+    checkpoint = str(tmp_path / "run.npz")
+    options = dict(num_simulations=200, engine="cohort", seed=5)
+    run_uncertainty_analysis(num_iterations=3, checkpoint=checkpoint, **options)
+    shrunk = run_uncertainty_analysis(num_iterations=2, checkpoint=checkpoint, **options)
+    expected = run_uncertainty_analysis(num_iterations=2, **options)
+
+    for name, _, _ in INTERVENTIONS:
+        assert shrunk[name]['all_director_rates'] == expected[name]['all_director_rates']
+        assert np.array_equal(shrunk['last_iteration'][name]['sample_states'],
+                              expected['last_iteration'][name]['sample_states'])
+    plot_uncertainty_results(shrunk, output_dir=str(tmp_path))
@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+from simulator import STATES, CareerProfile, simulate_career
+from cohort import simulate_cohort
+from trajectories import record_careers
+
+PYTHON_CAREERS = 8_000
+COHORT_CAREERS = 80_000
+
+
+def within(a, b, std_err, sigmas=4):
+    return abs(a - b) <= sigmas * std_err
+
+
+def test_cohort_matches_simulate_career_distribution():
+    """Same profile, both engines: outcome rates and yearly state occupancy agree within sampling error"""
+    for profile in ((True, "high"), (False, "low")):
+        rng = random.Random(11)
+        python = record_careers(
+            (simulate_career(profile=CareerProfile(*profile), rng=rng) for _ in range(PYTHON_CAREERS)),
+            PYTHON_CAREERS
+        )
+        cohort = simulate_cohort(COHORT_CAREERS, profile, rng=np.random.default_rng(12))
+
+        a, b = python.director_plus().mean(), cohort.director_plus().mean()
+        std_err = np.sqrt(a * (1 - a) / PYTHON_CAREERS + b * (1 - b) / COHORT_CAREERS)
+        assert within(a, b, std_err)
+
+        ages_a, ages_b = python.retirement_ages(), cohort.retirement_ages()
+        std_err = np.sqrt(ages_a.var() / ages_a.size + ages_b.var() / ages_b.size)
+        assert within(ages_a.mean(), ages_b.mean(), std_err)
+
+        for year in (1, 5, 15, 30, 45):
+            shares_a = np.bincount(python.states[:, year], minlength=len(STATES)) / PYTHON_CAREERS
+            shares_b = np.bincount(cohort.states[:, year], minlength=len(STATES)) / COHORT_CAREERS
+            std_err = np.sqrt(shares_a * (1 - shares_a) / PYTHON_CAREERS + shares_b * (1 - shares_b) / COHORT_CAREERS)
+            # Tolerance of one career for states (almost) never occupied
+            assert np.all(np.abs(shares_a - shares_b) <= 4 * std_err + 1 / PYTHON_CAREERS)
@@ -0,0 +1,25 @@
+import numpy as np
+
+from simulator import INTERVENTIONS
+from cohort import simulate_cohort
+from density import run_density_study
+
+CAREERS = 200_000
+
+
+def test_density_solution_matches_the_sampler():
+    """The density solver and simulate_cohort duplicate the burnout, momentum
+    and retirement rules; their Director+ rate and mean retirement age agree
+    within sampling error for every arm"""
+    density = run_density_study()
+    rng = np.random.default_rng(17)
+    for name, spec_value, risk_value in INTERVENTIONS:
+        sampled = simulate_cohort(CAREERS, (spec_value, risk_value), rng=rng)
+
+        rate = sampled.director_plus().mean() * 100
+        std_err = np.sqrt(rate * (100 - rate) / CAREERS)
+        assert abs(density[name]['director_plus_rate'] - rate) <= 4 * std_err
+
+        ages = sampled.retirement_ages()
+        std_err = ages.std() / np.sqrt(ages.size)
+        assert abs(density[name]['avg_retire_age'] - ages.mean()) <= 4 * std_err
@@ -0,0 +1,21 @@
+import numpy as np
+
+from simulator import INTERVENTIONS, arm_seed, run_arm
+from export import COLUMNS, TrajectoryStore, export_study
+
+
+def test_export_holds_the_careers_of_run_arm(tmp_path):
+    """Every arm of an export round-trips to exactly the careers run_arm simulates for that seed"""
+    export_study(str(tmp_path), 3_000, engine="cohort", seed=5)
+    store = TrajectoryStore(str(tmp_path))
+    assert store.meta['complete']
+    assert store.arm_names == [name for name, _, _ in INTERVENTIONS]
+
+    for arm_index, (name, spec_value, risk_value) in enumerate(INTERVENTIONS):
+        expected = run_arm(3_000, spec_value, risk_value, engine="cohort", seed=arm_seed(5, 0, arm_index))
+        stored = store.careers(name)
+        assert np.array_equal(stored.states, expected['trajectories'].states)
+        for column in COLUMNS:
+            assert np.array_equal(getattr(stored, column), getattr(expected['trajectories'], column))
+        assert stored.summary() == expected['trajectories'].summary()
+        assert np.array_equal(store.year(10, name), expected['trajectories'].states[:, 10])
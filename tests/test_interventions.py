@@ -0,0 +1,13 @@
+import pytest
+
+from interventions import compile_interventions, default_spec
+
+
+@pytest.mark.parametrize("spec", [{}, [], {"arms": [5]}, {"arms": []}, {"arms": {}}, {"arms": "control"}])
+def test_malformed_specs_raise_value_error(spec):
+    with pytest.raises(ValueError, match="non-empty list of arm objects"):
+        compile_interventions(spec)
+
+
+def test_default_spec_compiles():
+    assert len(compile_interventions(default_spec())) == 3
@@ -0,0 +1,33 @@
+import numpy as np
+
+from paired import run_paired_arms
+
+SEEDS = 20
+CAREERS = 5_000
+
+
+def test_paired_deltas_have_smaller_spread_than_independent_arms():
+    """Across seeds, paired (and antithetic) deltas vary far less than independent arms would"""
+    for antithetic in (False, True):
+        runs = [run_paired_arms(CAREERS, "cohort", seed=np.random.SeedSequence(seed), antithetic=antithetic)
+                for seed in range(SEEDS)]
+        for name in runs[0]['paired_deltas']:
+            deltas = [run['paired_deltas'][name] for run in runs]
+            spread = np.std([delta['delta'] for delta in deltas], ddof=1)
+            std_err = np.mean([delta['std_err'] for delta in deltas])
+            independent = np.mean([delta['independent_std_err'] for delta in deltas])
+            assert std_err < 0.75 * independent
+            assert spread < 0.75 * independent
+            # The reported standard error describes the actual spread
+            assert 0.5 * std_err < spread < 2 * std_err
+
+
+def test_paired_seed_is_reusable():
+    """The caller's seed is not consumed: the same seed gives the same counts and reservoirs"""
+    seed = np.random.SeedSequence(3)
+    first = run_paired_arms(2_000, "cohort", seed=seed)
+    second = run_paired_arms(2_000, "cohort", seed=seed)
+    for name, arm in first.items():
+        if name != 'paired_deltas':
+            assert np.array_equal(arm['sample_states'], second[name]['sample_states'])
+            assert arm['director_plus_rate'] == second[name]['director_plus_rate']
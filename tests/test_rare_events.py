@@ -0,0 +1,23 @@
+import numpy as np
+
+from simulator import get_transition_table
+from cohort import simulate_cohort, transition_weights
+from rare_events import estimate_event, event_mask, parse_event
+
+NAIVE_CAREERS = 200_000
+
+
+def test_importance_sampling_agrees_with_naive_monte_carlo():
+    """IS estimates fall within sampling error of plain simulation, with far less variance for rare events"""
+    base = transition_weights(get_transition_table(None))
+    base = base / base.sum(axis=1, keepdims=True)
+    states = simulate_cohort(NAIVE_CAREERS, None, rng=np.random.default_rng(8)).states.astype(np.intp)
+
+    for event in ("Director by 35", "C-Suite by 35"):
+        estimate = estimate_event(event, base, 20_000, seed=4, pilot=10_000)
+        naive = event_mask(states, *parse_event(event)).mean()
+        std_err = np.hypot(estimate['std_err'], np.sqrt(naive * (1 - naive) / NAIVE_CAREERS))
+        assert abs(estimate['probability'] - naive) <= 4 * std_err
+        assert estimate['variance_reduction'] > 1
+
+    assert estimate['variance_reduction'] > 50
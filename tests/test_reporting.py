@@ -0,0 +1,13 @@
+from simulator import run_uncertainty_analysis, run_adaptive_analysis
+from artifacts import load_results, save_results
+from reporting import sample_description
+
+
+def test_sample_labels_follow_the_saved_run(tmp_path):
+    results = run_uncertainty_analysis(num_iterations=3, num_simulations=200, seed=2)
+    path = str(tmp_path / "results.npz")
+    save_results(results, path)
+    assert sample_description(load_results(path)) == ("3 Iterations", "n = 200 careers × 3 iterations")
+
+    adaptive = run_adaptive_analysis(target_half_width=5, batch_size=500, seed=2)
+    assert sample_description(adaptive)[1] == f"n = 500 careers × {adaptive['batches']} iterations"
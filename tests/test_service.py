@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from service import QueryService
+
+INVALID_QUERIES = [
+    {"profile": {"risk_tolerance": "bogus"}},
+    {"profile": {"early_specialization": "yes"}},
+    {"modifiers": {"generalist_exec_boost": "high"}},
+    {"rules": [{"to": "Director", "multiply": "x"}]},
+    {"rules": [{"to": "Director", "multiply": 1.5, "years": 5}]},
+    {"rules": [{"to": "Director", "multiply": 1.5, "years": [5]}]},
+    {"rules": [{"to": "Director", "multiply": 1.5, "years": [5.5, 10]}]},
+    {"rules": [{"to": 3, "multiply": 1.5}]},
+    {"careers": 0},
+]
+
+
+def post(service, query):
+    return asyncio.run(service.dispatch("POST", "/query", json.dumps(query).encode()))
+
+
+def test_invalid_queries_are_rejected_before_simulating():
+    service = QueryService(batch_window=0)
+    for query in INVALID_QUERIES:
+        status, payload = post(service, query)
+        assert status == 400, (query, payload)
+    assert service.counters['errors'] == len(INVALID_QUERIES)
+    assert service.counters['batches'] == 0
+
+
+def test_unexpected_failures_are_a_counted_500(monkeypatch):
+    import service as service_module
+
+    def broken_batch(*args):
+        raise RuntimeError("simulation failed")
+
+    service = QueryService(batch_window=0)
+    monkeypatch.setattr(service_module, "simulate_batch", broken_batch)
+    status, payload = post(service, {"careers": 100})
+    assert status == 500
+    assert "simulation failed" in payload['error']
+    assert service.counters['errors'] == 1
+    assert service_module.REASONS[status] == "Internal Server Error"
+
+    monkeypatch.setattr(service, "metrics", lambda: 1 / 0)
+    status, _ = asyncio.run(service.dispatch("GET", "/metrics", b""))
+    assert status == 500
+    assert service.counters['errors'] == 2
+
+
+def test_distinct_modifiers_do_not_grow_the_table_caches(monkeypatch):
+    import simulator
+    import cohort
+
+    monkeypatch.setattr(simulator, "TABLE_CACHE_SIZE", 8)
+    service = QueryService(batch_window=0)
+    for index in range(20):
+        status, _ = post(service, {"modifiers": {"generalist_exec_boost": 1 + index / 100}, "careers": 100})
+        assert status == 200
+        assert len(simulator.TRANSITION_TABLES) <= 8
+        assert len(cohort.SAMPLERS) <= 8
+
+
+def test_answer_does_not_depend_on_its_batch():
+    """A query answered alone and batched with other arms gives the same result"""
+    target = {"profile": {"early_specialization": True}, "careers": 2_000}
+    others = [
+        {"profile": {"risk_tolerance": "high"}, "careers": 2_000},
+        {"rules": [{"to": "Director", "multiply": 1.5}], "careers": 2_000},
+        {"modifiers": {"high_risk_rehire": 2.0}, "careers": 2_000},
+    ]
+    alone = post(QueryService(batch_window=0), target)
+
+    async def batched():
+        service = QueryService(batch_window=0.05)
+        answers = await asyncio.gather(*(service.dispatch("POST", "/query", json.dumps(query).encode())
+                                         for query in others + [target]))
+        return service, answers[-1]
+
+    service, together = asyncio.run(batched())
+    assert service.counters['batches'] == 1 and service.counters['arms'] == len(others) + 1
+    assert together == alone
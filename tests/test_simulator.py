@@ -0,0 +1,16 @@
+import pytest
+
+from simulator import CareerProfile
+
+
+def test_unemployment_history_cannot_be_appended_to_silently():
+    profile = CareerProfile()
+    with pytest.raises(AttributeError):
+        profile.unemployment_history.append(3)
+
+    profile.record_unemployment(7)
+    profile.record_unemployment(3)
+    assert profile.unemployment_history == (3, 7)
+
+    profile.unemployment_history = [1, 2]
+    assert profile.unemployment_history == (1, 2)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from simulator import TRANSITIONS
+from whatif import WhatIf
+
+QUERIES = [
+    {'modifiers': {"generalist_exec_boost": 1.4}},
+    {'transitions': {"Senior": {**TRANSITIONS["Senior"], "Lead": 0.2}}},
+]
+
+
+def test_reweighting_agrees_with_resimulation():
+    """Reweighted answers match a fresh cohort simulated under the modified table"""
+    whatif = WhatIf(100_000, seed=1)
+    for query in QUERIES:
+        result = whatif.query(**query)
+        assert result['method'] == "reweighted"
+        fresh = whatif.resimulate(whatif.compile(**query))
+        std_err = np.hypot(result['director_std_err'], fresh['director_std_err'])
+        assert abs(result['director_plus_rate'] - fresh['director_plus_rate']) <= 4 * std_err
+        assert abs(result['avg_retire_age'] - fresh['avg_retire_age']) < 0.25
+
+
+def test_moves_the_cohort_never_made_are_resimulated():
+    whatif = WhatIf(5_000, seed=1)
+    result = whatif.query(transitions={"Entry Level": {**TRANSITIONS["Entry Level"], "C-Suite": 0.05}})
+    assert result['method'] == "resimulated"
@@ -0,0 +1,29 @@
+from workforce import run_workforce
+
+SPEC = {
+    "segments": [
+        {"name": "graduates", "share": 0.5},
+        {"name": "leadership", "share": 0.5, "age": 45, "state": {"VP": 0.5, "C-Suite": 0.5}}
+    ]
+}
+
+
+def test_director_plus_counts_only_careers_that_reach_it():
+    """Careers starting at Director or above are reported apart from the Director+ rate"""
+    results = run_workforce(SPEC, size=4_000, seed=3)
+    leadership, graduates = results['segments']['leadership'], results['segments']['graduates']
+    assert leadership['director_plus_rate'] == 0
+    assert leadership['started_director_plus_rate'] == 100
+    assert graduates['started_director_plus_rate'] == 0
+    assert graduates['director_plus_rate'] > 0
+    overall = results['overall']
+    assert abs(overall['started_director_plus_rate'] - leadership['share'] * 100) < 1e-9
+
+
+def test_invalid_early_specialization_is_a_value_error():
+    import pytest
+
+    for value in ("yes", None, [0.5], 1.5):
+        spec = {"segments": [{"name": "all", "early_specialization": value}]}
+        with pytest.raises(ValueError, match="early_specialization"):
+            run_workforce(spec, size=100, seed=1)